@@ -1,124 +1,170 @@
 # Importamos las librerías necesarias de Ursina
+from boot import BootSequence, save_benchmark # Arranque por etapas (se importa primero para medir desde el inicio del proceso)
 from ursina import * # Importa todas las clases y funciones principales de Ursina
 from ursina.prefabs.first_person_controller import FirstPersonController # Importa el controlador de primera persona
+from config import LEVEL_CONFIG, LEVEL_ASSETS, COMMON_ASSETS, BOOT_ASSETS, ASSET_BUDGET, MUSIC_VOLUME, MUSIC_FADE, MUSIC_BUFFER_SECONDS, SFX_MAX_VOICES, SOUND_EFFECTS, TARGET_INSTANCING, TARGET_CAST_SHADOWS, PARTICLE_CAPACITY, HIT_SPARKS, SIM_TICK_RATE, SIM_MAX_TICKS # Configuración de niveles, armas y recursos, compartida con el motor
+from assets import AssetManager, ursina_loaders # Caché de texturas, música y fuentes con precarga en segundo plano
+from audio import MusicPlayer, SoundEffects, configure_audio # Música en streaming con fundidos y voces reutilizables para los efectos
+from arena import ARENA_PIECES, compile_static_scene # Escenario estático unido en un solo nodo
+from hud import GlyphAtlas, Hud # HUD por campos, redibujado solo cuando cambian y con un atlas de dígitos
+from billboards import SHADOW_CAMERA_MASK, BillboardBatch, supported as instancing_supported # Todos los objetivos en una sola llamada de dibujado
+from particles import ParticleSystem # Efectos de impacto en arreglos, animados y dibujados todos juntos
+from results_panel import ResultsPanel # Panel de fin de nivel construido una sola vez
+from weapons import WeaponRack, ensure_baked # Armas horneadas en una sola malla, construidas al entrar a su nivel
+from texture_cache import TextureCache, content_aliases # Versiones reducidas, con mipmaps y comprimidas de las texturas (python texture_cache.py)
+from engine import GameEngine # Motor con las reglas del juego, independiente de Ursina
+from scheduler import Scheduler # Línea de tiempo cancelable que reemplaza a invoke()
+from timestep import FixedTimestep # El motor avanza en ticks fijos, sin importar los FPS
+from pool import EntityPool # Pool para reutilizar objetivos y efectos en lugar de crearlos y destruirlos
+from registry import EntityRegistry # Entidades vivas por categoría, sin recorrer scene.entities
+from profiler import Profiler, ProfilerOverlay # Tiempos por fotograma y por función (F3 muestra, F4 guarda la sesión)
+from session import FRAME, LEVEL, MENU_LEVELS, MENU_MAIN, STOP, SessionRecorder, SessionWriter, apply_event, new_seed, read_session, session_path # Grabación y repetición de partidas
+from storage import ProfileStore # Progreso y resultados guardados en SQLite, escritos desde un hilo aparte
+from telemetry import DEFAULT_PORT as TELEMETRY_PORT, TelemetryPublisher # Transmisión en vivo de la partida para espectadores
+import os # Para comprobar si existen los archivos de recursos
+import atexit # Para cerrar la grabación de la sesión al salir
 import math # Importa el módulo math para funciones matemáticas (aunque no se usa directamente en este snippet, es útil tenerlo)
 
-# --- Configuración de Niveles ---
-# Diccionario que almacena la configuración específica para cada nivel del juego.
-LEVEL_CONFIG = {
-    1: {'targets': 10, 'speed': (10, 15), 'scale': 2.8, 'accuracy_goal': 50}, # Configuración para el Nivel 1
-    2: {'targets': 12, 'speed': (15, 22), 'scale': 2.0, 'accuracy_goal': 60}, # Configuración para el Nivel 2
-    3: {'targets': 15, 'speed': (20, 28), 'scale': 1.8, 'accuracy_goal': 75}, # Configuración para el Nivel 3
-    #'targets': número de objetivos a aparecer en este nivel.
-    #'speed': rango (mínimo, máximo) de velocidad para los objetivos.
-    #'scale': tamaño de los objetivos.
-}
-
 # --- Clase para los Objetivos Esféricos (¡Ahora Marios!) ---
 # Define una clase para los objetivos que el jugador debe disparar. Hereda de 'Entity' de Ursina.
+# Solo es la parte visual: la posición, velocidad y los impactos los decide el motor (engine.py).
+# Con TARGET_INSTANCING (config.py) no se usa: todos los objetivos se dibujan juntos con BillboardBatch.
 
 class TargetSphere(Entity):# Constructor de la clase TargetSphere.
-    def __init__(self, speed_range, scale ): # Recibe speed_range (rango de velocidad) y scale (escala del objetivo) como argumentos
-        side = random.choice([-1, 1]) # Elige aleatoriamente si el objetivo aparecerá desde la izquierda (-1) o derecha (1).
-        # Posición Y ajustada para que salgan más bajas, ahora relativa al nuevo suelo en y=0
-        start_pos = Vec3(22 * side, random.uniform(2, 8), random.uniform(15, 25)) # Ajustada para que salgan por encima del suelo
-        # (entre 2 y 8 en el eje Y), X: 22 * side (extremo de la pantalla), Y: aleatorio en el rango, Z: aleatorio para la profundidad.
-        direction = Vec3(-side, random.uniform(-.2, .2), random.uniform(-.1, .1)) # Dirección de movimiento del objetivo.
-        # X: hacia el centro (-side), Y: un poco hacia arriba o abajo, Z: un poco hacia adelante o atrás.
-        
-
-
+    def __init__(self): # Construye el objetivo una sola vez; el pool lo reutiliza llamando a reset().
         super().__init__(# Llama al constructor de la clase base (Entity) para inicializar el objeto visual.
             model='quad', # ¡CAMBIADO A 'quad' para usar una imagen 2D! Un 'quad' es un plano de dos triángulos.
-            texture='assets/textures/ovni.png', # ¡AQUÍ ES DONDE PONES LA RUTA A TU IMAGEN DE MARIO! La textura que se aplicará al 'quad'.
+            texture=assets.texture('assets/textures/ovni.png'), # ¡AQUÍ ES DONDE PONES LA RUTA A TU IMAGEN DE MARIO! La textura que se aplicará al 'quad'.
             color=color.white, # Usa color.white para que la textura no se tiña. Permite que la textura muestre sus colores originales.
             scale=4, # Establece el tamaño del mario.
-            position=start_pos, # Establece la posición inicial del mario
-            collider='box',# Cambiamos a 'box' o 'quad' porque ya no es una esfera. 'box' es una buena opción general para colisiones 2D.
-            shadow=True, # El mario proyectará una sombra.
+            # Sin colisionador: los disparos se resuelven con hitscan.py contra los objetivos vivos, no con el raycast del ratón.
             billboard=True # ¡IMPORTANTE! Esto hace que el mario (quad) siempre mire a la cámara, sin importar la rotación, lo que lo hace parecer 2D.
         )
-
-        self.direction = direction # Almacena la dirección de movimiento del mario
-        self.speed = random.uniform(speed_range[0], speed_range[1]) # Asigna una velocidad aleatoria dentro del rango.
-
-    def update(self): # Método update se llama automáticamente cada fotograma.
-        self.position += self.direction * self.speed * time.dt # Mueve el objetivo. time.dt asegura que el movimiento
-        #sea independiente de la velocidad de fotogramas.
-        if abs(self.x) > 24:# Destruye el objetivo si sale de la pantalla (si su posición X absoluta es mayor que 24).
-        # e invoca la creación del siguiente objetivo después de un pequeño retraso.
-            destroy(self) # Elimina la entidad actual de la escena.
-            invoke(spawn_next_target, delay=0.5) # Llama a spawn_next_target después de 0.5 segundos.
-
-    def hit(self): # Método hit se llama cuando este objetivo es impactado por un raycast (un disparo).
-        global hits, points # Accede a las variables globales de aciertos y puntos.
-        hit_sound.play() # Reproduce el sonido de impacto.
-        hits += 1 # Incrementa el contador de aciertos.
-        points += 100 # Suma 100 puntos al marcador.
-        effect = Entity( # Crea un efecto visual de impacto
+        if not TARGET_CAST_SHADOWS:
+            self.hide(SHADOW_CAMERA_MASK) # Fuera de la cámara de sombras del sol ('shadow=True' de Ursina no hacía nada).
+        self.target = None # Objetivo del motor que dibuja esta entidad.
+        registry.add(self, 'targets')
+        assets.hold(self, 'texture', 'assets/textures/ovni.png')
+
+    def reset(self, target, position): # Prepara la entidad para dibujar un objetivo recién generado por el motor.
+        self.target = target
+        self.scale = target.scale # Restablece el tamaño del mario.
+        self.position = position # Coloca el objetivo en su punto de aparición.
+        self.color = color.white # Restablece el color por si quedó alterado.
+        self.enable() # Vuelve a mostrar el objetivo.
+
+# --- Clase para el Efecto de Impacto ---
+# Efecto visual que aparece al acertar un objetivo. Se construye una vez y el pool lo reutiliza.
+# Solo si la GPU no dibuja instancias: normalmente los impactos son partículas (hit_particles).
+class HitEffect(Entity):
+    def __init__(self):
+        super().__init__(
             model='quad', # El efecto es un quad (plano 2D).
-            texture='assets/textures/hit_effect.png', # Textura para el efecto de impacto.
+            texture=assets.texture('assets/textures/hit_effect.png'), # Textura para el efecto de impacto.
             color=color.white, # Color blanco para no teñir la textura.
-            scale=self.scale * 0.8, # Escala del efecto, ligeramente más pequeño que el mario.
-            position=self.world_position, # Posiciona el efecto donde fue impactado el mario.
             shadow=False, # El efecto no proyecta sombra.
             billboard=True # El efecto siempre mira a la cámara.
-            )
-
-        effect.animate_scale(self.scale * 1.2, duration=0.2, curve=curve.out_quad) # Anima el crecimiento del efecto.
-        effect.fade_out(duration=0.2) # Anima el desvanecimiento del efecto.
-        destroy(effect, delay=0.2) # Destruye el efecto después de 0.2 segundos.
-
-        # Destruye el objetivo y spawnea el siguiente
-        destroy(self) # Elimina el mario impactado.
-        invoke(spawn_next_target, delay=0.5) # Llama a spawn_next_target después de 0.5 segundos para crear un nuevo objetivo.
+        )
+        registry.add(self, 'effects')
+        assets.hold(self, 'texture', 'assets/textures/hit_effect.png')
+
+    def reset(self, position, scale): # Restablece posición, escala y animaciones antes de reutilizar el efecto.
+        for animation in self.animations: # Detiene animaciones que pudieran quedar de un uso anterior.
+            animation.kill()
+        self.animations.clear()
+        self.position = position
+        self.scale = scale
+        self.color = color.white # Restablece la opacidad que fade_out dejó en cero.
+        self.enable()
 
 # --- Variables Globales del Juego ---
-hits, points, shots_fired = 0, 0, 0 # Inicializa los contadores de aciertos, puntos y disparos.
-targets_spawned = 0 # Contador de objetivos que han aparecido.
-unlocked_level = 1 # Nivel máximo desbloqueado por el jugador.
-current_level = 1 # Nivel actual en el que se encuentra el jugador.
-game_active = False # Booleano para saber si el juego está en curso.
-last_shot_time = 0 # Guarda el momento del último disparo para controlar la cadencia de fuego.
-current_bg_music = None # Variable global para mantener una referencia a la música de fondo actual.
+# Los contadores (aciertos, puntos, disparos, objetivos, niveles desbloqueados) viven en el motor.
+# Cada sesión usa una semilla propia; con RECORD=1 se graba en sessions/ (un archivo por sesión).
+# REPLAY=sessions/archivo.tabs repite en la ventana una sesión grabada, con su misma semilla.
+replay_events = None # Entradas grabadas que se están repitiendo (None si se juega normalmente).
+replay_index = 0
+if os.environ.get('REPLAY'):
+    session_seed, replay_events = read_session(os.environ['REPLAY'])
+else:
+    session_seed = new_seed()
+engine = GameEngine(seed=session_seed) # Estado de la partida y reglas del juego.
+sim_clock = FixedTimestep(SIM_TICK_RATE, SIM_MAX_TICKS) # Reparte el tiempo de cada fotograma en ticks fijos del motor.
+target_nodes = {} # Objetivo del motor -> entidad TargetSphere que lo dibuja (sin TARGET_INSTANCING).
+target_pool = effect_pool = None # EntityPool de objetivos y efectos (se construyen en la etapa 'objetivos' del arranque).
+target_batch = None # BillboardBatch que dibuja a todos los objetivos (con TARGET_INSTANCING).
+hit_particles = None # ParticleSystem de los impactos (None: entidades HitEffect del pool).
+effects_timeline = Scheduler() # Acciones visuales pendientes (devolver efectos al pool); se cancelan al cambiar de pantalla.
+registry = EntityRegistry() # Entidades vivas por categoría: 'targets', 'effects', 'ui', 'results', 'weapons' y 'debug'.
+profiler = Profiler(enabled=os.environ.get('PROFILE') == '1') # Apagado por defecto; PROFILE=1 lo enciende desde el inicio.
+# Spans del motor: aparición de objetivos, movimiento del enjambre, disparos e impactos.
+profiler.instrument(engine, 'spawn_next_target', 'spawn_next_target')
+profiler.instrument(engine, 'step', 'engine_step')
+profiler.instrument(engine, 'fire', 'fire')
+profiler.instrument(engine, 'hit', 'hit')
+profiler.instrument(engine.swarm, 'sync', 'swarm_sync')
+# Graba cada fotograma, disparo y cambio de nivel que entra al motor (el hilo de escritura no frena el juego).
+recorder = None
+if replay_events is None and os.environ.get('RECORD') == '1':
+    recorder = SessionRecorder(engine, SessionWriter(session_path(), session_seed))
+    atexit.register(recorder.close)
+# TELEMETRY=1 (o TELEMETRY=<puerto>) transmite la partida por un socket local; python spectator.py la muestra.
+telemetry = None
+if os.environ.get('TELEMETRY', '0') != '0':
+    try:
+        telemetry = TelemetryPublisher(port=TELEMETRY_PORT if os.environ['TELEMETRY'] == '1' else int(os.environ['TELEMETRY'])).start()
+    except OSError as error:
+        print('telemetría desactivada:', error)
+    else:
+        telemetry.attach(engine) # Copia el estado después de cada tick (el hilo de asyncio codifica y envía).
+        profiler.instrument(telemetry, 'capture', 'telemetry_capture')
+        atexit.register(telemetry.close)
+# Progreso y resultados guardados en saves/ (SAVE=0 lo desactiva; las repeticiones no guardan ni cargan nada).
+# Al arrancar solo se lee el resumen de los menús: nivel desbloqueado y récord de cada nivel.
+profile_store = None
+best_results = {} # nivel -> mejor resultado guardado (se actualiza al terminar cada nivel).
+if replay_events is None and os.environ.get('SAVE', '1') != '0':
+    profile_store = ProfileStore()
+    atexit.register(profile_store.close)
+    summary = profile_store.load_summary()
+    engine.unlocked_level = min(max(engine.unlocked_level, summary['unlocked_level']), len(LEVEL_CONFIG))
+    best_results = summary['best']
 player = None # Referencia global para el FirstPersonController
+boot = BootSequence() # Etapas del arranque que se construyen después del primer fotograma.
 
 # --- Funciones del Juego ---
 def go_to_level_select(): # Función para cambiar al menú de selección de nivel.
+    boot.finish() # Si el jugador se adelantó al arranque, termina ahora de construir lo que falta.
     main_menu.disable() # Deshabilita el menú principal.
     start_button.disable() # Deshabilita el botón de inicio.
     quit_button.disable() # Deshabilita el botón de salir.
     level_select_menu.enable() # Habilita el menú de selección de nivel.
     update_level_buttons() # Actualiza el estado de los botones de nivel (desbloqueados/bloqueados).
+    preload_level_assets() # Mientras el jugador elige, carga en segundo plano lo que usarán los niveles.
+
+# Función que precarga en un hilo de trabajo las texturas, música y fuentes de los niveles desbloqueados.
+def preload_level_assets():
+    assets.preload_many(COMMON_ASSETS)
+    for level in range(1, engine.unlocked_level + 1):
+        assets.preload_many(LEVEL_ASSETS.get(level, {}))
 
+@profiler.timed('start_level')
 def start_level(level): # Función para iniciar un nivel específico.
-    global hits, points, shots_fired, game_active, current_level, targets_spawned, last_shot_time, current_bg_music, player
+    global player
     current_level = level # Establece el nivel actual.
-    hits, points, shots_fired, targets_spawned = 0, 0, 0, 0 # Reinicia los contadores para el nuevo nivel.
-    game_active = True # Establece el estado del juego a activo.
-
-    # --- Lógica de la música para reiniciar ---
-    # Detenemos y DESTRUIMOS la instancia de música actual si existe.
-    if current_bg_music:
-        current_bg_music.stop() # Detiene la reproducción.
-        destroy(current_bg_music) # ¡IMPORTANTE! Destruye la instancia anterior para liberar recursos.
-
-     # Asigna y *CREA UNA NUEVA INSTANCIA* de la música correcta al nivel.
-    if current_level == 1:
-        current_bg_music = Audio('assets/sounds/fondo.mp3', loop=True, autoplay=False, volume=0.8) # Música para el nivel 1.
-    elif current_level == 2:
-        current_bg_music = Audio('assets/sounds/fondoNivel2.mp3', loop=True, autoplay=False, volume=0.8) # Música para el nivel 2.
-    elif current_level == 3:
-        current_bg_music = Audio('assets/sounds/fondoNivel3.mp3', loop=True, autoplay=False, volume=0.8) # Música para el nivel 3.
-
-    if current_bg_music:
-        current_bg_music.play() # Reproduce la música desde el principio.
+
+    # --- Música del nivel ---
+    # Se abre en segundo plano (ya precargada desde el menú de niveles) y entra con un fundido cruzado.
+    tracks = [path for path in LEVEL_ASSETS.get(current_level, {}).get('music', []) if os.path.exists(path)]
+    if tracks:
+        music.play(tracks[-1])
+    else:
+        music.stop()
 
     level_select_menu.disable() # Deshabilita el menú de selección de nivel.
     game_hud.enable() # Habilita el HUD del juego.
     crosshair.enable() # Habilita la mira.
     mouse.locked = True # Bloquea el cursor del ratón en el centro de la pantalla.
-    last_shot_time = time.time() # Establece el tiempo del último disparo al momento actual.
+    mouse.traverse_target = None # Durante el juego el ratón no necesita recorrer los colisionadores del escenario cada fotograma.
 
     # Habilita el controlador de primera persona
     if player:
@@ -126,245 +172,176 @@ def start_level(level): # Función para iniciar un nivel específico.
         player.position = (0, 1.8, -15) # Reinicia la posición del jugador al inicio del nivel con altura de ojos estándar
     else:
         player = FirstPersonController(position=(0, 1.8, -15)) # Crea el jugador si no existe, con altura de ojos estándar
-
-    # Establece el padre de las armas directamente a la cámara
-    pistol.parent = camera
-    rifle.parent = camera
-    shotgun.parent = camera
-
-    # Deshabilita todas las armas y luego habilita la del nivel actual.
-    pistol.disable()
-    rifle.disable()
-    shotgun.disable()
-
-    if current_level == 1:
-        gunshot_pistol_sound.play()
-        pistol.enable()
-    elif current_level == 2:
-        gunshot_rifle_sound.play()
-        rifle.enable()
-    elif current_level == 3:
-        gunshot_shotgun_sound.play()
-        shotgun.enable()
-
-    # Destruye cualquier objetivo que pueda haber quedado de una partida anterior.
-    for t in scene.entities:
-        if isinstance(t, TargetSphere):
-            destroy(t)
-
-    spawn_next_target() # Llama a la función para generar el primer objetivo.
-
-def spawn_next_target(): # Función para generar el siguiente objetivo.
-    global targets_spawned # Accede a la variable global de objetivos generados.
-    if not game_active: return # Si el juego no está activo, no genera objetivos.
-
-    # Comprueba si aún quedan objetivos por generar para el nivel actual.
-    if targets_spawned < LEVEL_CONFIG.get(current_level, {}).get('targets', 0):
-        config = LEVEL_CONFIG.get(current_level, {}) # Obtiene la configuración del nivel actual.
-        TargetSphere(config.get('speed', (10, 15)), config.get('scale', 1)) # Crea un nuevo objetivo con la velocidad y escala del nivel actual.
-        targets_spawned += 1 # Incrementa el contador de objetivos generados.
+        player.traverse_target = arena # Sus rayos de suelo y paredes solo recorren el colisionador del escenario.
+
+    # Habilita solo el arma del nivel actual (construyéndola si es la primera vez).
+    weapon_rack.show(LEVEL_CONFIG[current_level]['weapon'])
+
+    sfx.play(LEVEL_CONFIG[current_level]['weapon']) # Sonido del arma al empezar el nivel.
+
+    # Devuelve al pool cualquier objetivo que pueda haber quedado de una partida anterior.
+    clear_targets()
+    clear_effects()
+    # Construye por adelantado los objetivos y efectos que usará este nivel.
+    config = LEVEL_CONFIG.get(current_level, {})
+    pool_size = max(config.get('pool_size', 1), config.get('concurrent', 1))
+    if target_batch is None:
+        target_pool.prewarm(pool_size)
+    if hit_particles is None:
+        effect_pool.prewarm(pool_size)
+
+    sim_clock.reset() # El tiempo que tardó en armarse el nivel no se simula.
+    engine.start_level(current_level) # El motor reinicia los contadores y genera el primer objetivo.
+
+# Función que devuelve al pool todas las entidades de objetivos.
+def clear_targets():
+    target_nodes.clear()
+    target_pool.release_all()
+    if target_batch is not None:
+        target_batch.clear()
+
+# Función que quita los efectos de impacto que sigan en pantalla.
+def clear_effects():
+    effects_timeline.cancel_all() # Nada de la partida anterior puede devolver un efecto que se vuelva a usar en esta.
+    effect_pool.release_all()
+    if hit_particles is not None:
+        hit_particles.clear()
+
+# Función que recibe los eventos del motor y los refleja en la escena.
+def on_engine_event(event, *args):
+    if event == 'spawn': # El motor generó un objetivo: toma una entidad del pool para dibujarlo.
+        target, position = args
+        if target_batch is None: # Con instancias basta con que esté en el enjambre del motor.
+            node = target_pool.acquire()
+            node.reset(target, position)
+            target_nodes[target] = node
         update_hud() # Actualiza el HUD con la nueva información.
-    else:
-        invoke(end_level, delay=1) # Si no quedan objetivos, llama a end_level después de 1 segundo.
+    elif event == 'leave': # El objetivo salió de la pantalla: oculta la entidad y la guarda para reutilizarla.
+        if target_batch is None:
+            target_pool.release(target_nodes.pop(args[0]))
+    elif event == 'hit': # El objetivo fue impactado.
+        target, position = args
+        sfx.play('hit') # Reproduce el sonido de impacto (en una voz libre o robando la más antigua).
+        if hit_particles is not None:
+            # Destello donde fue impactado el mario: crece desde un poco menos que su tamaño y se desvanece en 0.2 s.
+            hit_particles.emit(position, target.scale * 0.8, target.scale * 1.2, lifetime=0.2)
+            # Chispas que salen despedidas y caen; se achican hasta desaparecer.
+            hit_particles.burst(position, HIT_SPARKS, speed=target.scale * 3, size=target.scale * 0.15, end_size=0,
+                                lifetime=0.35, color=(1, .8, .4, 1))
+        else:
+            effect = effect_pool.acquire() # Toma un efecto visual de impacto del pool.
+            effect.reset(Vec3(*position), target.scale * 0.8) # Posiciona el efecto donde fue impactado el mario, ligeramente más pequeño que él.
+            effect.animate_scale(target.scale * 1.2, duration=0.2, curve=curve.out_quad) # Anima el crecimiento del efecto.
+            effect.fade_out(duration=0.2) # Anima el desvanecimiento del efecto.
+            effects_timeline.after(0.2, effect_pool.release, effect) # Devuelve el efecto al pool después de 0.2 segundos.
+        if target_batch is None:
+            target_pool.release(target_nodes.pop(target)) # Oculta el mario impactado.
+        update_hud() # El evento 'shot' llega antes de contar el acierto; el HUD solo redibuja lo que cambió.
+    elif event == 'shot':
+        sfx.play(engine.config.get('weapon', 'pistol')) # Sonido del arma en cada disparo.
+        update_hud() # Actualiza el HUD.
+    elif event == 'level_end':
+        end_level(args[0]) # Muestra los resultados.
+
+engine.on(on_engine_event)
 
 # Función para finalizar un nivel.
-def end_level():
-    global game_active, unlocked_level, current_bg_music, player
-    game_active = False # Establece el estado del juego a inactivo.
+@profiler.timed('end_level')
+def end_level(result): # 'result' trae la precisión, el objetivo y los aciertos calculados por el motor.
+    global player
 
-    # Detiene y destruye la música de fondo actual.
-    if current_bg_music:
-        current_bg_music.stop()
-        destroy(current_bg_music) # También destruimos la música al finalizar el nivel para liberar recursos.
-        current_bg_music = None
+    # Apaga la música de fondo con un fundido.
+    music.stop()
+    clear_targets() # Si el nivel terminó por tiempo, quita los objetivos que seguían en pantalla.
 
     # Deshabilita HUD, armas y mira, los elementos del juego.
     game_hud.disable()
     crosshair.disable()
-    pistol.disable()
-    rifle.disable()
-    shotgun.disable()
+    weapon_rack.hide_all()
     if player:
         player.disable() # Deshabilita el controlador de primera persona
     mouse.locked = False # Desbloquea el cursor del ratón.
-
-      # Calcula la precisión del jugador.
-    accuracy = (hits / shots_fired) * 100 if shots_fired > 0 else 0
-    goal = LEVEL_CONFIG.get(current_level, {}).get('accuracy_goal', 0)
-
-
-#-----//////////MOSTRAR LOS RESULTADOS////////-----
-      # Crea un panel de fin de nivel para mostrar los resultados.
-    end_panel = Entity(parent=camera.ui, model='quad', scale=(.8, .7), color=color.white.tint(.2), z=1)
-    Text(
-        parent=end_panel, 
-        text=f"Precisión: {accuracy:.1f}% (Objetivo: {goal}%)", 
-        color=color.black, 
-        origin=(0,0), 
-        y=0, 
-        scale=1.9,
-        font='assets/fonts/CenturyGothicBold.ttf'
-        )
-    Text(
-        parent=end_panel, 
-        text=f"Aciertos: {hits} / {shots_fired}", 
-        color=color.black, 
-        origin=(0,0), 
-        y=-.1, 
-        scale=1.9,
-        font='assets/fonts/CenturyGothicBold.ttf'
-        )
-
-    # Lógica para cuando el nivel es completado con éxito.
-    if accuracy >= goal:
-        message = f" NIVEL {current_level} COMPLETADO "
-        
-        if current_level < len(LEVEL_CONFIG): # Si no es el último nivel, desbloquea el siguiente.
-            unlocked_level = max(unlocked_level, current_level + 1) # Asegura que se desbloquee el nivel más alto.
-
-        Text(
-            parent=end_panel, 
-            text=message, 
-            color=color.black, 
-            origin=(0,0), 
-            y=.2, 
-            scale=3,
-            font='assets/fonts/keetano_katana.ttf'
-            )
-        Button(
-            parent=end_panel, 
-            text="Menú de Niveles", 
-            highlight_color=color.orange,
-            pressed_color=color.yellow,
-            color=color.red, 
-            scale=(0.40, 0.15), 
-            y=-.3,
-            text_color=color.white,
-            font='assets/fonts/CenturyGothicBold.ttf', 
-            texture='assets/textures/button_menu.jpg',
-            model='quad',
-            radius=0.18,
-            on_click=Func(lambda:
-        (destroy(end_panel), show_level_select_menu()))) # Botón para ir al menú de niveles.
-
-    # Lógica para cuando el nivel no es completado (precisión insuficiente).
-    else:
-        message = "INTENTALO DE NUEVO"
-        Text(
-            parent=end_panel, 
-            text=message,
-            color=color.black, 
-            origin=(0,0), 
-            y=.2, 
-            scale=3,
-            font='assets/fonts/keetano_katana.ttf'
-            )
-        Button(
-            parent=end_panel, 
-            text="Reintentar", 
-            highlight_color=color.orange,
-            pressed_color=color.yellow,
-            color=color.red, 
-            scale=(0.35, 0.12), 
-            y=-.25, 
-            text_color=color.white,
-            font='assets/fonts/CenturyGothicBold.ttf', 
-            texture='assets/textures/button_rententar.jpg',
-            model='quad',
-            radius=0.18,
-            on_click=Func(lambda:
-        (destroy(end_panel), start_level(current_level)))) # Botón para reintentar el nivel.
-        Button(
-            parent=end_panel, 
-            text="Menú de Niveles", 
-            highlight_color=color.orange,
-            pressed_color=color.yellow,
-            color=color.red, 
-            scale=(0.35, 0.12), 
-            text_color=color.white,
-            font='assets/fonts/CenturyGothicBold.ttf', 
-            texture='assets/textures/button_menu.jpg',
-            model='quad',
-            radius=0.18,
-            y=-.4, 
-            on_click=Func(lambda:
-        (destroy(end_panel), show_level_select_menu()))) # Botón para volver al menú de niveles.
+    mouse.traverse_target = scene # Restablece la detección del ratón sobre la escena.
+
+    # Muestra los resultados en el panel persistente: solo se cambian sus textos (ver results_panel.py).
+    results_panel.show(result)
+    if profile_store is not None: # Se encola: el hilo de profile_store lo escribe sin frenar el fotograma.
+        profile_store.record_result(result, seed=session_seed)
+        profile_store.save_progress('unlocked_level', engine.unlocked_level)
+        best = best_results.setdefault(result['level'], {'accuracy': -1, 'points': 0, 'plays': 0}) # El récord que muestra el menú.
+        if (result['accuracy'], result['points']) > (best['accuracy'], best['points']):
+            best.update(result)
+        best['plays'] += 1
 
 # Función para mostrar el menú de selección de nivel.
 def show_level_select_menu():
-    global current_bg_music, player
+    global player
     game_hud.disable() # Deshabilita el HUD.
-    pistol.disable() # Deshabilita el arma.
-    rifle.disable() # Deshabilita el rifle.
-    shotgun.disable() # Deshabilita la escopeta.
+    weapon_rack.hide_all() # Deshabilita las armas.
 
     crosshair.disable() # Deshabilita la mira.
     if player:
         player.disable() # Deshabilita el controlador de primera persona
 
-    # Destruye todos los objetivos que puedan estar en la escena.
-    for t in scene.entities:
-        if isinstance(t, TargetSphere):
-            destroy(t)
+    # Detiene la partida y devuelve al pool todos los objetivos que puedan estar en la escena.
+    engine.stop(MENU_LEVELS)
+    clear_targets()
+    clear_effects()
 
     level_select_menu.enable() # Habilita el menú de selección de nivel.
     update_level_buttons() # Actualiza el estado de los botones de nivel.
     mouse.locked = False# Desbloquea el cursor.
+    mouse.traverse_target = scene # Restablece la detección del ratón sobre la escena.
 
-    # Detener y destruir la música de fondo al ir a la selección de nivel.
-    if current_bg_music:
-        current_bg_music.stop()
-        destroy(current_bg_music)
-        current_bg_music = None
+    # Detener la música de fondo al ir a la selección de nivel.
+    music.stop()
+    preload_level_assets() # Mientras el jugador elige, carga en segundo plano lo que usarán los niveles (incluido el recién desbloqueado).
 
 # Función para mostrar el menú principal.
 def show_main_menu():
-    global current_bg_music, player
+    global player
     level_select_menu.disable() # Deshabilita el menú de selección.
     game_hud.disable() # Deshabilita el HUD del juego.
-    pistol.disable() # Deshabilita la pistola.
-    rifle.disable() # Deshabilita el rifle.
-    shotgun.disable() # Deshabilita la escopeta.
+    weapon_rack.hide_all() # Deshabilita las armas.
     crosshair.disable() # Deshabilita la mira.
     pause_menu.disable() # Asegúrate de que el menú de pausa esté deshabilitado
     if player:
         player.disable() # Deshabilita el controlador de primera persona
 
-    # Destruye todos los objetivos que puedan estar en la escena.
-    for t in scene.entities:
-        if isinstance(t, TargetSphere):
-            destroy(t)
+    # Detiene la partida y devuelve al pool todos los objetivos que puedan estar en la escena.
+    engine.stop(MENU_MAIN)
+    clear_targets()
+    clear_effects()
+    weapon_rack.unload() # Fuera de los niveles las armas no hacen falta: sus atlas quedan libres para la caché (LRU).
 
     main_menu.enable() # Habilita el menú principal.
     start_button.enable() # Asegura que el botón INICIAR se muestre
     quit_button.enable() # Asegura que el botón SALIR se muestre
     mouse.locked = False # Desbloquea el cursor del ratón.
+    mouse.traverse_target = scene # Restablece la detección del ratón sobre la escena.
 
-    # Detener y destruir la música de fondo al ir al menú principal.
-    if current_bg_music:
-        current_bg_music.stop()
-        destroy(current_bg_music)
-        current_bg_music = None
+    # Detener la música de fondo al ir al menú principal.
+    music.stop()
 
 # Función para actualizar el texto del HUD (Heads-Up Display).
-def update_hud():
-    accuracy = (hits / shots_fired) * 100 if shots_fired > 0 else 0 # Calcula la precisión, evitando división por cero.
-    hud_text.text = ( # Formatea el texto a mostrar en el HUD.
-        f"NIVEL {current_level}\n"
-        f"Objetivo: {targets_spawned}/{LEVEL_CONFIG.get(current_level, {}).get('targets', 0)}\n"
-        f"Aciertos: {hits}\n"
-        f"Precisión: {accuracy:.1f}%"
-    )
+@profiler.timed('update_hud')
+def update_hud(): # Solo anota los valores: el HUD redibuja los campos que cambiaron una vez por fotograma (hud.flush).
+    hud.set('level', str(engine.current_level))
+    hud.set('targets', f"{engine.targets_spawned}/{engine.total_targets}")
+    hud.set('hits', str(engine.hits))
+    hud.set('accuracy', f"{engine.accuracy:.1f}%")
 
 # Función para actualizar el estado de los botones de selección de nivel (habilitar/deshabilitar).
 def update_level_buttons():
     for i, button in enumerate(level_buttons): # Itera sobre cada botón de nivel.
-        button.disabled = (i + 1 > unlocked_level) # Deshabilita el botón si su nivel es mayor que el desbloqueado.
+        button.disabled = (i + 1 > engine.unlocked_level) # Deshabilita el botón si su nivel es mayor que el desbloqueado.
         button.text_entity.color = color.white if not button.disabled else color.gray # Cambia el color del texto según si está habilitado o no
+        best = best_results.get(i + 1) # Récord guardado del nivel, a la derecha del botón.
+        level_best_texts[i].text = f"Récord: {best['accuracy']:.1f}%" if best else ''
 
 # Función para reanudar el juego desde el menú de pausa.
 def resume_game():
-    global current_bg_music, player
+    global player
     pause_menu.disable() # Deshabilita el menú de pausa.
     mouse.locked = True # Bloquea el cursor del ratón.
     application.resume() # Reanuda la lógica del juego de Ursina.
@@ -372,13 +349,12 @@ def resume_game():
         player.enable() # Habilita el controlador de primera persona
 
     # Reanuda la música de fondo si estaba sonando (continuará desde donde se pausó).
-    if current_bg_music:
-        current_bg_music.play()
+    music.resume()
 
 # Función para pausar el juego
 def pause_game():
-    global current_bg_music, player
-    if game_active: # Solo pausar si el juego está activo
+    global player
+    if engine.active: # Solo pausar si el juego está activo
         application.pause() # Pausa la lógica del juego de Ursina
         mouse.locked = False # Desbloquea el cursor para interactuar con el menú
         pause_menu.enable() # Habilita el menú de pausa
@@ -386,67 +362,125 @@ def pause_game():
             player.disable() # Deshabilita el controlador de primera persona
 
         # Pausa la música de fondo si está sonando
-        if current_bg_music:
-            current_bg_music.pause()
+        music.pause()
 
 # --- Funciones de Eventos de Ursina ---
 def input(key): # Función que se llama automáticamente cuando se presiona una tecla o botón del ratón.
-    global shots_fired, last_shot_time 
-    if key == 'left mouse down' and game_active: # Si se hace clic izquierdo y el juego está activo.
-        current_time = time.time()
-        # Control de cadencia de fuego según el arma activa
-        fire_rate = 0.5 # Default para pistola
-        if current_level == 2: # Rifle
-            fire_rate = 0.2
-        elif current_level == 3: # Escopeta
-            fire_rate = 0.8 # Más lento por el "poder"
-
-        if (current_time - last_shot_time) > fire_rate:
-            shots_fired += 1 # Incrementa el contador de disparos.
-            update_hud() # Actualiza el HUD.
-            last_shot_time = current_time # Actualiza el tiempo del último disparo.
-
-            # Realiza un raycast desde la posición del ratón.
-            # El raycast detecta si hay una entidad en la dirección del disparo.
-            if mouse.hovered_entity and isinstance(mouse.hovered_entity, TargetSphere):
-                mouse.hovered_entity.hit() # Si el raycast golpea un objetivo, llama a su método 'hit'.
+    if key == 'left mouse down' and engine.active and replay_events is None: # Si se hace clic izquierdo y el juego está activo (y no es una repetición).
+        # El disparo sale de la cámara hacia donde apunta la mira (el cursor está bloqueado en el centro).
+        # El motor aplica la cadencia de fuego del arma, reparte los perdigones y resuelve los impactos
+        # directamente contra los objetivos vivos.
+        engine.fire(tuple(camera.world_position), tuple(camera.forward), tuple(camera.up))
+
+    if key == 'f3': # Muestra u oculta el perfilador (y lo enciende o apaga).
+        profiler_overlay.toggle()
+    if key == 'f4': # Guarda la sesión del perfilador en CSV y JSON.
+        print('perfil guardado en', profiler.dump(extra=diagnostics()))
 
     if key == 'escape': # Si se presiona la tecla ESC.
-        if game_active:
+        if engine.active:
             if pause_menu.enabled:
                 resume_game()
             else:
                 pause_game()
         else:
             # Si no está en juego activo (ej. en menús), ir al menú principal
-            if level_select_menu.enabled:
+            if boot.done and level_select_menu.enabled:
                 show_main_menu()
             elif main_menu.enabled:
                 application.quit() # Si está en el menú principal, salir de la aplicación
 
 def update(): # Función que se llama automáticamente cada fotograma.
-    if game_active:
-        # Aquí puedes añadir lógica de juego que se actualice constantemente
-        # Por ejemplo, mover la cámara ligeramente, efectos visuales, etc.
-        pass # Por ahora, no hay lógica de actualización continua en el juego activo.
+    profiler.frame(time.dt) # Duración del fotograma anterior.
+    profiler_overlay.update(time.dt)
+    assets.poll() # Termina en el hilo principal las precargas que ya acabaron (subida de texturas a la GPU).
+    if not boot.done: # Durante el arranque cada fotograma construye la siguiente parte del juego.
+        boot.step()
+        boot_bar.scale_x = boot.progress
+        return
+    effects_timeline.advance(time.dt) # Un solo tick para todas las acciones visuales pendientes.
+    if hit_particles is not None:
+        hit_particles.update(time.dt) # Envejece, mueve y desvanece a todas las partículas en un solo paso.
+    music.update(time.dt) # Avanza los fundidos y arranca la pista pedida en cuanto termina de abrirse.
+    # Avanza el motor en ticks fijos (ninguno, uno o varios por fotograma): mueve a todos los objetivos vivos
+    # y ejecuta las apariciones pendientes. Un fotograma trabado no hace saltar a los objetivos.
+    for _ in range(sim_clock.advance(time.dt)):
+        if replay_events is not None:
+            replay_frame() # En una repetición, el motor avanza con las entradas grabadas (un tick por registro).
+        else:
+            engine.step(sim_clock.step)
+    # Copia a la escena las posiciones interpoladas entre los dos últimos ticks.
+    if target_batch is None:
+        engine.swarm.sync(target_nodes, sim_clock.alpha)
+    elif engine.active: # Al terminar el nivel clear_targets() deja de dibujarlos aunque sigan en el enjambre.
+        target_batch.sync(engine.swarm, sim_clock.alpha)
+    hud.flush() # Redibuja, como mucho una vez por fotograma, los campos del HUD que cambiaron.
+
+# Repite en la ventana las entradas grabadas hasta el siguiente tick (incluido).
+def replay_frame():
+    global replay_index
+    while replay_index < len(replay_events):
+        kind, values = replay_events[replay_index]
+        replay_index += 1
+        if kind in (LEVEL, STOP): # Los cambios de nivel pasan por la interfaz para que también se vean.
+            results_panel.hide()
+            if kind == LEVEL:
+                start_level(values[0])
+            elif values and values[0] == MENU_MAIN: # Las sesiones de la versión 1 no guardan el menú.
+                show_main_menu()
+            else:
+                show_level_select_menu()
+        else:
+            apply_event(engine, kind, values)
+        if kind == FRAME:
+            return
+    if replay_index == len(replay_events):
+        replay_index += 1
+        print('fin de la repetición:', os.environ['REPLAY'])
 
 # --- Inicialización de la Aplicación Ursina ---
 # Crea la ventana de la aplicación Ursina. Set fullscreen=True to make the window maximize to the full screen.
+configure_audio(MUSIC_BUFFER_SECONDS) # Tamaño del búfer de la música en streaming (antes de crear la aplicación).
 app = Ursina(title='AIM PRESICION DDC', borderless=False, fullscreen=True)
 
 # --- SOLUCIÓN PARA EL ERROR 'info_text' y color de los números de FPS ---
 # Asegúrate de que el contador de FPS esté habilitado
 window.fps_counter.enabled = True
 
+# Contadores de diagnóstico: en pantalla con el perfilador (F3) y en el JSON de la sesión (F4).
+def diagnostics():
+    return {
+        'entities': registry.counts(), # Entidades vivas por categoría.
+        'pools': {name: pool.stats() for name, pool in (('targets', target_pool), ('effects', effect_pool)) if pool is not None},
+        'assets': assets.stats(), # Caché de recursos: aciertos, memoria usada y descartes.
+    }
+
+def diagnostics_text():
+    data = diagnostics()
+    lines = ['  '.join(f"{category} {count['enabled']}/{count['total']}" for category, count in data['entities'].items())]
+    for name, pool in data['pools'].items(): # Reutilizadas / construidas de nuevo por falta de libres.
+        lines.append(f"pool {name}: {pool['hits']} reusadas, {pool['misses']} nuevas, {pool['active']} en uso, {pool['free']} libres")
+    cache = data['assets']
+    lines.append(f"recursos: {cache['cached']} en caché, {cache['used_bytes'] / 2**20:.0f}/{cache['budget'] / 2**20:.0f} MB, "
+                 f"{cache['hit_rate']:.0%} aciertos, {cache['evictions']} descartados, {cache['load_seconds']:.2f} s cargando, "
+                 f"{cache['dedup_saved_bytes'] / 1024:.0f} KB ahorrados por texturas repetidas")
+    return '\n'.join(lines)
+
+# Reporte del perfilador en pantalla (F3), con las entidades vivas por categoría, los pools y la caché de recursos.
+profiler_overlay = ProfilerOverlay(profiler, extra=diagnostics_text)
+
+# Textos de depuración de Ursina (FPS y contadores), registrados para no buscarlos entre todas las entidades.
+for debug_text in (window.fps_counter, window.entity_counter, window.collider_counter):
+    registry.add(debug_text, 'debug')
+
 # Función para colorear los textos de depuración
 def set_debug_text_color():
-    # Iteramos sobre todas las entidades de tipo Text en la escena
-    for entity in scene.entities:
-        if isinstance(entity, Text):
-            # Comprobamos si el texto contiene dígitos y es de color blanco (común para los stats de Ursina)
-            if entity.text and any(char.isdigit() for char in entity.text):
-                if entity.color == color.white or entity.color == color.light_gray:
-                    entity.color = color.black # Cambia el color a negro para que se vea en fondos claros
+    # Solo recorre los textos de depuración registrados, no toda la escena.
+    for entity in registry.entities('debug'):
+        # Comprobamos si el texto contiene dígitos y es de color blanco (común para los stats de Ursina)
+        if entity.text and any(char.isdigit() for char in entity.text):
+            if entity.color == color.white or entity.color == color.light_gray:
+                entity.color = color.black # Cambia el color a negro para que se vea en fondos claros
     # Opcional: ajustar el fondo del contador de FPS si existe
     if window.fps_counter.enabled and hasattr(window.fps_counter, 'bg'):
         window.fps_counter.bg.color = color.clear # Hace el fondo transparente
@@ -455,152 +489,20 @@ def set_debug_text_color():
 invoke(set_debug_text_color, delay=0.1)
 
 
-# --- Sonidos ---
-gunshot_pistol_sound = Audio('assets/sounds/sonidoArma1.mp3', loop=False, autoplay=False, volume=1.0)
-gunshot_rifle_sound = Audio('assets/sounds/sonidoRifle.mp3', loop=False, autoplay=False, volume=0.5)
-gunshot_shotgun_sound = Audio('assets/sounds/sonidoEscopeta.mp3', loop=False, autoplay=False, volume=3.0) 
-hit_sound = Audio('assets/sounds/hit.mp3', loop=False, autoplay=False, volume=0.5)
-
-
-#-------////////// INTERFAS DEL JUEGO//////////--------
-# --- Creación del Entorno (Cabina de Disparo con estilo oscuro) ---
-# Entidad para el fondo general, que no se usa directamente en la cabina de disparo actual (deshabilitado).
-shooting_range_background = Entity(
-    model='quad',
-    texture='assets/textures/mapa.png',
-    scale=(100, 50), # Un tamaño grande para cubrir el fondo.
-    position=(0, 0, 50), # Posición Z alejada del jugador para que no interfiera con la vista.
-    rotation_y =180, # Rotación para que la textura se vea correctamente.
-    double_sided=True # Permite que la textura se vea desde ambos lados del plano.
-).disable() # Se crea, pero se deshabilita inmediatamente.
-
-# Cabina de Disparo - ESTILO OSCURO*
-# Pared trasera del escenario de disparo.
-back_wall = Entity(# Crea una nueva entidad (un objeto en la escena) y la asigna a la variable 'back_wall'.
-    model='cube', # Define la forma de la entidad. En este caso, es un cubo.
-    scale=(40, 30, 1), # Ancho: 40 unidades, Alto: 30, Profundidad: 1.
-    position=(0, 15, 30), # Ubicación central: X=0, Y=15 (centro de la pared, para que la base esté en y=0), Z=30.
-    texture='assets/textures/mapa4.png', # Textura aplicada a la pared.
-    color=color.white, # Cambiado a blanco para que la textura se vea sin tintes de color.
-    collider='box' # Asigna un colisionador de tipo caja para interacciones físicas.
-)
-
-# Pared izquierda del escenario.
-left_wall = Entity(
-    model='cube',
-    scale=(2, 30, 60), # Ancho: 1, Alto: 30, Profundidad: 60 (cubre el rango Z).
-    position=(-20, 15, 7.5), # Posición X ajustada a -20 (izquierda), Y=15 para que la base esté en y=0.
-    texture='assets/textures/mapa4.png', # Textura aplicada a la pared izquierda.
-    color=color.white, # Asegura que la textura se vea
-    collider='box'
-)
-
-# Pared derecha del escenario.
-right_wall = Entity(
-    model='cube',
-    scale=(2, 30, 60), # Ancho: 1, Alto: 30, Profundidad: 60.
-    position=(20, 15, 7.5), # Posición X ajustada a 20 (derecha), Y=15 para que la base esté en y=0.
-    texture='assets/textures/mapa4.png', # Textura aplicada a la pared derecha.
-    color=color.white, # Asegura que la textura se vea
-    collider='box'
-)
-
-# Techo del escenario.
-ceiling = Entity(
-    model='cube',
-    scale=(42, 1, 45), # ANCHO AJUSTADO: Ahora es 42 para cubrir el espacio de 40 de la pared trasera y un poco más.
-    position=(0, 30, 7.5), # Posición X=0 (centrado), Y=30 (altura del techo, encima de las paredes), Z=7.5 (posición Z central).
-    texture='assets/textures/cielo.jpg', # Textura del cielo (asumiendo que 'cieloo.png' es la versión oscura).
-    color=color.white, # Asegura que la textura se vea
-    collider='box'
-)
-
-# Suelo (con textura de césped oscuro)
-ground_plane = Entity(
-    model='plane', # Un plano es una superficie plana.
-    scale=(150, 1, 150), # Un tamaño muy grande para asegurar que siempre haya suelo
-    position=(0, 0, 5), # ¡CAMBIADO! Posición Y ahora en 0, que es la base del mundo.
-    texture='assets/textures/cesped.png', # Cambiado a una textura de cesped oscuro.
-    texture_scale=(2, 2), # Escala de la textura para que se vea más grande y cercano.
-    collider='box'
-)
-
-# Cielo del juego (completamente negro).
-sky_color = Sky(color=color.black)
+# --- Recursos ---
+# Administrador de texturas, música y fuentes con precarga en segundo plano y presupuesto de memoria.
+# Las texturas se cargan desde la caché preprocesada cuando está al día con el archivo original,
+# y las que tienen exactamente los mismos bytes (como los botones) comparten una sola copia.
+assets = AssetManager(ursina_loaders(TextureCache()), budget=ASSET_BUDGET, aliases=content_aliases())
 
-# Luz direccional (simula una fuente de luz lejana como el sol).
-sun = DirectionalLight(y=10, x=20, shadows=True, color=color.white) # Con sombras y color blanco.
-# ¡AÑADIMOS LUZ AMBIENTAL para iluminar las áreas en sombra!
-# La luz ambiental ilumina uniformemente toda la escena, reduciendo las sombras muy oscuras.
-ambient_light = AmbientLight(color=color.rgba(100, 100, 100, 255)) # Una luz ambiental gris suave.
+# Mientras se muestra el menú principal, el hilo de recursos ya decodifica las texturas del escenario,
+# los objetivos y los menús; las etapas del arranque las toman después de la caché.
+assets.preload_many(BOOT_ASSETS)
 
 # --- Configuración del Jugador (Cámara estática) ---
 # camera.position = (0, 0, -15) # Esta línea se reemplaza por la creación del FirstPersonController
 camera.fov = 80 # Campo de visión de la cámara.
 
-# --- Arma y Mira (DISEÑOS MEJORADOS y CORREGIDOS) ---
-# Asegúrate que todas estas texturas existan en 'assets/textures/'
-# y sean archivos .png con transparencia si lo deseas.
-
-# Pistola mejorada
-# La entidad 'pistol' ahora solo actúa como un contenedor para sus partes (modelos más pequeños que la componen).
-pistol = Entity(parent=None, position=(0.4, -0.43, 1.2), rotation=(0, 0, 0)) # Parent se asignará en start_level
-Entity(parent=pistol, model='cube', scale=(0.11, 0.1, 0.6), texture='assets/textures/body.jpg', color=color.blue) # Cuerpo principal de la pistola.
-Entity(parent=pistol, model='cube', scale=(0.12, 0.2, 0.2), position=(0, -0.2, -0.2), texture='assets/textures/pistol_grip.png', color=color.black) # Empuñadura de la pistola.
-Entity(parent=pistol, model='cube', scale=(0.1, 0.13, 0.55), position=(0, 0.04, 0), texture='assets/textures/prueba.jpg', color=color.blue) # Corredera de la pistola.
-Entity(parent=pistol, model='cube', scale=(0.05, 0.05, 0.1), position=(0, 0.07, 0.3), texture='assets/textures/pistol_barrel.png', color=color.black) # Cañón asomando.
-Entity(parent=pistol, model='cube', scale=(0.04, 0.08, 0.05), position=(0, -0.07, -0.1), texture='assets/textures/pistol_trigger.png', color=color.black) # Gatillo de la pistola.
-Entity(parent=pistol, model='cube', scale=(0.02, 0.02, 0.05), position=(0, 0.11, 0.25), texture='assets/textures/pistol_sight_front.png', color=color.red) # Miras de la pistola (delantera).
-Entity(parent=pistol, model='cube', scale=(0.04, 0.02, 0.04), position=(0, 0.12, -0.25), texture='assets/textures/pistol_sight_rear.png', color=color.red) # Miras de la pistola (trasera).
-pistol.disable() # La pistola está deshabilitada por defecto al inicio.
-
-
-# Rifle mejorado
-# La entidad 'rifle' ahora solo actúa como un contenedor.
-rifle = Entity(parent=None, position=(0.6, -0.55, 1.8), rotation=(0,0,0)) # Parent se asignará en start_level
-Entity(parent=rifle, model='cube', scale=(0.1, 0.1, 1.2), texture='assets/textures/GUN_Material.003_BaseColor.jpg', color=color.red) # Cuerpo principal / Receptor del rifle.
-Entity(parent=rifle, model='cylinder', scale=(0.05, 0.05, 0.8), position=(0, 0, 0.6), rotation_x=90, texture='assets/textures/rifle_barrel.png', color=color.black) # Cañón del rifle.
-Entity(parent=rifle, model='cube', scale=(0.1, 0.25, 0.3), position=(0, -0.1, -0.6), texture='assets/textures/GUN_Material.003_BaseColor.jpg', color=color.red) # Culata del rifle.
-Entity(parent=rifle, model='cube', scale=(0.08, 0.2, 0.1), position=(0, -0.15, -0.3), texture='assets/textures/GUN_Material.003_BaseColor.jpg', color=color.red) # Empuñadura de pistola del rifle.
-Entity(parent=rifle, model='cylinder', scale=(0.05, 0.05, 0.3), position=(0, 0.08, 0.2), rotation_x=90, texture='assets/textures/rifle_scope.png', color=color.yellow) # Mira telescópica del rifle.
-Entity(parent=rifle, model='circle', scale=0.06, position=(0, 0.08, 0.45), rotation_x=90, texture='assets/textures/rifle_scope_lens.png', color=color.white) # Lente de la mira telescópica.
-Entity(parent=rifle, model='cube', scale=(0.02, 0.1, 0.02), position=(-0.05, -0.08, 0.3), texture='assets/textures/rifle_bipod_left.png', color=color.black) # Bípode del rifle (patas).
-Entity(parent=rifle, model='cube', scale=(0.02, 0.1, 0.02), position=(0.05, -0.08, 0.3), texture='assets/textures/rifle_bipod_right.png', color=color.black) # Cargador del rifle.
-Entity(parent=rifle, model='cube', scale=(0.06, 0.2, 0.1), position=(0, -0.1, -0.1), texture='assets/textures/rifle_magazine.png', color=color.black) # Riel Picatinny en la parte superior.
-Entity(parent=rifle, model='cube', scale=(0.08, 0.01, 0.8), position=(0, 0.06, 0), texture='assets/textures/rifle_rail.png', color=color.black) # Riel Picatinny en la parte inferior.
-rifle.disable() # El rifle está deshabilitado por defecto al inicio.
-
-# Escopeta mejorada
-shotgun = Entity(parent=None, position=(0.5, -0.43, 1.5), rotation=(0,0,0)) # Parent se asignará en start_level
-Entity(parent=shotgun, model='cube', scale=(0.11, 0.10, 1.0), texture='assets/textures/prueba.jpg', color=color.green) # Cuerpo principal de la escopeta.
-Entity(parent=shotgun, model='cylinder', scale=(0.08, 0.08, 0.8), position=(0, 0, 0.5), rotation_x=90, texture='assets/textures/shotgun_barrel.png', color=color.white) # Cañón de la escopeta.
-Entity(parent=shotgun, model='cube', scale=(0.10, 0.1, 0.25), position=(0, -0.05, 0.2), texture='assets/textures/shotgun_forend.png', color=color.black) # Guardamanos/Bomba de la escopeta.
-Entity(parent=shotgun, model='cube', scale=(0.12, 0.3, 0.15), position=(0, -0.2, -0.4), texture='assets/textures/prueba.jpg', color=color.green) # Culata y empuñadura de la escopeta.
-Entity(parent=shotgun, model='cube', scale=(0.10, 0.05, 0.2), position=(-0.04, 0.1, -0.1), texture='assets/textures/prueba.jpg', color=color.green) # Recámara o parte superior del cuerpo de la escopeta.
-Entity(parent=shotgun, model='cylinder', scale=(0.05, 0.05, 0.7), position=(0, -0.08, 0.3), rotation_x=90, texture='assets/textures/shotgun_magtube.png', color=color.white) # Cargador tubular bajo el cañón de la escopeta.
-Entity(parent=shotgun, model='cube', scale=(0.02, 0.03, 0.05), position=(0, 0.06, 0.45), texture='assets/textures/shotgun_sight_front.png', color=color.red) # Alza y mira delantera de la escopeta.
-Entity(parent=shotgun, model='cube', scale=(0.04, 0.01, 0.05), position=(-0.06, 0.1, -0.4), texture='assets/textures/shotgun_sight_rear.png', color=color.black) # Alza y mira trasera de la escopeta.
-shotgun.disable() # La escopeta está deshabilitada por defecto al inicio.
-
-crosshair = Entity(parent=camera.ui, model='circle', scale=0.008, color=color.red) # La mira en el centro de la pantalla.
-
-# --- Interfaz de Usuario (UI) Mejorada ---
-game_hud = Entity(parent=camera.ui, enabled=False) # Entidad para el HUD del juego, deshabilitada por defecto.
-hud_background = Entity(
-parent=game_hud,
-model='quad',
-scale=(.35, .25), # Tamaño del fondo del HUD.
-position=window.bottom_left, color=color.black66) # Posición en la esquina inferior izquierda con un pequeño margen.
-# Un color negro semi-transparente.
-
-# Texto del HUD que mostrará la información del juego.
-hud_text = Text(
-parent=hud_background,
-text="", # Texto inicial vacío.
-origin=(-.5, .5), # Origen en la esquina inferior izquierda del texto.
-position=(-.45, .45), # Pequeño margen dentro del fondo del HUD.
-scale=1.2 # Tamaño del texto.
-)
 
 # --- Menú Principal ---
 # El logo ahora se escala para ocupar toda la pantalla y se centra.
@@ -608,7 +510,7 @@ scale=1.2 # Tamaño del texto.
 main_menu = Entity(
     parent=camera.ui, # Es hijo de la UI de la cámara para que siempre se vea en pantalla.
     model='quad', # Es un plano 2D.
-    texture='assets/textures/logo3.png', # Asegúrate que esta textura exista
+    texture=assets.texture('assets/textures/logo3.png'), # Asegúrate que esta textura exista
     scale=(window.aspect_ratio * 1, 1), # Escala para cubrir la pantalla completa. Puedes ajustar 1.4 si ves bordes.
     position=(0,0, 0), # Centrado en la pantalla
     enabled=True, # Habilitado por defecto al iniciar el juego.
@@ -632,7 +534,7 @@ start_button = Button( # Botón "INICIAR" en el menú principal.
     text_color=color.white, # Color del texto del botón.
     model='quad', # Modelo del botón, un plano 2D.
     radius=0.18, # Radio para bordes redondeados.
-    texture='assets/textures/button_start.jpg', # Usa una textura personalizada si tienes una
+    texture=assets.texture('assets/textures/button_start.jpg'), # Usa una textura personalizada si tienes una
     on_click=go_to_level_select, # Acción al hacer clic, va al menú de selección de nivel.
     z=-0.1 # Un valor Z ligeramente superior para asegurar que esté delante de otros elementos.
     # tooltip eliminado
@@ -651,131 +553,261 @@ quit_button = Button( # Botón "SALIR" en el menú principal.
     text_color=color.white, # Color del texto del botón.
     model='quad', # Modelo del botón, un plano 2D.
     radius=0.18, # Radio para bordes redondeados.
-    texture='assets/textures/button_quit.jpg', # Usa una textura personalizada si tienes una
+    texture=assets.texture('assets/textures/button_quit.jpg'), # Usa una textura personalizada si tienes una
     on_click=application.quit, # Acción al hacer clic, cierra la aplicación.
     z=-0.1 # Un valor Z ligeramente superior para asegurar que esté delante de otros elementos.
     # tooltip eliminado
 )
 
+# Barra de progreso del arranque, debajo de los botones; se oculta cuando termina de construirse el juego.
+boot_bar_background = Entity(parent=camera.ui, model='quad', scale=(0.94, 0.012), y=-0.42, z=-0.1, color=color.black66)
+boot_bar = Entity(parent=boot_bar_background, model='quad', origin=(-.5, 0), x=-.5, scale_x=0, z=-0.01, color=color.azure)
+
+for panel in (main_menu, start_button, quit_button):
+    registry.add(panel, 'ui')
+
+# --- Arranque por Etapas ---
+# Todo lo que no hace falta para el menú principal se construye en los fotogramas siguientes (una o
+# varias etapas por fotograma, ver boot.py). El orden importa: el panel de resultados va al final.
+@boot.stage('sonidos')
+def build_audio():
+    global music, sfx
+    # La música se lee en streaming y cambia de pista con un fundido; los efectos se decodifican una vez
+    # y suenan en voces reutilizables (ver SOUND_EFFECTS en config.py).
+    music = MusicPlayer(assets, volume=MUSIC_VOLUME, fade=MUSIC_FADE)
+    profiler.instrument(music, 'play', 'music_play')
+    profiler.instrument(music, 'stop', 'music_stop') # Antes stop_bg_music().
+    sfx = SoundEffects(max_voices=SFX_MAX_VOICES)
+    for name, effect in SOUND_EFFECTS.items():
+        sfx.load(name, effect['path'], voices=effect['voices'], volume=effect['volume'], priority=effect['priority'])
+
+@boot.stage('objetivos')
+def build_pools():
+    global target_pool, effect_pool, target_batch, hit_particles
+    # Se llenan al iniciar cada nivel según 'pool_size' y crecen si hacen falta más entidades.
+    target_pool = EntityPool(TargetSphere)
+    effect_pool = EntityPool(HitEffect)
+    # Con instancias, los pools quedan vacíos: un solo nodo dibuja a todos los objetivos y otro a todas las
+    # partículas de los impactos (si la GPU lo permite).
+    if instancing_supported(app.win.getGsg()):
+        if TARGET_INSTANCING:
+            target_batch = BillboardBatch(assets.texture('assets/textures/ovni.png'), parent=scene, cast_shadows=TARGET_CAST_SHADOWS)
+            profiler.instrument(target_batch, 'sync', 'target_batch_sync')
+        hit_particles = ParticleSystem(BillboardBatch(assets.texture('assets/textures/hit_effect.png'), parent=scene,
+                                                      capacity=PARTICLE_CAPACITY, depth_write=False), capacity=PARTICLE_CAPACITY)
+        profiler.instrument(hit_particles, 'update', 'particles_update')
+
+#-------////////// INTERFAS DEL JUEGO//////////--------
+@boot.stage('escenario')
+def build_arena():
+    global arena
+    # --- Creación del Entorno (Cabina de Disparo con estilo oscuro) ---
+    # Paredes, techo y suelo compilados en un solo nodo estático: una malla por textura y un solo colisionador
+    # con las cajas que el jugador necesita (ver arena.py). El fondo general deshabilitado ya no se construye.
+    arena = compile_static_scene(ARENA_PIECES, assets)
+
+    # Cielo del juego (completamente negro): basta con el color de fondo de la ventana. Sky() cargaba su
+    # textura de 4096x1024 en el hilo principal solo para teñirla de negro.
+    window.color = color.black
+
+@boot.stage('luces')
+def build_lights(): # Etapa aparte: crear el búfer de sombras del sol es lo más lento del arranque.
+    global sun, ambient_light
+    # Luz direccional (simula una fuente de luz lejana como el sol).
+    sun = DirectionalLight(y=10, x=20, shadows=True, color=color.white) # Con sombras y color blanco.
+    # ¡AÑADIMOS LUZ AMBIENTAL para iluminar las áreas en sombra!
+    # La luz ambiental ilumina uniformemente toda la escena, reduciendo las sombras muy oscuras.
+    ambient_light = AmbientLight(color=color.rgba(100, 100, 100, 255)) # Una luz ambiental gris suave.
+
+# --- Arma y Mira (DISEÑOS MEJORADOS y CORREGIDOS) ---
+@boot.stage('armas')
+def build_weapon_rack():
+    global weapon_rack
+    # Asegúrate que todas estas texturas existan en 'assets/textures/'
+    # y sean archivos .png con transparencia si lo deseas.
+
+    # Cada arma es una sola malla horneada con su atlas (ver weapons.py); se construye al entrar a su nivel.
+    weapon_rack = WeaponRack(assets, parent=camera, registry=registry)
+
+@boot.stage('arma del nivel 1')
+def bake_first_weapon(): # Solo deja al día su .bam en disco (la primera vez tarda): la entidad se construye en start_level.
+    ensure_baked(LEVEL_CONFIG[1]['weapon'])
+
+@boot.stage('hud')
+def build_hud():
+    global crosshair, game_hud, hud_background, hud
+    crosshair = Entity(parent=camera.ui, model='circle', scale=0.008, color=color.red, enabled=False) # La mira en el centro de la pantalla.
+
+    game_hud = Entity(parent=camera.ui, enabled=False) # Entidad para el HUD del juego, deshabilitada por defecto.
+    hud_background = Entity(
+    parent=game_hud,
+    model='quad',
+    origin=(-.5, -.5), # Se ancla por su esquina inferior izquierda para quedar entero dentro de la pantalla.
+    scale=(.35, .22), # Tamaño del fondo del HUD.
+    position=window.bottom_left + Vec2(.02, .02), color=color.black66) # Posición en la esquina inferior izquierda con un pequeño margen.
+    # Un color negro semi-transparente.
+
+    # Campos del HUD: las etiquetas son textos fijos y los valores se dibujan con el atlas de dígitos.
+    hud_fields = Entity(parent=game_hud, position=window.bottom_left + Vec2(.04, .22))
+    hud = Hud(GlyphAtlas(application.internal_fonts_folder / Text.default_font), hud_fields, [
+        ('level', 'NIVEL ', 2),
+        ('targets', 'Objetivo: ', 7),
+        ('hits', 'Aciertos: ', 4),
+        ('accuracy', 'Precisión: ', 6),
+    ])
+    profiler.instrument(hud, 'flush', 'hud_flush')
+    registry.add(game_hud, 'ui')
+    registry.add(crosshair, 'ui')
 
 # --- Menú de Selección de Nivel ---
-level_select_menu = Entity(parent=camera.ui, enabled=False) # Entidad para el menú de selección de nivel, deshabilitada por defecto.
-level_title = Text(
-    parent=level_select_menu, 
-    text="Seleccionar Nivel", 
-    scale=4, 
-    origin=(0,0), 
-    y=0.3, 
-    color=color.white,
-    font='assets/fonts/keetano_katana.ttf'
-    ) # Título del menú.
-
-level_1_button = Button( #Boton para el Nivel 1.
-    parent=level_select_menu, 
-    text="Nivel 1", # Texto del botón.
-    scale=(0.35, 0.12), # Escala del botón.
-    y=0.13, # Posición Y del botón (arriba).
-    color=color.azure, # Color del botón.
-    highlight_color=color.cyan, # Color al pasar el ratón por encima.
-    pressed_color=color.lime, # Color al presionar el botón.
-    text_color=color.white,  # Color del texto del botón.
-    model='quad', # Modelo del botón, un plano 2D.
-    radius=0.18, 
-    texture='assets/textures/button_level1.jpg', # Usa una textura personalizada si tienes una
-    on_click=lambda: start_level(1) # Acción al hacer clic, inicia el nivel 1.
-)
+@boot.stage('menú de niveles')
+def build_level_select_menu():
+    global level_select_menu, level_title, level_1_button, level_2_button, level_3_button, level_buttons, level_best_texts, back_to_main_menu_button
+    level_select_menu = Entity(parent=camera.ui, enabled=False) # Entidad para el menú de selección de nivel, deshabilitada por defecto.
+    level_title = Text(
+        parent=level_select_menu, 
+        text="Seleccionar Nivel", 
+        scale=4, 
+        origin=(0,0), 
+        y=0.3, 
+        color=color.white,
+        font='assets/fonts/keetano_katana.ttf'
+        ) # Título del menú.
+
+    level_1_button = Button( #Boton para el Nivel 1.
+        parent=level_select_menu, 
+        text="Nivel 1", # Texto del botón.
+        scale=(0.35, 0.12), # Escala del botón.
+        y=0.13, # Posición Y del botón (arriba).
+        color=color.azure, # Color del botón.
+        highlight_color=color.cyan, # Color al pasar el ratón por encima.
+        pressed_color=color.lime, # Color al presionar el botón.
+        text_color=color.white,  # Color del texto del botón.
+        model='quad', # Modelo del botón, un plano 2D.
+        radius=0.18, 
+        texture=assets.texture('assets/textures/button_level1.jpg'), # Usa una textura personalizada si tienes una
+        on_click=lambda: start_level(1) # Acción al hacer clic, inicia el nivel 1.
+    )
 
-level_2_button = Button(# Botón para el Nivel 2.
-    parent=level_select_menu,
-    text="Nivel 2", # Texto del botón.
-    scale=(0.35, 0.12), # Escala del botón.
-    y=-0.01, # Posición Y del botón (casi al centro).
-    color=color.azure, # Color del botón.
-    highlight_color=color.cyan, # Color al pasar el ratón por encima.
-    pressed_color=color.lime, # Color al presionar el botón.
-    text_color=color.white, # Color del texto del botón.
-    model='quad', # Modelo del botón, un plano 2D.
-    radius=0.18, # Radio para bordes redondeados.
-    texture='assets/textures/button_level2.jpg', # Usa una textura personalizada si tienes una
-    on_click=lambda: start_level(2) # Acción al hacer clic, inicia el nivel 2.
-)
+    level_2_button = Button(# Botón para el Nivel 2.
+        parent=level_select_menu,
+        text="Nivel 2", # Texto del botón.
+        scale=(0.35, 0.12), # Escala del botón.
+        y=-0.01, # Posición Y del botón (casi al centro).
+        color=color.azure, # Color del botón.
+        highlight_color=color.cyan, # Color al pasar el ratón por encima.
+        pressed_color=color.lime, # Color al presionar el botón.
+        text_color=color.white, # Color del texto del botón.
+        model='quad', # Modelo del botón, un plano 2D.
+        radius=0.18, # Radio para bordes redondeados.
+        texture=assets.texture('assets/textures/button_level2.jpg'), # Usa una textura personalizada si tienes una
+        on_click=lambda: start_level(2) # Acción al hacer clic, inicia el nivel 2.
+    )
 
-level_3_button = Button( # Botón para el Nivel 3.
-    parent=level_select_menu,
-    text="Nivel 3", # Texto del botón.
-    scale=(0.35, 0.12), # Escala del botón.
-    y=-0.15, # Cambiado para que aparezca debajo del botón 2
-    color=color.azure, # Color del botón.
-    highlight_color=color.cyan, # Color al pasar el ratón por encima.
-    pressed_color=color.lime, # Color al presionar el botón.
-    text_color=color.white, # Color del texto del botón.
-    model='quad', # Modelo del botón, un plano 2D.
-    radius=0.18, # Radio para bordes redondeados.
-    texture='assets/textures/button_level3.jpg', # Usa una textura personalizada si tienes una
-    on_click=lambda: start_level(3) # Acción al hacer clic, inicia el nivel 3.
-)
+    level_3_button = Button( # Botón para el Nivel 3.
+        parent=level_select_menu,
+        text="Nivel 3", # Texto del botón.
+        scale=(0.35, 0.12), # Escala del botón.
+        y=-0.15, # Cambiado para que aparezca debajo del botón 2
+        color=color.azure, # Color del botón.
+        highlight_color=color.cyan, # Color al pasar el ratón por encima.
+        pressed_color=color.lime, # Color al presionar el botón.
+        text_color=color.white, # Color del texto del botón.
+        model='quad', # Modelo del botón, un plano 2D.
+        radius=0.18, # Radio para bordes redondeados.
+        texture=assets.texture('assets/textures/button_level3.jpg'), # Usa una textura personalizada si tienes una
+        on_click=lambda: start_level(3) # Acción al hacer clic, inicia el nivel 3.
+    )
+
+    # Lista de botones de nivel para facilitar la actualización de su estado.
+    level_buttons = [level_1_button, level_2_button, level_3_button]
+    # Mejor precisión guardada de cada nivel (storage.py), junto a su botón.
+    level_best_texts = [Text(parent=level_select_menu, text='', x=0.2, y=button.y, origin=(-.5, 0), scale=1.2,
+                             color=color.white) for button in level_buttons]
+
+    # Botón para volver al menú principal desde la selección de nivel
+    back_to_main_menu_button = Button(
+        parent=level_select_menu,
+        text="Volver al Menú Principal",
+        scale=(0.35, 0.12),
+        y=-0.35, # Posición debajo de los botones de nivel
+        color=color.red,
+        highlight_color=color.cyan,
+        pressed_color=color.orange,
+        text_color=color.white,
+        model='quad',
+        radius=0.18,
+        texture=assets.texture('assets/textures/button_menu.jpg'),
+        on_click=show_main_menu
+    )
+    registry.add(level_select_menu, 'ui')
 
-# Lista de botones de nivel para facilitar la actualización de su estado.
-level_buttons = [level_1_button, level_2_button, level_3_button]
-
-# Botón para volver al menú principal desde la selección de nivel
-back_to_main_menu_button = Button(
-    parent=level_select_menu,
-    text="Volver al Menú Principal",
-    scale=(0.35, 0.12),
-    y=-0.35, # Posición debajo de los botones de nivel
-    color=color.red,
-    highlight_color=color.cyan,
-    pressed_color=color.orange,
-    text_color=color.white,
-    model='quad',
-    radius=0.18,
-    texture='assets/textures/button_menu.jpg',
-    on_click=show_main_menu
-)
 #-----/////////////---
 # --- Menú de Pausa ---
-pause_menu = Entity(parent=camera.ui, enabled=False) # Entidad para el menú de pausa, deshabilitada por defecto.
-pause_background = Entity(parent=pause_menu, model='quad', scale=(.6, .6), color=color.white, z=1) # Fondo semitransparente.
-pause_text = Text(
-    parent=pause_menu, 
-    text="PAUSA", 
-    scale=4, 
-    origin=(0,0), 
-    y=0.2, 
-    z=-0.1, 
-    color=color.black,
-    font='assets/fonts/keetano_katana.ttf'
-    ) # Título de pausa.
-
-resume_button = Button(
-    parent=pause_menu,
-    text="Reanudar",
-    scale=(0.3, 0.1),
-    y=0,
-    radius=0.18,
-    color=color.azure,
-    highlight_color=color.cyan,
-    pressed_color=color.lime,
-    texture='assets/textures/button_reanudar.jpg',
-    on_click=resume_game
-)
-
-quit_to_main_button = Button(
-    parent=pause_menu,
-    text="Salir al Menú Principal",
-    scale=(0.3, 0.1),
-    y=-0.15,
-    radius=0.18,
-    color=color.red,
-    highlight_color=color.orange,
-    pressed_color=color.yellow,
-    texture='assets/textures/button_menu.jpg',
-    on_click=show_main_menu
-)
+@boot.stage('menú de pausa')
+def build_pause_menu():
+    global pause_menu, pause_background, pause_text, resume_button, quit_to_main_button
+    pause_menu = Entity(parent=camera.ui, enabled=False) # Entidad para el menú de pausa, deshabilitada por defecto.
+    pause_background = Entity(parent=pause_menu, model='quad', scale=(.6, .6), color=color.white, z=1) # Fondo semitransparente.
+    pause_text = Text(
+        parent=pause_menu, 
+        text="PAUSA", 
+        scale=4, 
+        origin=(0,0), 
+        y=0.2, 
+        z=-0.1, 
+        color=color.black,
+        font='assets/fonts/keetano_katana.ttf'
+        ) # Título de pausa.
+
+    resume_button = Button(
+        parent=pause_menu,
+        text="Reanudar",
+        scale=(0.3, 0.1),
+        y=0,
+        radius=0.18,
+        color=color.azure,
+        highlight_color=color.cyan,
+        pressed_color=color.lime,
+        texture=assets.texture('assets/textures/button_reanudar.jpg'),
+        on_click=resume_game
+    )
 
-# Iniciar el juego mostrando el menú principal al principio
-show_main_menu()
+    quit_to_main_button = Button(
+        parent=pause_menu,
+        text="Salir al Menú Principal",
+        scale=(0.3, 0.1),
+        y=-0.15,
+        radius=0.18,
+        color=color.red,
+        highlight_color=color.orange,
+        pressed_color=color.yellow,
+        texture=assets.texture('assets/textures/button_menu.jpg'),
+        on_click=show_main_menu
+    )
+    registry.add(pause_menu, 'ui')
+
+@boot.stage('resultados')
+def build_results_panel():
+    global results_panel
+    # Panel de resultados: se construye al final, porque crear textos con una fuente vacía su caché de glifos.
+    results_panel = ResultsPanel(assets, on_retry=start_level, on_menu=show_level_select_menu, registry=registry)
+    profiler.instrument(results_panel, 'show', 'results_show')
+
+# Al terminar el arranque se oculta la barra y se informan los tiempos (BOOT_BENCHMARK=1 los guarda y cierra el juego).
+def on_boot_done(report):
+    boot_bar_background.disable()
+    print(boot.summary())
+    cache = assets.stats()
+    if cache['shared_paths']: # Memoria que no se gastó en cargar dos veces las texturas con el mismo contenido.
+        print(f"recursos: {cache['shared_paths']} rutas comparten textura cargada ({cache['dedup_saved_bytes'] / 1024:.0f} KB ahorrados en memoria)")
+    if os.environ.get('BOOT_BENCHMARK') == '1':
+        for name, seconds in report['stages'].items():
+            print(f'  {name:<16} {seconds * 1000:8.1f} ms')
+        print('reporte guardado en', save_benchmark(report))
+        application.quit()
+
+boot.on_done(on_boot_done)
 
 # --- Ejecutar la Aplicación Ursina ---
 app.run() # Inicia el bucle principal de Ursina.
@@ -0,0 +1,63 @@
+# --- Escenario Estático ---
+# La cabina de disparo (paredes, techo y suelo) nunca se mueve, así que en lugar de crear una entidad
+# con su propio colisionador por pieza, se "compila" en un solo nodo: las piezas que comparten textura
+# se unen en una sola malla (las tres paredes con mapa4.png son una sola llamada de dibujo) y todos los
+# colisionadores que el jugador necesita quedan en un único nodo de colisión.
+# Las piezas deshabilitadas (decoraciones que no se ven) ni siquiera se construyen.
+from weapons import flatten_batch, part_mesh
+
+# --- Piezas del Escenario ---
+# Mismos modelos, tamaños, posiciones y texturas con los que antes se creaba cada entidad.
+# 'collider': si el jugador choca con la pieza (solo el suelo y las paredes; al techo nunca llega).
+ARENA_PIECES = [
+    # Fondo general que no se usa en la cabina de disparo actual (antes se creaba y se deshabilitaba enseguida).
+    {'name': 'shooting_range_background', 'model': 'quad', 'scale': (100, 50, 1), 'position': (0, 0, 50), 'rotation_y': 180,
+     'texture': 'assets/textures/mapa.png', 'enabled': False},
+    # Pared trasera: Ancho 40, Alto 30, Profundidad 1; Y=15 para que la base esté en y=0.
+    {'name': 'back_wall', 'model': 'cube', 'scale': (40, 30, 1), 'position': (0, 15, 30),
+     'texture': 'assets/textures/mapa4.png', 'collider': True},
+    # Paredes izquierda y derecha (cubren el rango Z).
+    {'name': 'left_wall', 'model': 'cube', 'scale': (2, 30, 60), 'position': (-20, 15, 7.5),
+     'texture': 'assets/textures/mapa4.png', 'collider': True},
+    {'name': 'right_wall', 'model': 'cube', 'scale': (2, 30, 60), 'position': (20, 15, 7.5),
+     'texture': 'assets/textures/mapa4.png', 'collider': True},
+    # Techo: ancho 42 para cubrir la pared trasera y un poco más; a Y=30, encima de las paredes.
+    {'name': 'ceiling', 'model': 'cube', 'scale': (42, 1, 45), 'position': (0, 30, 7.5),
+     'texture': 'assets/textures/cielo.jpg'},
+    # Suelo de césped oscuro, muy grande para que siempre haya suelo.
+    {'name': 'ground_plane', 'model': 'plane', 'scale': (150, 1, 150), 'position': (0, 0, 5),
+     'texture': 'assets/textures/cesped.png', 'texture_scale': (2, 2), 'collider': True},
+]
+
+
+def compile_static_scene(pieces, assets, parent=None):
+    # Devuelve una entidad con una malla por textura y un solo colisionador con una caja por pieza sólida.
+    from panda3d.core import CollisionBox, NodePath, Point3, Texture, TextureStage
+    from ursina import Collider, Entity, color, scene
+
+    root = Entity(name='static_scene', parent=parent or scene)
+    stage = TextureStage.getDefault()
+    placeholder = Texture('batch')
+    batches = {} # (textura, escala de textura) -> nodo con las piezas que la usan
+    boxes = []
+    for piece in pieces:
+        if not piece.get('enabled', True):
+            continue # No se construye lo que no se va a ver.
+        texture_scale = piece.get('texture_scale', (1, 1))
+        batch = batches.setdefault((piece['texture'], texture_scale), NodePath('batch'))
+        node = part_mesh(piece['model']).copyTo(batch)
+        node.setPos(*piece['position'])
+        node.setScale(*piece['scale'])
+        node.setH(-piece.get('rotation_y', 0)) # Ursina gira en sentido contrario a Panda3D.
+        node.setColor(color.white)
+        node.setTexture(placeholder)
+        node.setTexScale(stage, *texture_scale)
+        if piece.get('collider'): # Caja que envuelve la pieza (igual que collider='box'), con algo de grosor.
+            low, high = node.getTightBounds(batch)
+            half = [max(size / 2, 0.001) for size in high - low]
+            boxes.append(CollisionBox(Point3((low + high) / 2), *half))
+    for (texture, _), batch in batches.items():
+        assets.hold(Entity(parent=root, model=flatten_batch(batch), texture=assets.texture(texture)), 'texture', texture)
+    if boxes:
+        root.collider = Collider(root, boxes)
+    return root
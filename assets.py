@@ -0,0 +1,249 @@
+# --- Administrador de Recursos ---
+# Guarda en un solo lugar las texturas, la música y las fuentes del juego.
+# - Precarga los recursos del siguiente nivel en un hilo de trabajo mientras el jugador está en el
+#   menú de niveles, para que la primera entrada a cada nivel no se trabe cargando archivos.
+# - Cuenta cuántas partes del juego usan cada recurso (referencias) y, si se pasa del presupuesto
+#   de memoria, descarta primero los que no se usan y llevan más tiempo sin pedirse (LRU).
+# - Lleva estadísticas de tiempos de carga y de aciertos de caché.
+# - Las rutas con el mismo contenido (alias) comparten una sola copia cargada.
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+class AssetLoader: # Cómo se carga, se mide y se descarga un tipo de recurso.
+    def __init__(self, load, size=None, unload=None, prepare=None):
+        self.load = load # load(ruta) -> recurso. Se llama desde el hilo de trabajo o el principal.
+        self.size = size or (lambda asset, path: os.path.getsize(path)) # Bytes que ocupa en memoria.
+        self.unload = unload # unload(recurso) al sacarlo de la caché (opcional).
+        self.prepare = prepare # prepare(recurso) en el hilo principal tras precargar (p. ej. subir la textura a la GPU).
+
+
+class AssetManager:
+    def __init__(self, loaders, budget=256 * 1024 * 1024, workers=1, aliases=None): # 'budget' es el presupuesto de memoria en bytes.
+        self.loaders = loaders # Tipo de recurso ('texture', 'music', 'font', ...) -> AssetLoader.
+        self.budget = budget
+        self.aliases = aliases or {} # Ruta -> ruta canónica con los mismos bytes (ver texture_cache.content_aliases).
+        self.shared = {} # (tipo, ruta canónica) -> rutas distintas que se pidieron y comparten esa copia.
+        self.cache = OrderedDict() # (tipo, ruta) -> [recurso, bytes, referencias]; el orden es de menos a más reciente.
+        self.pending = {} # (tipo, ruta) -> carga en curso en el hilo de trabajo.
+        self.ready = [] # Recursos precargados que esperan su paso final en el hilo principal.
+        self.failed = {} # (tipo, ruta) -> excepción de la última precarga que falló (no se vuelve a precargar sola).
+        self.used_bytes = 0
+        self.hits = 0 # Pedidos que ya estaban en caché.
+        self.misses = 0 # Pedidos que hubo que cargar (o esperar a que terminara de precargarse).
+        self.evictions = 0
+        self.load_times = {} # (tipo, ruta) -> segundos que tardó en cargarse.
+        self.lock = threading.RLock()
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='assets')
+
+    # --- Carga ---
+    def _key(self, kind, path): # Clave de caché: los duplicados usan la ruta canónica.
+        if path not in self.aliases:
+            return (kind, path)
+        key = (kind, self.aliases[path])
+        with self.lock:
+            self.shared.setdefault(key, set()).add(path)
+        return key
+
+    def _load(self, kind, path): # Carga un recurso y mide cuánto tarda.
+        loader = self.loaders[kind]
+        started = time.perf_counter()
+        asset = loader.load(path)
+        elapsed = time.perf_counter() - started
+        with self.lock:
+            self.load_times[(kind, path)] = elapsed
+        return asset, loader.size(asset, path)
+
+    def _store(self, key, asset, size, refs=0): # Guarda un recurso recién cargado en la caché.
+        with self.lock:
+            if key in self.cache:
+                entry = self.cache[key]
+                entry[2] += refs
+                return entry[0]
+            self.cache[key] = [asset, size, refs]
+            self.used_bytes += size
+            self._evict()
+            return asset
+
+    def _background_load(self, key): # Se ejecuta en el hilo de trabajo.
+        try:
+            asset, size = self._load(*key)
+            with self.lock:
+                self._store(key, asset, size)
+                self.ready.append(key)
+            return asset
+        except Exception as error:
+            with self.lock:
+                self.failed[key] = error
+            raise
+        finally: # Aunque falle: si quedara en 'pending', try_acquire() devolvería None para siempre.
+            with self.lock:
+                self.pending.pop(key, None)
+
+    def preload(self, kind, path): # Pide cargar un recurso en segundo plano (no bloquea).
+        key = self._key(kind, path)
+        with self.lock:
+            if key in self.cache or key in self.pending or key in self.failed or not os.path.exists(key[1]):
+                return
+            self.pending[key] = self.executor.submit(self._background_load, key)
+
+    def preload_many(self, assets): # 'assets' es un diccionario tipo -> lista de rutas.
+        for kind, paths in assets.items():
+            for path in paths:
+                self.preload(kind, path)
+
+    def acquire(self, kind, path): # Devuelve el recurso (cargándolo si hace falta) y suma una referencia.
+        key = self._key(kind, path)
+        with self.lock:
+            entry = self.cache.get(key)
+            if entry is not None:
+                self.hits += 1
+                self.cache.move_to_end(key) # Ahora es el más reciente.
+                entry[2] += 1
+                return entry[0]
+            self.misses += 1
+            future = self.pending.get(key)
+        if future is not None: # Ya se estaba precargando: solo espera a que termine.
+            future.result()
+            with self.lock:
+                entry = self.cache.get(key)
+                if entry is not None:
+                    self.cache.move_to_end(key)
+                    entry[2] += 1
+                    return entry[0]
+        asset = self._store(key, *self._load(*key), refs=1) # Si falla, la excepción llega a quien lo pidió.
+        with self.lock:
+            self.failed.pop(key, None)
+        return asset
+
+    def try_acquire(self, kind, path): # Como acquire(), pero sin esperar: None si todavía se está cargando (o si falló, ver error()).
+        key = self._key(kind, path)
+        with self.lock:
+            entry = self.cache.get(key)
+            if entry is None:
+                if key not in self.pending:
+                    self.preload(kind, path)
+                return None
+            self.hits += 1
+            self.cache.move_to_end(key)
+            entry[2] += 1
+            return entry[0]
+
+    def error(self, kind, path): # Excepción de la precarga de 'path' si falló (None si no): para dejar de esperarla.
+        with self.lock:
+            return self.failed.get(self._key(kind, path))
+
+    def texture(self, path): # Atajo para las entidades: texture=assets.texture('assets/textures/...').
+        return self.acquire('texture', path)
+
+    def release(self, kind, path): # Resta una referencia; el recurso queda en caché hasta que haga falta espacio.
+        with self.lock:
+            entry = self.cache.get((kind, self.aliases.get(path, path)))
+            if entry is not None and entry[2] > 0:
+                entry[2] -= 1
+            self._evict()
+
+    def hold(self, owner, kind, path): # Suelta la referencia de 'path' cuando Ursina destruya la entidad 'owner' que la usa.
+        previous = getattr(owner, 'on_destroy', None) # Se encadena, igual que EntityRegistry.add.
+
+        def on_destroy():
+            self.release(kind, path)
+            if previous:
+                previous()
+        owner.on_destroy = on_destroy
+        return owner
+
+    def poll(self): # Llamar una vez por fotograma desde el hilo principal.
+        with self.lock: # El hilo de trabajo escribe en la caché mientras tanto.
+            ready, self.ready = self.ready, []
+            assets = [(self.loaders[kind].prepare, self.cache[(kind, path)][0]) for kind, path in ready if (kind, path) in self.cache]
+        for prepare, asset in assets:
+            if prepare:
+                prepare(asset)
+
+    # --- Memoria ---
+    def _evict(self): # Descarta los recursos sin referencias menos usados hasta volver al presupuesto.
+        if self.used_bytes <= self.budget:
+            return
+        for key in list(self.cache):
+            if self.used_bytes <= self.budget:
+                break
+            asset, size, refs = self.cache[key]
+            if refs > 0:
+                continue # Está en uso, no se puede descartar.
+            del self.cache[key]
+            self.used_bytes -= size
+            self.evictions += 1
+            unload = self.loaders[key[0]].unload
+            if unload:
+                unload(asset)
+
+    def stats(self): # Resumen para diagnóstico.
+        with self.lock:
+            requests = self.hits + self.misses
+            # Memoria que se habría usado cargando cada alias por separado.
+            saved = sum(self.cache[key][1] * (len(paths) - 1) for key, paths in self.shared.items() if key in self.cache)
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / requests if requests else 0.0,
+                'evictions': self.evictions,
+                'cached': len(self.cache),
+                'used_bytes': self.used_bytes,
+                'budget': self.budget,
+                'shared_paths': sum(len(paths) for paths in self.shared.values()),
+                'dedup_saved_bytes': saved,
+                'load_seconds': sum(self.load_times.values()),
+                'slowest': sorted(((t, f'{k}:{p}') for (k, p), t in self.load_times.items()), reverse=True)[:5],
+            }
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+# --- Cargadores para Ursina / Panda3D ---
+def ursina_loaders(texture_cache=None):
+    # Se importan aquí para que el administrador también se pueda usar sin ventana.
+    # 'texture_cache' (texture_cache.TextureCache) permite cargar la versión preprocesada de cada textura.
+    from pathlib import Path
+    from panda3d.core import AudioManager, Filename, TexturePool
+    from ursina import Texture, application
+
+    def load_texture(path):
+        if texture_cache is not None:
+            path = texture_cache.resolve(path)
+        if not os.path.exists(path): # Igual que Ursina: una textura que falta se deja sin textura.
+            print('textura no encontrada:', path)
+            return None
+        # Los .txo de la caché traen sus mipmaps y filtros lineales: sin 'mipmap', Ursina los pasaría a
+        # FT_nearest (su filtrado por defecto) y los mipmaps ocuparían memoria sin usarse nunca.
+        return Texture(Path(os.path.abspath(path)), filtering='mipmap' if path.endswith('.txo') else 'default')
+
+    def texture_size(texture, path): # Ancho x alto x bytes por píxel, más un tercio para los mipmaps.
+        if texture is None:
+            return 0
+        panda_texture = texture._texture
+        if panda_texture.getRamImageCompression(): # Comprimida: se mide lo que ocupa de verdad.
+            return panda_texture.getRamImageSize() * 4 // 3
+        return panda_texture.getXSize() * panda_texture.getYSize() * panda_texture.getNumComponents() * 4 // 3
+
+    def prepare_texture(texture): # Encola la subida a la GPU para que no ocurra en el primer fotograma que la dibuja.
+        window = application.base.win
+        if texture and window and window.getGsg():
+            texture._texture.prepare(window.getGsg().getPreparedObjects())
+
+    def load_music(path): # En streaming: solo abre el archivo; se decodifica de a poco mientras suena.
+        return application.base.musicManager.getSound(Filename.fromOsSpecific(os.path.abspath(path)), False, AudioManager.SM_stream)
+
+    def load_font(path):
+        application.base.loader.loadFont(path) # Queda en la caché de fuentes de Panda3D; Text(font=ruta) la reutiliza.
+        return path
+
+    return {
+        'texture': AssetLoader(load_texture, texture_size, lambda texture: texture and TexturePool.releaseTexture(texture._texture), prepare_texture),
+        'music': AssetLoader(load_music, lambda sound, path: 0), # Solo ocupa su pequeño búfer de streaming.
+        'font': AssetLoader(load_font),
+    }
@@ -0,0 +1,159 @@
+# --- Audio ---
+# - MusicPlayer: la música de cada nivel se lee del disco en streaming (Panda3D la decodifica de a poco
+#   en un búfer circular de MUSIC_BUFFER_SECONDS) y se abre en el hilo del administrador de recursos,
+#   así que empezar una pista nunca frena el fotograma. Al cambiar de pista hace un fundido cruzado y
+#   las pistas ya abiertas se reutilizan sin volver a cargarlas.
+# - SoundEffects: cada efecto se decodifica una sola vez a memoria y se reproduce con un grupo fijo de
+#   voces. Si no queda una voz libre se "roba" la más antigua, en lugar de cortar o retrasar el sonido
+#   que ya estaba sonando (disparos rápidos del rifle, varios impactos de la escopeta).
+import os
+
+
+def configure_audio(buffer_seconds): # Llamar antes de crear la aplicación (Ursina) para que tenga efecto.
+    from panda3d.core import loadPrcFileData
+    loadPrcFileData('audio', f'audio-buffering-seconds {buffer_seconds}')
+
+
+class MusicPlayer:
+    def __init__(self, assets, volume=0.8, fade=1.0): # 'fade': segundos del fundido cruzado.
+        self.assets = assets
+        self.volume = volume
+        self.fade = fade
+        self.current = None # (ruta, sonido) de la pista que suena o entra.
+        self.requested = None # Ruta que se pidió y todavía se está abriendo en segundo plano.
+        self.fading_out = [] # (ruta, sonido) de las pistas que se están apagando.
+        self.paused_time = None
+
+    def play(self, path): # Pide cambiar a la pista 'path' (no bloquea: empieza cuando esté abierta).
+        if self.current and self.current[0] == path:
+            return # Ya suena: sigue sin cortes.
+        if not os.path.exists(path):
+            self.stop()
+            return
+        self.requested = path
+        self.assets.preload('music', path)
+        self._start_requested()
+
+    def _start_requested(self):
+        sound = self.assets.try_acquire('music', self.requested)
+        if sound is None:
+            error = self.assets.error('music', self.requested)
+            if error is not None: # No se pudo abrir: se deja de reintentar en cada fotograma.
+                print('no se pudo abrir la música', self.requested, error)
+                self.requested = None
+            return # Sigue abriéndose; se vuelve a intentar en update().
+        for track in self.fading_out: # La misma pista se estaba apagando (reintento): la caché devuelve el mismo sonido.
+            if track[0] == self.requested:
+                self.fading_out.remove(track) # Si no, update() lo apagaría y lo liberaría mientras suena.
+                self.assets.release('music', track[0]) # Ya se tiene con el try_acquire de arriba.
+                break
+        self._fade_out_current()
+        sound.setLoop(True)
+        sound.setVolume(0.0)
+        sound.setTime(0.0)
+        sound.play()
+        self.current = (self.requested, sound)
+        self.requested = None
+        self.paused_time = None
+
+    def _fade_out_current(self):
+        if self.current:
+            self.fading_out.append(self.current)
+            self.current = None
+
+    def stop(self): # Apaga la música con un fundido.
+        self.requested = None
+        self.paused_time = None
+        self._fade_out_current()
+
+    def pause(self): # Panda3D no tiene pausa: se guarda la posición y se detiene.
+        for path, sound in self.fading_out: # Las pistas que se estaban apagando terminan ya.
+            sound.stop()
+            self.assets.release('music', path)
+        self.fading_out.clear()
+        if self.current:
+            self.paused_time = self.current[1].getTime()
+            self.current[1].stop()
+
+    def resume(self):
+        if self.current and self.paused_time is not None:
+            self.current[1].setTime(self.paused_time)
+            self.current[1].play()
+            self.paused_time = None
+
+    def update(self, dt): # Llamar cada fotograma: avanza los fundidos y arranca la pista pedida cuando esté lista.
+        if self.requested:
+            self._start_requested()
+        step = dt / self.fade if self.fade > 0 else 1.0
+        if self.current and self.paused_time is None:
+            sound = self.current[1]
+            if sound.getVolume() < self.volume:
+                sound.setVolume(min(self.volume, sound.getVolume() + step * self.volume))
+        for track in list(self.fading_out):
+            path, sound = track
+            volume = sound.getVolume() - step * self.volume
+            if volume > 0:
+                sound.setVolume(volume)
+                continue
+            sound.stop()
+            self.fading_out.remove(track)
+            self.assets.release('music', path) # Queda en la caché para la próxima vez que se use.
+
+
+class SoundEffects:
+    def __init__(self, max_voices=16): # Máximo de sonidos sonando a la vez entre todos los efectos.
+        self.max_voices = max_voices
+        self.clips = {} # nombre -> {'voices': [...], 'volume', 'priority'}
+        self.started = {} # voz -> número de orden en que empezó a sonar (para robar la más antigua)
+        self._order = 0
+
+    def load(self, name, path, voices=4, volume=1.0, priority=0):
+        # Crea 'voices' voces del mismo sonido. Panda3D decodifica el archivo la primera vez y las demás
+        # comparten los mismos datos en memoria.
+        from panda3d.core import AudioManager, Filename
+        from ursina import application
+
+        clip = self.clips[name] = {'voices': [], 'volume': volume, 'priority': priority}
+        if not os.path.exists(path):
+            print('sonido no encontrado:', path)
+            return
+        manager = application.base.sfxManagerList[0]
+        filename = Filename.fromOsSpecific(os.path.abspath(path))
+        for _ in range(voices):
+            clip['voices'].append(manager.getSound(filename, False, AudioManager.SM_sample))
+
+    @staticmethod
+    def _playing(voice):
+        from panda3d.core import AudioSound
+        return voice.status() == AudioSound.PLAYING
+
+    def play(self, name): # Reproduce un efecto; devuelve la voz usada o None si no se pudo.
+        clip = self.clips.get(name)
+        if not clip or not clip['voices']:
+            return None
+        voices = clip['voices']
+        voice = next((voice for voice in voices if not self._playing(voice)), None)
+        if voice is None: # Todas sus voces suenan: roba la más antigua del mismo efecto.
+            voice = min(voices, key=lambda voice: self.started.get(voice, 0))
+            voice.stop()
+        elif self.playing_count() >= self.max_voices:
+            # Límite global: roba la voz más antigua de un efecto con prioridad igual o menor, o descarta este.
+            candidates = [(self.started.get(other, 0), other) for other_clip in self.clips.values()
+                          if other_clip['priority'] <= clip['priority']
+                          for other in other_clip['voices'] if self._playing(other)]
+            if not candidates:
+                return None
+            min(candidates, key=lambda item: item[0])[1].stop()
+        self._order += 1
+        self.started[voice] = self._order
+        voice.setVolume(clip['volume'])
+        voice.play()
+        return voice
+
+    def playing_count(self):
+        return sum(1 for clip in self.clips.values() for voice in clip['voices'] if self._playing(voice))
+
+    def stop_all(self):
+        for clip in self.clips.values():
+            for voice in clip['voices']:
+                voice.stop()
@@ -0,0 +1,287 @@
+# --- Pruebas de Rendimiento sin Pantalla ---
+# Mide los caminos calientes del juego en una máquina sin pantalla: carga TiroAlBlanco.py con una ventana
+# fuera de pantalla (offscreen) y sin audio, sin entrar al bucle principal, y cronometra sus funciones reales.
+# - Aparición y retirada de objetivos (motor solo y con las entidades TargetSphere del pool).
+# - Costo de un fotograma (update() y dibujado) con 1, 10, 100 y 1000 objetivos vivos.
+# - Resolución de disparos (hitscan) con 10, 100 y 1000 objetivos.
+# - Actualización del HUD, el disparo desde input() y el ciclo completo de inicio y fin de nivel.
+# Cada medición es el mejor de varios intentos (el menos afectado por el resto de la máquina) y, para
+# los fotogramas, la mediana de cada uno; siempre en microsegundos por operación. Los resultados se guardan en JSON y se comparan contra una línea base.
+# El JSON anota la máquina donde se midió (machine_info): solo tiene sentido comparar contra una línea base
+# grabada en la misma máquina, y hay que volver a grabarla cuando un cambio mejora los tiempos a propósito.
+# Con --runs cada pasada corre en un proceso nuevo (el ruido cambia sobre todo de un proceso a otro) y la línea
+# base guarda cuánto varió cada medición entre ellas ('spread'); ese ruido se suma al umbral de la comparación,
+# y una regresión solo cuenta si una segunda pasada, también en un proceso nuevo, la confirma.
+#
+# Uso: python bench.py                                             mide y muestra los resultados
+#      python bench.py --runs 5 --save benchmarks/baseline.json    guarda los resultados como línea base
+#      python bench.py --compare benchmarks/baseline.json [--threshold 0.25]
+#          falla (código de salida 1) si alguna medición es más de un 25 % (más su ruido) más lenta que la
+#          línea base en dos pasadas seguidas
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_LEVEL = 99 # Nivel extra solo para las mediciones: sin límite de objetivos y con objetivos quietos.
+TARGET_COUNTS = (1, 10, 100, 1000)
+DEFAULT_THRESHOLD = 0.25
+FORMAT_VERSION = 1
+
+
+def measure(func, number, repeat=5): # Mejor tiempo por llamada (segundos) de 'repeat' tandas de 'number' llamadas.
+    func() # Calentamiento: la primera llamada puede compilar sombreadores o llenar cachés.
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - started) / number)
+    return best
+
+
+def measure_frames(func, frames, repeat=5, warmup=10):
+    # Como measure(), pero cada tanda da la mediana de sus fotogramas (el dibujado por software tiene picos
+    # aislados muy largos) y se queda con la mejor tanda. Antes, unos fotogramas de calentamiento: los
+    # primeros tras cambiar la cantidad de objetivos preparan sus entidades y su geometría.
+    for _ in range(warmup):
+        func()
+    best = float('inf')
+    for _ in range(repeat):
+        durations = []
+        for _ in range(frames):
+            started = time.perf_counter()
+            func()
+            durations.append(time.perf_counter() - started)
+        best = min(best, statistics.median(durations))
+    return best
+
+
+def load_game(size=None): # Ejecuta TiroAlBlanco.py sin ventana ni audio y devuelve sus variables globales, ya arrancado.
+    import runpy
+    from panda3d.core import loadPrcFileData
+
+    loadPrcFileData('bench', 'window-type offscreen\naudio-library-name null\nsync-video false')
+    os.environ['RECORD'] = '0' # Sin grabar la sesión.
+    os.environ['SAVE'] = '0' # Sin tocar el progreso guardado del jugador.
+    import ursina
+
+    create_app = ursina.Ursina # Ursina es un singleton: se envuelve la función que lo crea.
+
+    def offscreen_app(**kwargs):
+        kwargs.pop('fullscreen', None)
+        if size is not None: # Resolución fija del búfer (sin monitor, Ursina elige una por su cuenta).
+            kwargs['size'] = size
+        app = create_app(**dict(kwargs, window_type='offscreen'))
+        type(app).run = lambda self: None # app.run() vuelve enseguida: las mediciones manejan los fotogramas.
+        return app
+    ursina.Ursina = offscreen_app
+    # Un búfer fuera de pantalla no tiene cursor que bloquear.
+    type(ursina.mouse).locked = property(lambda self: False, lambda self, value: None)
+    module = runpy.run_path(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'TiroAlBlanco.py'))
+    game = module['update'].__globals__ # Las variables globales reales del juego (run_path devuelve una copia).
+    game['boot'].finish()
+    game['LEVEL_CONFIG'][BENCH_LEVEL] = {'targets': 10 ** 9, 'speed': (0, 0), 'scale': 2.0, 'accuracy_goal': 0,
+                                         'pool_size': max(TARGET_COUNTS), 'concurrent': 0, 'weapon': 'rifle'}
+    return game
+
+
+def fill_targets(game, count): # Deja exactamente 'count' objetivos vivos (con sus entidades) en el nivel de pruebas.
+    engine = game['engine']
+    while len(engine.swarm) > count:
+        target = engine.swarm.targets[-1]
+        engine.swarm.remove(target)
+        engine.emit('leave', target)
+    while len(engine.swarm) < count:
+        engine._spawn((0, 0))
+
+
+def run_benchmarks(game, quick=False):
+    from ursina import time as ursina_time
+    from config import BROAD_PHASE_MIN_TARGETS, WEAPONS
+    from engine import aim_at
+    from hitscan import WORLD_UP, resolve_shot
+
+    engine = game['engine']
+    scale = 0.2 if quick else 1.0
+    n = lambda number: max(1, int(number * scale))
+    results = {}
+
+    def record(name, seconds, number):
+        results[name] = {'us': seconds * 1e6, 'per_second': 1 / seconds if seconds else float('inf'), 'number': number}
+        print(f'{name:<28} {seconds * 1e6:12.2f} us   ({1 / seconds:12.0f} /s)')
+
+    ursina_time.dt = 1 / 60
+    game['go_to_level_select']()
+    game['start_level'](BENCH_LEVEL)
+
+    # Aparición y retirada: primero solo el motor, después con las entidades (pool de TargetSphere).
+    listeners = engine.listeners
+    engine.listeners = []
+
+    def spawn_remove():
+        engine._spawn((0, 0))
+        target = engine.swarm.targets[-1]
+        engine.swarm.remove(target)
+        engine.emit('leave', target)
+    record('engine_spawn_remove', measure(spawn_remove, n(20000)), n(20000))
+    engine.listeners = listeners
+    record('target_spawn_destroy', measure(spawn_remove, n(5000)), n(5000))
+
+    # Fotogramas con distinta cantidad de objetivos vivos (antes, unos fotogramas para preparar la escena en la GPU).
+    for _ in range(30):
+        game['app'].step()
+    for count in TARGET_COUNTS:
+        fill_targets(game, count)
+        frames = n(max(50, 4000 // count))
+        record(f'frame_update_{count}', measure_frames(game['update'], frames), frames)
+        frames = n(60)
+        record(f'frame_render_{count}', measure_frames(game['app'].step, frames), frames)
+
+    # Resolución de disparos contra los objetivos vivos (sin quitarlos, para repetir el mismo disparo).
+    for count in TARGET_COUNTS[1:]:
+        fill_targets(game, count)
+        for weapon in ('rifle', 'shotgun'):
+            size = len(engine.swarm)
+            centers, sizes = engine.swarm.positions[:size], engine.swarm.sizes[:size]
+            origin, direction = aim_at(tuple(centers[0]))
+
+            def shot():
+                grid = engine.grid.build(centers, sizes) if BROAD_PHASE_MIN_TARGETS is not None and size >= BROAD_PHASE_MIN_TARGETS else None
+                resolve_shot(engine.swarm.targets, centers, sizes, origin, direction, WEAPONS[weapon], engine.time,
+                             engine.shot_rng, WORLD_UP, grid)
+            record(f'hit_resolution_{weapon}_{count}', measure(shot, n(2000)), n(2000))
+    fill_targets(game, 0)
+
+    # HUD: cada llamada cambia un valor, como un disparo real, y se redibuja como en un fotograma.
+    def hud_update():
+        engine.shots_fired += 1
+        game['update_hud']()
+        game['hud'].flush()
+    record('hud_update', measure(hud_update, n(5000)), n(5000))
+
+    # Disparo desde input(): lee la cámara, aplica la cadencia y resuelve el rayo.
+    def input_fire():
+        engine.last_shot_time = -float('inf') # Sin esperar la cadencia del arma.
+        game['input']('left mouse down')
+    fill_targets(game, 10)
+    record('input_fire', measure(input_fire, n(5000)), n(5000))
+    fill_targets(game, 0)
+
+    # Ciclo completo: iniciar el nivel 1 (interfaz, arma, música, pools) y terminarlo con el panel de resultados.
+    def level_transition():
+        game['start_level'](1)
+        engine.end_level()
+        game['results_panel'].hide()
+    record('level_start_end', measure(level_transition, n(200), repeat=3), n(200))
+    return results
+
+
+def merge_runs(runs): # La mejor de varias pasadas completas de cada medición, con cuánto varió entre ellas ('spread').
+    merged = {}
+    for name in runs[0]:
+        times = [run[name]['us'] for run in runs]
+        best = min((run[name] for run in runs), key=lambda result: result['us'])
+        merged[name] = dict(best, spread=max(times) / min(times) - 1 if min(times) else 0.0)
+    return merged
+
+
+def run_in_process(quick=False): # Una pasada completa en un proceso nuevo; devuelve su informe.
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'pass.json')
+        subprocess.run([sys.executable, os.path.abspath(__file__), '--save', path] + (['--quick'] if quick else []),
+                       check=True, stdout=subprocess.DEVNULL)
+        with open(path, encoding='utf-8') as file:
+            return json.load(file)
+
+
+def compare(results, baseline, threshold):
+    # Devuelve las mediciones que empeoraron más que 'threshold' (0.25 = 25 %) más el ruido que tuvo cada una
+    # al grabar la línea base ('spread': lo que varió entre pasadas en la misma máquina).
+    regressions = []
+    print(f"\n{'medición':<28} {'base (us)':>12} {'ahora (us)':>12} {'cambio':>9} {'margen':>8}")
+    for name, base in baseline['results'].items():
+        if name not in results:
+            continue
+        ratio = results[name]['us'] / base['us'] if base['us'] else 1.0
+        margin = threshold + base.get('spread', 0.0)
+        flag = ''
+        if ratio > 1 + margin:
+            regressions.append((name, ratio))
+            flag = '  <-- REGRESIÓN'
+        print(f"{name:<28} {base['us']:12.2f} {results[name]['us']:12.2f} {(ratio - 1) * 100:+8.1f}% {margin * 100:7.0f}%{flag}")
+    return regressions
+
+
+def machine_info(): # Dónde se midió: los tiempos de dibujado dependen sobre todo del controlador gráfico.
+    from panda3d.core import PandaSystem
+    from ursina import application
+
+    gsg = application.base.win.getGsg() if application.base.win else None
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'cpus': os.cpu_count(),
+        'panda3d': PandaSystem.getVersionString(),
+        'renderer': f'{gsg.getDriverVendor()} {gsg.getDriverRenderer()}' if gsg else None, # p. ej. llvmpipe (por software).
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Pruebas de rendimiento sin pantalla de TiroAlBlanco.')
+    parser.add_argument('--save', help='guarda los resultados en este JSON (por ejemplo, como línea base)')
+    parser.add_argument('--compare', help='JSON de línea base contra el que comparar')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help='empeoramiento tolerado (0.25 = 25 %%)')
+    parser.add_argument('--quick', action='store_true', help='menos repeticiones (más rápido, menos preciso)')
+    parser.add_argument('--runs', type=int, default=1, help='pasadas completas; se guarda la mejor de cada medición y su dispersión')
+    args = parser.parse_args(argv)
+
+    os.chdir(os.path.dirname(os.path.abspath(__file__))) # Las rutas de los recursos son relativas al juego.
+    if args.runs > 1 or args.compare: # Cada pasada en su proceso, para que el ruido entre procesos cuente.
+        passes = []
+        for number in range(args.runs):
+            print(f'pasada {number + 1} de {args.runs}...', flush=True)
+            passes.append(run_in_process(args.quick))
+        machine = passes[0]['machine']
+        results = merge_runs([report['results'] for report in passes])
+        for name, result in results.items() if len(passes) > 1 else ():
+            print(f"{name:<28} {result['us']:12.2f} us   (ruido {result['spread'] * 100:4.0f} %)")
+    else:
+        game = load_game()
+        machine = machine_info()
+        results = merge_runs([run_benchmarks(game, quick=args.quick)])
+    report = {
+        'version': FORMAT_VERSION,
+        'created': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'machine': machine,
+        'results': results,
+    }
+    if args.save:
+        os.makedirs(os.path.dirname(args.save) or '.', exist_ok=True)
+        with open(args.save, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=1)
+        print('resultados guardados en', args.save)
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions: # Solo falla si una segunda pasada lo confirma: el ruido de la máquina rara vez se repite igual.
+            print(f'\n{len(regressions)} mediciones por encima del umbral; se repiten las mediciones para confirmarlo...')
+            results = merge_runs([results, run_in_process(args.quick)['results']])
+            regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f'\n{len(regressions)} mediciones empeoraron más de su margen en dos pasadas:',
+                  ', '.join(f'{name} (x{ratio:.2f})' for name, ratio in regressions))
+            return 1
+        print(f'\nsin regresiones (umbral {args.threshold * 100:.0f} % más el ruido de cada medición)')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,149 @@
+# --- Objetivos Dibujados por Instancias ---
+# Con una entidad TargetSphere por objetivo, cada ovni es su propio nodo: una llamada de dibujado, su
+# transformación de billboard calculada en la CPU y otra pasada en el mapa de sombras. BillboardBatch
+# dibuja todos los objetivos vivos en una sola llamada con instancias por hardware:
+# - Una sola malla (un quad) con la textura compartida y un sombreador que la repite 'count' veces.
+# - Los datos de cada instancia (posición, escala y tinte) van empaquetados en un búfer de floats (una
+#   textura de tipo búfer) que sync() rellena de una vez desde los arreglos de NumPy del enjambre (swarm.py).
+# - El sombreador orienta cada quad hacia la cámara (billboard), así que mover o agregar objetivos no crea
+#   nodos ni transforma nada en Python; el costo casi no cambia entre 1 y 1000 objetivos.
+# - cast_shadows=False deja los objetivos fuera de la cámara de sombras del sol.
+# draw() dibuja cualquier conjunto de billboards desde arreglos (también lo usan las partículas, particles.py).
+import numpy as np
+
+SHADOW_CAMERA_MASK = 0b0001 # Máscara de la cámara de sombras de DirectionalLight en Ursina (entity.hide(0b0001)).
+TEXELS_PER_INSTANCE = 2 # (x, y, z, escala) y (r, g, b, a) de cada instancia.
+
+VERTEX_SHADER = '''#version 140
+uniform mat4 p3d_ModelViewMatrix;
+uniform mat4 p3d_ProjectionMatrix;
+uniform samplerBuffer instances;
+in vec4 p3d_Vertex;
+in vec2 p3d_MultiTexCoord0;
+out vec2 uv;
+out vec4 tint;
+
+void main() {
+    vec4 center = texelFetch(instances, gl_InstanceID * 2);
+    tint = texelFetch(instances, gl_InstanceID * 2 + 1);
+    // Billboard: el centro pasa al espacio de la cámara y las esquinas se abren en su plano.
+    vec4 view = p3d_ModelViewMatrix * vec4(center.xyz, 1.0);
+    view.xy += p3d_Vertex.xy * center.w;
+    gl_Position = p3d_ProjectionMatrix * view;
+    uv = p3d_MultiTexCoord0;
+}
+'''
+
+FRAGMENT_SHADER = '''#version 140
+uniform sampler2D p3d_Texture0;
+in vec2 uv;
+in vec4 tint;
+out vec4 p3d_FragColor;
+
+void main() {
+    vec4 color = texture(p3d_Texture0, uv) * tint;
+    if (color.a < 0.01) {
+        discard; // Las zonas transparentes no escriben profundidad (no tapan a los objetivos de atrás).
+    }
+    p3d_FragColor = color;
+}
+'''
+
+
+def supported(gsg): # La GPU (o el dibujado por software) puede repetir instancias y leer texturas de búfer.
+    return gsg.getSupportsGeometryInstancing() and gsg.getSupportsBufferTexture() and gsg.getSupportsGlsl()
+
+
+class BillboardBatch:
+    def __init__(self, texture, parent, capacity=64, cast_shadows=False, depth_write=True): # 'texture' es la textura de Ursina compartida.
+        from panda3d.core import (Geom, GeomNode, GeomTriangles, GeomVertexData, GeomVertexFormat, GeomVertexWriter,
+                                  OmniBoundingVolume, Shader, TransparencyAttrib)
+
+        self.count = 0
+        self.tints = {} # objetivo -> (r, g, b, a) de los que no se dibujan en blanco.
+        # Un quad de lado 1 centrado en el origen; el sombreador lo escala y lo ubica en cada instancia.
+        vertex_data = GeomVertexData('billboard', GeomVertexFormat.getV3t2(), Geom.UHStatic)
+        vertex_data.setNumRows(4)
+        vertex = GeomVertexWriter(vertex_data, 'vertex')
+        texcoord = GeomVertexWriter(vertex_data, 'texcoord')
+        for x, y in ((-.5, -.5), (.5, -.5), (.5, .5), (-.5, .5)):
+            vertex.addData3(x, y, 0)
+            texcoord.addData2(x + .5, y + .5)
+        triangles = GeomTriangles(Geom.UHStatic)
+        triangles.addVertices(0, 1, 2)
+        triangles.addVertices(0, 2, 3)
+        geom = Geom(vertex_data)
+        geom.addPrimitive(triangles)
+        node = GeomNode('billboard_batch')
+        node.addGeom(geom)
+        # Las instancias están en cualquier parte de la escena: el nodo no se descarta por estar fuera de cámara.
+        node.setBounds(OmniBoundingVolume())
+        node.setFinal(True)
+
+        self.node_path = parent.attachNewNode(node)
+        self.node_path.setShader(Shader.make(Shader.SL_GLSL, VERTEX_SHADER, FRAGMENT_SHADER))
+        self.node_path.setTexture(texture._texture)
+        self.node_path.setTransparency(TransparencyAttrib.M_alpha)
+        self.node_path.setLightOff()
+        self.node_path.setDepthWrite(depth_write) # Sin escribir profundidad, los que se desvanecen no tapan a los de atrás.
+        if not cast_shadows:
+            self.node_path.hide(SHADOW_CAMERA_MASK)
+        self._allocate(capacity)
+        self.node_path.stash() # Sin instancias no se dibuja (una cantidad de 0 desactivaría las instancias, no el nodo).
+
+    def _allocate(self, capacity): # Crea el búfer de instancias (también al crecer: se duplica como el enjambre).
+        from panda3d.core import GeomEnums, Texture
+
+        self.capacity = capacity
+        self.buffer = Texture('billboard_instances')
+        self.buffer.setupBufferTexture(capacity * TEXELS_PER_INSTANCE, Texture.T_float, Texture.F_rgba32, GeomEnums.UH_dynamic)
+        self.data = np.zeros((capacity, TEXELS_PER_INSTANCE * 4), dtype=np.float32)
+        self.node_path.setShaderInput('instances', self.buffer)
+
+    def tint(self, target, color): # Tiñe un objetivo vivo (None vuelve al blanco).
+        if color is None:
+            self.tints.pop(target, None)
+        else:
+            self.tints[target] = tuple(color)
+
+    def sync(self, swarm, alpha=1.0): # Dibuja a los objetivos vivos del enjambre. Llamar una vez por fotograma.
+        count = len(swarm)
+        colors = None
+        if self.tints:
+            colors = np.ones((count, 4), dtype=np.float32)
+            for target, color in list(self.tints.items()):
+                row = swarm.index.get(target)
+                if row is None:
+                    del self.tints[target] # El objetivo ya no está vivo.
+                else:
+                    colors[row] = color
+        # Posiciones entre los dos últimos ticks de la simulación (timestep.py).
+        self.draw(swarm.interpolated(alpha), swarm.sizes[:count], colors)
+
+    def draw(self, positions, sizes, colors=None): # Copia las instancias al búfer en una sola operación ('colors' None: blanco).
+        count = len(positions)
+        if count > self.capacity:
+            capacity = self.capacity
+            while capacity < count:
+                capacity *= 2
+            self._allocate(capacity)
+        data = self.data
+        data[:count, 0:3] = positions
+        data[:count, 3] = sizes
+        data[:count, 4:] = 1 if colors is None else colors
+        if count:
+            memoryview(self.buffer.modifyRamImage())[:count * data.itemsize * data.shape[1]] = data[:count].tobytes()
+        self._show(count)
+
+    def clear(self): # Deja de dibujar los objetivos (p. ej. al terminar el nivel).
+        self.tints.clear()
+        self._show(0)
+
+    def _show(self, count):
+        if count and not self.count:
+            self.node_path.unstash()
+        elif not count and self.count:
+            self.node_path.stash()
+        if count:
+            self.node_path.setInstanceCount(count)
+        self.count = count
@@ -0,0 +1,103 @@
+# --- Arranque por Etapas ---
+# El juego ya no construye todo antes del primer fotograma: la ventana, el logo y los botones del menú
+# principal se crean primero y el resto (sonidos, escenario, luces, armas, HUD y menús) se arma en
+# etapas durante los fotogramas siguientes, mientras las texturas se decodifican en el hilo del
+# administrador de recursos. Si el jugador pide algo que todavía no está listo, finish() termina las
+# etapas pendientes en ese momento.
+#
+# Mide dos tiempos desde que arrancó el proceso:
+# - primer fotograma: el menú principal ya se dibujó en pantalla.
+# - interactivo: todas las etapas terminaron; entrar a un nivel ya no espera a nada.
+# BOOT_BENCHMARK=1 muestra el detalle por etapa, lo guarda en profiles/ y cierra el juego al terminar.
+import json
+import os
+import time
+
+STARTED = time.perf_counter() # Se importa antes que Ursina: es lo más cerca posible del inicio del proceso.
+
+
+class BootSequence:
+    def __init__(self, budget=1 / 120, started=STARTED): # 'budget': segundos de construcción por fotograma.
+        self.budget = budget
+        self.started = started
+        self.stages = [] # (nombre, función) pendientes, en orden.
+        self.total = 0
+        self.timings = [] # (nombre, segundos) de las etapas ya construidas.
+        self.frames = 0
+        self.first_frame = None # Segundos hasta el primer fotograma dibujado.
+        self.interactive = None # Segundos hasta terminar todas las etapas.
+        self.listeners = [] # Se llaman con el reporte al terminar.
+
+    def stage(self, name): # Decorador: agrega la función como la siguiente etapa.
+        def decorator(func):
+            self.stages.append((name, func))
+            self.total += 1
+            return func
+        return decorator
+
+    def on_done(self, listener):
+        self.listeners.append(listener)
+
+    @property
+    def done(self):
+        return not self.stages and self.interactive is not None
+
+    @property
+    def progress(self): # De 0 a 1, según las etapas construidas.
+        return len(self.timings) / self.total if self.total else 1.0
+
+    @property
+    def current(self): # Nombre de la próxima etapa (para mostrarlo junto a la barra de progreso).
+        return self.stages[0][0] if self.stages else ''
+
+    def step(self): # Llamar una vez por fotograma: construye etapas hasta agotar el presupuesto del fotograma.
+        self.frames += 1
+        if self.frames == 1:
+            return # El primer fotograma solo dibuja el menú principal.
+        if self.first_frame is None:
+            self.first_frame = time.perf_counter() - self.started
+        deadline = time.perf_counter() + self.budget
+        while self.stages:
+            self._run_next()
+            if time.perf_counter() >= deadline:
+                break
+        self._check_done()
+
+    def finish(self): # Construye ya todo lo que falta (p. ej. si el jugador entra al menú de niveles antes de tiempo).
+        while self.stages:
+            self._run_next()
+        self._check_done()
+
+    def _run_next(self):
+        name, func = self.stages.pop(0)
+        started = time.perf_counter()
+        func()
+        self.timings.append((name, time.perf_counter() - started))
+
+    def _check_done(self):
+        if self.stages or self.interactive is not None:
+            return
+        self.interactive = time.perf_counter() - self.started
+        report = self.report()
+        for listener in self.listeners:
+            listener(report)
+
+    def report(self):
+        return {
+            'first_frame_s': self.first_frame,
+            'interactive_s': self.interactive,
+            'frames': self.frames,
+            'stages': {name: seconds for name, seconds in self.timings},
+        }
+
+    def summary(self): # Una línea para la consola.
+        first_frame = f'{self.first_frame:.2f} s' if self.first_frame is not None else '-'
+        return f'arranque: primer fotograma {first_frame}, interactivo {self.interactive:.2f} s ({self.frames} fotogramas)'
+
+
+def save_benchmark(report, folder='profiles'): # Guarda el reporte del arranque en JSON. Devuelve la ruta.
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, time.strftime('boot_%Y%m%d_%H%M%S.json'))
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(report, file, indent=1)
+    return path
@@ -0,0 +1,178 @@
+# --- Calibración de la Dificultad ---
+# Los valores de LEVEL_CONFIG se ajustaron a mano. Esta herramienta juega decenas de miles de partidas
+# simuladas de cada nivel, sin ventana y en todos los núcleos (un proceso por núcleo), con un tirador
+# sintético de parámetros conocidos, y resume cuántas se superan y cómo se distribuye la precisión.
+# - Las reglas son las del juego: cada partida es engine.run_level() con el mismo motor, las mismas armas
+#   (cadencia de WEAPONS: pistola 0.5 s, rifle 0.2 s, escopeta 0.8 s) y el mismo tick de SIM_TICK_RATE.
+# - El tirador (SyntheticShooter) tarda 'reaction' segundos en reaccionar a cada objetivo nuevo, apunta
+#   a donde estaba hace 'lag' segundos (sigue al objetivo con retraso) y se desvía 'aim_error' grados
+#   (desviación estándar, en cada eje). Dispara en cuanto el arma lo permite.
+# - Un barrido combina varios valores de velocidad, tamaño de los objetivos y tiradores: cada combinación
+#   es una configuración con sus propias partidas. Con la misma semilla inicial los resultados no dependen
+#   de cuántos procesos se usen.
+# Guarda el resumen en profiles/calibration_<fecha>.json, con la meta de precisión que dejaría pasar a
+# cada proporción de jugadores (p. ej. 'goal_for_pass_rate' 0.7: el 70 % de las partidas la alcanza).
+#
+# Uso: python calibrate.py                                              10000 partidas por nivel, tirador por defecto
+#      python calibrate.py --levels 3 --sessions 50000
+#      python calibrate.py --speed-scale 0.8 1 1.2 --target-size 2.8 4 --reaction 0.2 0.35 --aim-error 1 2
+import argparse
+import itertools
+import json
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from config import LEVEL_CONFIG, SIM_TICK_RATE, TARGET_SIZE
+from engine import GameEngine, aim_at, run_level
+
+DEFAULT_SESSIONS = 10000
+DEFAULT_SHOOTER = {'reaction': 0.25, 'lag': 0.05, 'aim_error': 1.5}
+PASS_RATES = (0.5, 0.7, 0.9) # Proporciones de partidas superadas para las que se sugiere una meta de precisión.
+CALIBRATION_FOLDER = 'profiles'
+
+
+class SyntheticShooter: # shooter(engine) para engine.run_level: devuelve el rayo del disparo o None.
+    def __init__(self, engine, reaction, lag, aim_error, seed=0):
+        self.engine = engine
+        self.reaction = reaction
+        self.lag = lag
+        self.aim_error = math.radians(aim_error)
+        self.rng = random.Random(seed) # Propio del tirador: no altera los números aleatorios del motor.
+        self.spawned = {} # objetivo -> momento (reloj del motor) en que apareció.
+        engine.on(self._on_event)
+
+    def _on_event(self, event, *args):
+        if event == 'spawn':
+            self.spawned[args[0]] = self.engine.time
+        elif event in ('hit', 'leave'):
+            self.spawned.pop(args[0], None)
+
+    def __call__(self, engine):
+        if not engine.can_fire():
+            return None
+        swarm = engine.swarm
+        for target in swarm.targets: # El más antiguo que ya vio.
+            if engine.time - self.spawned[target] >= self.reaction:
+                break
+        else:
+            return None
+        row = swarm.index[target]
+        # Apunta adonde estaba el objetivo hace 'lag' segundos, con un error angular en cada eje.
+        position = swarm.positions[row] - swarm.directions[row] * swarm.speeds[row] * self.lag
+        origin, direction = aim_at(tuple(position))
+        x, y, z = direction
+        distance = math.sqrt(x * x + y * y + z * z)
+        yaw = math.atan2(x, z) + self.rng.gauss(0, self.aim_error)
+        pitch = math.asin(y / distance) + self.rng.gauss(0, self.aim_error)
+        return origin, (math.sin(yaw) * math.cos(pitch), math.sin(pitch), math.cos(yaw) * math.cos(pitch))
+
+
+def simulate(level_config, level, shooter, seeds, dt): # Trabajo de un proceso: una tanda de partidas seguidas.
+    results = np.zeros((len(seeds), 4)) # precisión, superado, disparos, segundos de juego
+    for i, seed in enumerate(seeds):
+        engine = GameEngine(level_config, seed=seed)
+        player = SyntheticShooter(engine, seed=seed, **shooter)
+        result = run_level(engine, level, player, dt=dt)
+        results[i] = result['accuracy'], result['passed'], result['shots'], engine.time
+    return results
+
+
+def summarize(results, bins=10): # Tasa de aprobación y distribución de la precisión de un conjunto de partidas.
+    accuracy, passed, shots, duration = results.T
+    percentiles = (5, 25, 50, 75, 95)
+    histogram, _ = np.histogram(accuracy, bins=bins, range=(0, 100))
+    return {
+        'sessions': len(results),
+        'pass_rate': float(passed.mean()),
+        'accuracy_mean': float(accuracy.mean()),
+        'accuracy_std': float(accuracy.std()),
+        **{f'accuracy_p{p}': float(v) for p, v in zip(percentiles, np.percentile(accuracy, percentiles))},
+        'accuracy_histogram': histogram.tolist(), # Partidas por tramo de 100/bins puntos de precisión.
+        'shots_mean': float(shots.mean()),
+        'duration_mean_s': float(duration.mean()),
+        # Meta de precisión que alcanza exactamente esa proporción de partidas.
+        'goal_for_pass_rate': {str(rate): float(np.percentile(accuracy, (1 - rate) * 100)) for rate in PASS_RATES},
+    }
+
+
+def level_variant(level, speed_scale, target_size): # Copia de la configuración del nivel con el barrido aplicado.
+    config = dict(LEVEL_CONFIG[level])
+    low, high = config.get('speed', (10, 15))
+    config['speed'] = (low * speed_scale, high * speed_scale)
+    config['target_size'] = target_size
+    return config
+
+
+def calibrate(levels, sessions, shooters, speed_scales, target_sizes, workers=None, dt=1 / SIM_TICK_RATE, seed=0, chunk=250):
+    # Devuelve una lista de filas (parámetros + resumen), una por nivel y combinación del barrido.
+    combinations = list(itertools.product(levels, speed_scales, target_sizes, shooters))
+    rows = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Todas las tandas se encolan a la vez para que ningún núcleo quede sin trabajo entre combinaciones.
+        pending = []
+        for level, speed_scale, target_size, shooter in combinations:
+            level_config = {**LEVEL_CONFIG, level: level_variant(level, speed_scale, target_size)}
+            seeds = range(seed, seed + sessions)
+            futures = [pool.submit(simulate, level_config, level, shooter, seeds[start:start + chunk], dt)
+                       for start in range(0, sessions, chunk)]
+            pending.append(((level, speed_scale, target_size, shooter), futures))
+        for (level, speed_scale, target_size, shooter), futures in pending:
+            results = np.concatenate([future.result() for future in futures])
+            rows.append({'level': level, 'speed_scale': speed_scale, 'target_size': target_size,
+                         'speed': level_variant(level, speed_scale, target_size)['speed'],
+                         'accuracy_goal': LEVEL_CONFIG[level].get('accuracy_goal', 0),
+                         'shooter': shooter, **summarize(results)})
+            print_row(rows[-1])
+    return rows
+
+
+def print_row(row):
+    shooter = row['shooter']
+    print(f"nivel {row['level']}  vel x{row['speed_scale']:<4} tam {row['target_size']:<4} "
+          f"reacción {shooter['reaction']:.2f} s  error {shooter['aim_error']:.1f}°  | "
+          f"superadas {row['pass_rate'] * 100:5.1f}% (meta {row['accuracy_goal']}%)  "
+          f"precisión p25/p50/p75 {row['accuracy_p25']:5.1f}/{row['accuracy_p50']:5.1f}/{row['accuracy_p75']:5.1f}  "
+          f"meta para 70%: {row['goal_for_pass_rate']['0.7']:5.1f}%")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Calibración de la dificultad de TiroAlBlanco con partidas simuladas.')
+    parser.add_argument('--levels', type=int, nargs='+', default=sorted(LEVEL_CONFIG))
+    parser.add_argument('--sessions', type=int, default=DEFAULT_SESSIONS, help='partidas simuladas por combinación')
+    parser.add_argument('--speed-scale', type=float, nargs='+', default=[1.0], help='multiplicadores del rango de velocidad')
+    parser.add_argument('--target-size', type=float, nargs='+', default=[TARGET_SIZE], help='tamaños de los objetivos')
+    parser.add_argument('--reaction', type=float, nargs='+', default=[DEFAULT_SHOOTER['reaction']], help='segundos de reacción')
+    parser.add_argument('--lag', type=float, nargs='+', default=[DEFAULT_SHOOTER['lag']], help='retraso al seguir al objetivo (s)')
+    parser.add_argument('--aim-error', type=float, nargs='+', default=[DEFAULT_SHOOTER['aim_error']], help='error de puntería (grados)')
+    parser.add_argument('--workers', type=int, help='procesos (por defecto, uno por núcleo)')
+    parser.add_argument('--tick-rate', type=float, default=SIM_TICK_RATE, help='ticks por segundo del motor')
+    parser.add_argument('--seed', type=int, default=0, help='primera semilla (cada partida usa la siguiente)')
+    parser.add_argument('--out', help='JSON de salida (por defecto, profiles/calibration_<fecha>.json)')
+    args = parser.parse_args(argv)
+
+    shooters = [{'reaction': reaction, 'lag': lag, 'aim_error': aim_error}
+                for reaction, lag, aim_error in itertools.product(args.reaction, args.lag, args.aim_error)]
+    started = time.perf_counter()
+    rows = calibrate(args.levels, args.sessions, shooters, args.speed_scale, args.target_size,
+                     workers=args.workers, dt=1 / args.tick_rate, seed=args.seed)
+    elapsed = time.perf_counter() - started
+    total = sum(row['sessions'] for row in rows)
+    print(f'{total} partidas en {elapsed:.1f} s ({total / elapsed:.0f} por segundo, {args.workers or os.cpu_count()} procesos)')
+
+    path = args.out or os.path.join(CALIBRATION_FOLDER, time.strftime('calibration_%Y%m%d_%H%M%S.json'))
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump({'created': time.strftime('%Y-%m-%d %H:%M:%S'), 'tick_rate': args.tick_rate, 'seed': args.seed,
+                   'elapsed_s': elapsed, 'results': rows}, file, indent=1)
+    print('resultados guardados en', path)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
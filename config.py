@@ -0,0 +1,103 @@
+# --- Configuración del Juego ---
+# Datos de niveles y armas compartidos por el motor de simulación y la presentación con Ursina.
+
+# --- Configuración de Niveles ---
+# Diccionario que almacena la configuración específica para cada nivel del juego.
+LEVEL_CONFIG = {
+    1: {'targets': 10, 'speed': (10, 15), 'scale': 2.8, 'accuracy_goal': 50, 'pool_size': 2, 'concurrent': 1, 'weapon': 'pistol'}, # Configuración para el Nivel 1
+    2: {'targets': 12, 'speed': (15, 22), 'scale': 2.0, 'accuracy_goal': 60, 'pool_size': 3, 'concurrent': 1, 'weapon': 'rifle'}, # Configuración para el Nivel 2
+    3: {'targets': 15, 'speed': (20, 28), 'scale': 1.8, 'accuracy_goal': 75, 'pool_size': 3, 'concurrent': 1, 'weapon': 'shotgun'}, # Configuración para el Nivel 3
+    #'targets': número de objetivos a aparecer en este nivel.
+    #'speed': rango (mínimo, máximo) de velocidad para los objetivos.
+    #'scale': tamaño de los objetivos (el juego no lo usa: se dibujan y se resuelven con TARGET_SIZE).
+    #'target_size' (opcional): tamaño de los objetivos de este nivel en lugar de TARGET_SIZE (lo ajusta calibrate.py).
+    #'pool_size': objetivos y efectos de impacto que se construyen por adelantado (el pool crece si hacen falta más).
+    #'concurrent': objetivos que pueden estar en pantalla al mismo tiempo (niveles tipo enjambre usan valores altos).
+    #'weapon': arma que usa el jugador en este nivel (ver WEAPONS).
+    #'waves' (opcional): lista de oleadas {'at': segundo, 'count': objetivos, 'interval': segundos entre cada uno}.
+    #   Sin 'waves' todos los objetivos se liberan al empezar y aparecen a medida que hay lugar ('concurrent').
+    #'time_limit' (opcional): segundos tras los que el nivel termina aunque queden objetivos.
+}
+
+# Nivel de prueba de carga con oleadas densas (no aparece en el menú; lo usan las simulaciones sin ventana).
+STRESS_LEVEL_CONFIG = {
+    1: {'speed': (10, 28), 'scale': 2.0, 'accuracy_goal': 0, 'pool_size': 256, 'concurrent': 256, 'weapon': 'rifle', 'time_limit': 60,
+        'waves': [
+            {'at': 0, 'count': 64}, # Entran 64 de golpe.
+            {'at': 2, 'count': 192, 'interval': 0.02}, # Ráfaga hasta llenar el límite.
+            {'at': 8, 'count': 512, 'interval': 0.05}, # Reemplazos continuos durante el resto del nivel.
+        ]},
+}
+
+# --- Configuración de Armas ---
+WEAPONS = {
+    'pistol': {'fire_rate': 0.5, 'pellets': 1, 'spread': 0.0}, # Default para pistola
+    'rifle': {'fire_rate': 0.2, 'pellets': 1, 'spread': 0.0}, # Rifle
+    'shotgun': {'fire_rate': 0.8, 'pellets': 8, 'spread': 4.0}, # Más lento por el "poder", pero dispara varios perdigones
+    #'fire_rate': segundos mínimos entre un disparo y el siguiente.
+    #'pellets': perdigones por disparo.
+    #'spread': apertura del cono de perdigones en grados.
+}
+
+# --- Recursos de cada Nivel ---
+# Lo que el administrador de recursos (assets.py) precarga en segundo plano desde el menú de niveles.
+COMMON_ASSETS = {
+    'texture': ['assets/textures/ovni.png', 'assets/textures/hit_effect.png', 'assets/textures/mapa4.png'],
+    'font': ['assets/fonts/CenturyGothicBold.ttf', 'assets/fonts/keetano_katana.ttf'], # Fuentes del panel de resultados.
+}
+# Texturas que se empiezan a decodificar al abrir el juego, mientras se muestra el menú principal.
+BOOT_ASSETS = {
+    'texture': ['assets/textures/mapa4.png', 'assets/textures/cielo.jpg', 'assets/textures/ovni.png', 'assets/textures/hit_effect.png',
+                'assets/textures/button_level1.jpg', 'assets/textures/button_level2.jpg', 'assets/textures/button_level3.jpg',
+                'assets/textures/button_menu.jpg', 'assets/textures/button_reanudar.jpg', 'assets/textures/button_rententar.jpg'],
+}
+LEVEL_ASSETS = {
+    # Las texturas de las armas ya no se cargan sueltas: van dentro del atlas de cada arma (weapons.py).
+    1: {'music': ['assets/sounds/fondo.mp3']},
+    2: {'music': ['assets/sounds/fondoNivel2.mp3']},
+    3: {'music': ['assets/sounds/fondoNivel3.mp3']},
+}
+ASSET_BUDGET = 192 * 1024 * 1024 # Presupuesto de memoria (bytes) para los recursos en caché.
+
+# --- Audio ---
+MUSIC_VOLUME = 0.8
+MUSIC_FADE = 1.0 # Segundos del fundido cruzado entre pistas.
+MUSIC_BUFFER_SECONDS = 0.5 # Audio decodificado por adelantado al leer la música en streaming.
+SFX_MAX_VOICES = 16 # Efectos sonando a la vez como máximo.
+SOUND_EFFECTS = { # Se decodifican una sola vez; 'voices' son las copias que pueden sonar a la vez.
+    'pistol': {'path': 'assets/sounds/sonidoArma1.mp3', 'volume': 1.0, 'voices': 3, 'priority': 1},
+    'rifle': {'path': 'assets/sounds/sonidoRifle.mp3', 'volume': 0.5, 'voices': 4, 'priority': 1},
+    'shotgun': {'path': 'assets/sounds/sonidoEscopeta.mp3', 'volume': 3.0, 'voices': 2, 'priority': 1},
+    'hit': {'path': 'assets/sounds/hit.mp3', 'volume': 0.5, 'voices': 6, 'priority': 0},
+    #'priority': con todas las voces ocupadas, un efecto solo le roba la voz a otro de prioridad igual o menor.
+}
+
+# --- Tamaño Máximo de las Texturas ---
+# Lado mayor (en píxeles) con el que texture_cache.py guarda cada textura, según lo que ocupa en pantalla.
+TEXTURE_MAX_SIZE = {
+    'assets/textures/ovni.png': 256, # El ovni ocupa unos 100 px en pantalla.
+    'assets/textures/hit_effect.png': 256,
+    'assets/textures/button_*.jpg': 256, # Botones del menú.
+    'assets/textures/arma*.png': 512, # Piezas pequeñas de las armas.
+    'assets/textures/GUN_Material.003_BaseColor.jpg': 512,
+    'assets/textures/Gun_nivel3.jpg': 512,
+    'assets/textures/body.jpg': 256,
+    'assets/textures/prueba.jpg': 256,
+}
+DEFAULT_TEXTURE_MAX_SIZE = 1024 # Fondos, paredes y logos (pantalla completa).
+
+TARGET_SIZE = 4 # Tamaño con el que se dibujan los objetivos (el ovni).
+TARGET_INSTANCING = True # Todos los objetivos en una sola llamada de dibujado (billboards.py); False: una entidad por objetivo.
+TARGET_CAST_SHADOWS = False # Los objetivos no se dibujan en el mapa de sombras del sol.
+PARTICLE_CAPACITY = 1024 # Partículas de los impactos vivas a la vez como máximo (particles.py).
+HIT_SPARKS = 8 # Chispas que salen de cada impacto (0 deja solo el destello).
+SPAWN_DELAY = 0.5 # Segundos entre que un objetivo desaparece y aparece el siguiente.
+END_DELAY = 1 # Segundos entre el último objetivo y el final del nivel.
+HIT_POINTS = 100 # Puntos que suma cada acierto.
+PLAYER_START = (0, 1.8, -15) # Posición inicial del jugador con altura de ojos estándar.
+SIM_TICK_RATE = 120 # Ticks por segundo de la simulación (timestep.py), sin importar los FPS.
+SIM_MAX_TICKS = 8 # Ticks por fotograma como máximo; tras una traba más larga el juego se frena en lugar de saltar.
+# A partir de cuántos objetivos vivos se usa la rejilla de fase amplia al disparar (None: nunca). Medido con los
+# objetivos del juego (todos en una franja de profundidad frente al jugador), la prueba directa vectorizada fue más
+# rápida con cualquier cantidad (1000 objetivos: rifle 0.25 ms contra 2.4 ms, escopeta 0.47 ms contra 4.2 ms).
+BROAD_PHASE_MIN_TARGETS = None
@@ -0,0 +1,244 @@
+# --- Motor de Juego sin Ventana ---
+# Contiene todas las reglas del juego (progresión de niveles, movimiento de los objetivos,
+# cadencia de fuego, precisión y desbloqueo de niveles) sin depender de Ursina.
+# La ventana solo escucha los eventos que emite el motor y dibuja el resultado, así que
+# un nivel completo se puede simular más rápido que en tiempo real en una máquina sin pantalla.
+import random
+
+from config import LEVEL_CONFIG, WEAPONS, TARGET_SIZE, SPAWN_DELAY, END_DELAY, HIT_POINTS, PLAYER_START, BROAD_PHASE_MIN_TARGETS
+from hitscan import BroadPhaseGrid, WORLD_UP, resolve_shot
+from scheduler import Scheduler
+from swarm import TargetSwarm
+
+
+class SimTarget: # Objetivo del motor: solo datos, sin nada visual.
+    __slots__ = ('id', 'scale', 'speed', 'direction')
+
+    def __init__(self, id, scale, speed, direction):
+        self.id = id # Número único del objetivo dentro de la partida.
+        self.scale = scale # Tamaño del objetivo.
+        self.speed = speed # Velocidad del objetivo.
+        self.direction = direction # Dirección de movimiento (x, y, z).
+
+
+class GameEngine:
+    def __init__(self, level_config=LEVEL_CONFIG, seed=None): # 'seed' hace que la partida sea reproducible.
+        self.level_config = level_config
+        self.rng = random.Random(seed) # Generador propio para no depender del 'random' global.
+        self.shot_rng = random.Random(None if seed is None else f'{seed}:shots') # Reparto de perdigones, separado de las apariciones.
+        self.grid = BroadPhaseGrid() # Rejilla de fase amplia opcional (ver BROAD_PHASE_MIN_TARGETS).
+        self.swarm = TargetSwarm() # Objetivos vivos.
+        self.listeners = [] # Funciones que reciben los eventos del motor (la ventana, grabadores, etc.).
+        self.scheduler = Scheduler() # Línea de tiempo de apariciones, oleadas y fin de nivel (reemplaza a invoke()).
+        self.time = 0.0 # Reloj de simulación en segundos (solo avanza con step()).
+        self.unlocked_level = 1 # Nivel máximo desbloqueado por el jugador.
+        self.current_level = 1 # Nivel actual en el que se encuentra el jugador.
+        self.level_started = 0.0
+        self.active = False # Booleano para saber si el juego está en curso.
+        self.next_target_id = 0
+        self.reset_counters()
+
+    def reset_counters(self): # Reinicia los contadores para un nuevo nivel.
+        self.hits, self.points, self.shots_fired = 0, 0, 0
+        self.targets_spawned = 0 # Contador de objetivos que han aparecido.
+        self.released = 0 # Objetivos que sus oleadas ya liberaron y esperan un lugar libre para aparecer.
+        self.last_shot_time = self.time # Momento del último disparo para controlar la cadencia de fuego.
+
+    # --- Eventos ---
+    def on(self, listener): # Registra una función listener(evento, *datos).
+        self.listeners.append(listener)
+
+    def emit(self, event, *args):
+        for listener in self.listeners:
+            listener(event, *args)
+
+    # --- Temporizadores ---
+    def after(self, delay, func, *args, key=None): # Ejecuta func(*args) cuando el reloj de simulación avance 'delay' segundos.
+        return self.scheduler.after(delay, func, *args, key=key)
+
+    def cancel_timers(self): # Descarta todas las acciones pendientes (al salir a un menú o reiniciar).
+        self.scheduler.cancel_all()
+
+    # --- Configuración ---
+    @property
+    def config(self): # Configuración del nivel actual.
+        return self.level_config.get(self.current_level, {})
+
+    @property
+    def weapon(self): # Configuración del arma del nivel actual.
+        return WEAPONS.get(self.config.get('weapon'), WEAPONS['pistol'])
+
+    @property
+    def total_targets(self): # Objetivos del nivel: 'targets' o, si no está, la suma de sus oleadas.
+        config = self.config
+        return config.get('targets', sum(wave.get('count', 1) for wave in config.get('waves', ())))
+
+    @property
+    def accuracy(self): # Calcula la precisión, evitando división por cero.
+        return (self.hits / self.shots_fired) * 100 if self.shots_fired > 0 else 0
+
+    # --- Flujo del Nivel ---
+    def start_level(self, level):
+        self.current_level = level # Establece el nivel actual.
+        self.level_started = self.time # Para la duración del nivel en el resultado.
+        self.cancel_timers() # Evita que queden apariciones pendientes de una partida anterior.
+        self.swarm.clear() # Quita cualquier objetivo que pueda haber quedado.
+        self.reset_counters()
+        self.active = True # Establece el estado del juego a activo.
+        self.emit('level_start', level)
+        self._plan_level() # Programa las oleadas del nivel (la primera sale en este mismo momento).
+
+    def stop(self, menu=None): # Detiene la partida sin resultados (por ejemplo al ir al menú principal).
+        # 'menu' (session.MENU_LEVELS o MENU_MAIN) no cambia nada en el motor: solo queda en la grabación.
+        self.active = False
+        self.cancel_timers()
+        self.swarm.clear()
+
+    def _plan_level(self):
+        # Sin 'waves', todos los objetivos se liberan al empezar y van apareciendo a medida que hay lugar.
+        # Cada oleada libera 'count' objetivos en el segundo 'at', de a uno cada 'interval' segundos (ráfaga).
+        config = self.config
+        waves = config.get('waves') or [{'at': 0, 'count': self.total_targets}]
+        for wave in waves:
+            interval = wave.get('interval', 0)
+            if interval > 0:
+                for i in range(wave.get('count', 1)):
+                    self.after(wave.get('at', 0) + i * interval, self._release, 1)
+            else:
+                self.after(wave.get('at', 0), self._release, wave.get('count', 1))
+        if config.get('time_limit'): # Condición de fin por tiempo, aunque queden objetivos.
+            # Clave propia: con 'end' el fin tras el último objetivo reusaría este evento y esperaría al límite.
+            self.after(config['time_limit'], self.end_level, key='time_limit')
+        self.scheduler.tick(self.time) # Lo que empieza en el segundo 0 aparece ya, sin esperar al primer fotograma.
+
+    def _release(self, count): # Una oleada deja listos 'count' objetivos más.
+        self.released += count
+        self.spawn_next_target()
+
+    def spawn_next_target(self):
+        if not self.active: return # Si el juego no está activo, no genera objetivos.
+        config = self.config
+        total = self.total_targets
+        # Genera objetivos liberados hasta llenar el límite de objetivos simultáneos del nivel.
+        while self.released > 0 and self.targets_spawned < total and len(self.swarm) < config.get('concurrent', 1):
+            self.released -= 1
+            self._spawn(config.get('speed', (10, 15)))
+        if self.targets_spawned >= total and len(self.swarm) == 0:
+            self.after(END_DELAY, self.end_level, key='end') # Si no quedan objetivos ni hay alguno en pantalla, termina el nivel (una sola vez).
+
+    def _spawn(self, speed_range):
+        rng = self.rng
+        side = rng.choice([-1, 1]) # Elige aleatoriamente si el objetivo aparecerá desde la izquierda (-1) o derecha (1).
+        # X: extremo de la pantalla, Y: entre 2 y 8 sobre el suelo, Z: aleatorio para la profundidad.
+        position = (22 * side, rng.uniform(2, 8), rng.uniform(15, 25))
+        # X: hacia el centro (-side), Y: un poco hacia arriba o abajo, Z: un poco hacia adelante o atrás.
+        direction = (-side, rng.uniform(-.2, .2), rng.uniform(-.1, .1))
+        speed = rng.uniform(speed_range[0], speed_range[1]) # Velocidad aleatoria dentro del rango.
+        target = SimTarget(self.next_target_id, self.config.get('target_size', TARGET_SIZE), speed, direction)
+        self.next_target_id += 1
+        self.swarm.add(target, position, direction, speed, target.scale)
+        self.targets_spawned += 1 # Incrementa el contador de objetivos generados.
+        self.emit('spawn', target, position)
+
+    def end_level(self):
+        if not self.active: return
+        self.active = False # Establece el estado del juego a inactivo.
+        goal = self.config.get('accuracy_goal', 0)
+        accuracy = self.accuracy
+        passed = accuracy >= goal
+        if passed and self.current_level < len(self.level_config): # Si no es el último nivel, desbloquea el siguiente.
+            self.unlocked_level = max(self.unlocked_level, self.current_level + 1) # Asegura que se desbloquee el nivel más alto.
+        result = {
+            'level': self.current_level,
+            'accuracy': accuracy,
+            'goal': goal,
+            'passed': passed,
+            'hits': self.hits,
+            'shots': self.shots_fired,
+            'points': self.points,
+            'duration': self.time - self.level_started, # Segundos de simulación que duró el nivel.
+        }
+        self.emit('level_end', result)
+        return result
+
+    # --- Simulación ---
+    def step(self, dt): # Avanza la simulación 'dt' segundos.
+        self.time += dt
+        self.scheduler.tick(self.time) # Ejecuta las acciones pendientes que ya vencieron.
+        if not self.active:
+            return
+        # Mueve a todos los objetivos vivos y revisa cuáles salieron de la pantalla.
+        for target in self.swarm.step(dt):
+            self.swarm.remove(target)
+            self.emit('leave', target)
+            self.after(SPAWN_DELAY, self.spawn_next_target)
+
+    # --- Disparos ---
+    def can_fire(self): # Control de cadencia de fuego según el arma activa.
+        return self.active and (self.time - self.last_shot_time) > self.weapon['fire_rate']
+
+    def fire(self, origin=None, direction=None, up=WORLD_UP): # Dispara un rayo desde 'origin' hacia 'direction' (sin rayo no acierta).
+        if not self.can_fire():
+            return None
+        self.shots_fired += 1 # Incrementa el contador de disparos.
+        self.last_shot_time = self.time # Actualiza el tiempo del último disparo.
+        hits = []
+        if origin is not None and len(self.swarm):
+            count = len(self.swarm)
+            centers, sizes = self.swarm.positions[:count], self.swarm.sizes[:count]
+            grid = self.grid.build(centers, sizes) if BROAD_PHASE_MIN_TARGETS is not None and count >= BROAD_PHASE_MIN_TARGETS else None
+            hits = resolve_shot(self.swarm.targets, centers, sizes, origin, direction, self.weapon, self.time, self.shot_rng, up, grid)
+        self.emit('shot', origin, direction, hits)
+        if hits:
+            self.hits += 1 # Un disparo cuenta como un acierto aunque varios perdigones alcancen objetivos.
+        for hit in hits:
+            self.hit(hit)
+        return hits
+
+    def hit(self, hit): # Aplica un impacto (HitResult) a su objetivo.
+        self.swarm.remove(hit.target)
+        self.points += HIT_POINTS # Suma puntos al marcador por cada objetivo alcanzado.
+        self.emit('hit', hit.target, hit.point)
+        self.after(SPAWN_DELAY, self.spawn_next_target) # Genera el siguiente objetivo después de un pequeño retraso.
+
+
+# --- Simulación de Niveles sin Ventana ---
+def run_level(engine, level, shooter=None, dt=1 / 60, max_time=600):
+    # Juega un nivel completo lo más rápido posible. 'shooter(engine)' se llama en cada paso y
+    # devuelve el rayo (origen, dirección) del disparo, o None para no disparar.
+    results = []
+    listener = lambda event, *args: results.append(args[0]) if event == 'level_end' else None
+    engine.on(listener)
+    try:
+        engine.start_level(level)
+        deadline = engine.time + max_time
+        while not results and engine.time < deadline:
+            if shooter is not None and engine.active:
+                aim = shooter(engine)
+                if aim is not None:
+                    engine.fire(*aim)
+            engine.step(dt)
+    finally:
+        engine.listeners.remove(listener)
+    return results[0] if results else None
+
+
+def aim_at(position, origin=PLAYER_START): # Rayo desde 'origin' que pasa por el centro de 'position'.
+    return origin, tuple(p - o for p, o in zip(position, origin))
+
+
+def first_target_shooter(engine): # Tirador de referencia: dispara al primer objetivo vivo en cuanto el arma lo permite.
+    if engine.swarm.targets and engine.can_fire():
+        return aim_at(engine.swarm.positions[0])
+    return None
+
+
+if __name__ == '__main__':
+    # Ejemplo: python engine.py 1000  -> simula 1000 partidas de cada nivel y muestra cuántas se superaron.
+    import sys
+    import time
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    for level in LEVEL_CONFIG:
+        started = time.perf_counter()
+        passed = sum(run_level(GameEngine(seed=i), level, first_target_shooter)['passed'] for i in range(sessions))
+        print(f"Nivel {level}: {passed}/{sessions} superadas en {time.perf_counter() - started:.2f} s")
@@ -0,0 +1,154 @@
+# --- Resolución de Disparos ---
+# Calcula los impactos con matemáticas directas rayo-contra-billboard solo contra los objetivos vivos,
+# en lugar de depender de mouse.hovered_entity (que recorre los colisionadores de toda la escena:
+# paredes, techo y el suelo de 150x150). Así el costo de un disparo depende de cuántos objetivos
+# hay y no de qué tan compleja es la escena. También reparte los perdigones de la escopeta en un cono.
+import math
+import random
+from collections import namedtuple
+
+import numpy as np
+
+# Un impacto: objetivo alcanzado, distancia desde el origen del disparo, punto de impacto,
+# momento del disparo (reloj del motor) y número de perdigón que lo alcanzó.
+HitResult = namedtuple('HitResult', 'target distance point time pellet')
+
+WORLD_UP = (0.0, 1.0, 0.0)
+
+
+def _normalize(vector):
+    vector = np.asarray(vector, dtype=float)
+    length = math.sqrt(vector @ vector)
+    return vector / length if length > 0 else vector
+
+
+def _cross(a, b): # Producto cruz de dos vectores sueltos (np.cross es lento para un solo par).
+    return np.array((a[1] * b[2] - a[2] * b[1], a[2] * b[0] - a[0] * b[2], a[0] * b[1] - a[1] * b[0]))
+
+
+def pellet_directions(forward, pellets=1, spread=0.0, rng=None, up=WORLD_UP):
+    # Devuelve las direcciones de cada perdigón dentro de un cono de 'spread' grados alrededor de 'forward'.
+    # El primer perdigón siempre sale recto; con el mismo 'rng' (random.Random) el reparto es siempre igual.
+    forward = _normalize(forward)
+    rng = rng or random.Random(0)
+    directions = [forward]
+    if pellets <= 1 or spread <= 0:
+        return directions * max(pellets, 1)
+    right = _cross(up, forward)
+    if right @ right < 1e-12: # Disparando recto hacia arriba o abajo: usa otro eje de referencia.
+        right = _cross((1.0, 0.0, 0.0), forward)
+    right = _normalize(right)
+    up = _cross(forward, right)
+    max_angle = math.radians(spread)
+    for _ in range(pellets - 1):
+        # Distribución uniforme sobre el área del cono (la raíz evita que se amontonen en el centro).
+        angle = max_angle * math.sqrt(rng.random())
+        turn = rng.uniform(0, 2 * math.pi)
+        offset = math.tan(angle)
+        directions.append(_normalize(forward + (right * math.cos(turn) + up * math.sin(turn)) * offset))
+    return directions
+
+
+def intersect_billboards(origin, directions, centers, sizes, up=WORLD_UP):
+    # Prueba uno o varios rayos (un perdigón por fila de 'directions') contra varios billboards a la vez:
+    # quads que miran hacia el origen del rayo. 'centers' es un arreglo (N, 3) y 'sizes' (N,) el lado
+    # de cada quad. Devuelve la distancia de impacto de cada rayo a cada quad (P, N), o infinito si no lo toca.
+    origin = np.asarray(origin, dtype=float)
+    directions = np.atleast_2d(np.asarray(directions, dtype=float))
+    directions = directions / np.linalg.norm(directions, axis=1)[:, None]
+    offsets = centers - origin
+    depth = np.linalg.norm(offsets, axis=1) # Distancia del origen al centro de cada billboard.
+    half = np.asarray(sizes, dtype=float) * 0.5
+    # El plano de cada billboard es perpendicular a la línea entre su centro y el origen del rayo.
+    normals = -offsets / np.maximum(depth, 1e-9)[:, None]
+    # Ejes del quad: 'arriba' es el vector up proyectado sobre el plano, 'derecha' es perpendicular a ambos.
+    up = np.asarray(up, dtype=float)
+    quad_up = up - (normals @ up)[:, None] * normals
+    quad_up /= np.maximum(np.linalg.norm(quad_up, axis=1), 1e-9)[:, None]
+    quad_right = np.cross(quad_up, normals)
+    facing = -(directions @ normals.T) # Coseno entre cada rayo y la línea hacia cada centro.
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = np.where(facing > 1e-9, depth / facing, np.inf) # Distancia a lo largo del rayo hasta el plano.
+        # Como el origen está sobre la normal del quad, el punto de impacto relativo al centro es t * dirección.
+        inside = (np.abs(t * (directions @ quad_right.T)) <= half) & (np.abs(t * (directions @ quad_up.T)) <= half)
+    return np.where(inside, t, np.inf)
+
+
+class BroadPhaseGrid:
+    # Rejilla uniforme opcional en el plano XZ (vista desde arriba). Cada celda guarda los objetivos
+    # cuya esfera envolvente la toca, y un rayo solo prueba los objetivos de las celdas que atraviesa.
+    # Armarla cuesta un recorrido en Python por objetivo, y solo descarta a los que están lejos del rayo en
+    # la vista desde arriba: sirve si los objetivos están repartidos en profundidad. En los niveles del juego
+    # la prueba directa es más rápida con cualquier cantidad (ver BROAD_PHASE_MIN_TARGETS en config.py).
+    def __init__(self, cell_size=4.0):
+        self.cell_size = cell_size
+        self.cells = {}
+
+    def build(self, centers, sizes): # Reparte los objetivos (filas de 'centers') en las celdas.
+        self.cells = {}
+        radius = np.asarray(sizes, dtype=float) * 0.5 * math.sqrt(2)
+        low = np.floor((centers[:, [0, 2]] - radius[:, None]) / self.cell_size).astype(int)
+        high = np.floor((centers[:, [0, 2]] + radius[:, None]) / self.cell_size).astype(int)
+        for row, ((x0, z0), (x1, z1)) in enumerate(zip(low.tolist(), high.tolist())):
+            for ix in range(x0, x1 + 1):
+                for iz in range(z0, z1 + 1):
+                    self.cells.setdefault((ix, iz), []).append(row)
+        return self
+
+    def candidates(self, origin, direction, max_distance=200.0):
+        # Recorre las celdas que atraviesa el rayo (algoritmo DDA de Amanatides-Woo) y devuelve sus objetivos.
+        found = set()
+        x, z = origin[0] / self.cell_size, origin[2] / self.cell_size
+        dx, dz = direction[0], direction[2]
+        ix, iz = math.floor(x), math.floor(z)
+        step_x, step_z = (1 if dx > 0 else -1), (1 if dz > 0 else -1)
+        # Distancia (en unidades del rayo) hasta cruzar la siguiente línea de la rejilla en cada eje.
+        next_x = ((ix + (step_x > 0)) - x) * self.cell_size / dx if dx else math.inf
+        next_z = ((iz + (step_z > 0)) - z) * self.cell_size / dz if dz else math.inf
+        delta_x = self.cell_size / abs(dx) if dx else math.inf
+        delta_z = self.cell_size / abs(dz) if dz else math.inf
+        travelled = 0.0
+        while travelled <= max_distance:
+            found.update(self.cells.get((ix, iz), ()))
+            if next_x < next_z:
+                travelled, next_x, ix = next_x, next_x + delta_x, ix + step_x
+            else:
+                travelled, next_z, iz = next_z, next_z + delta_z, iz + step_z
+        return sorted(found)
+
+
+def resolve_shot(targets, centers, sizes, origin, forward, weapon, time=0.0, rng=None, up=WORLD_UP, grid=None):
+    # Resuelve un disparo completo del arma 'weapon' (ver WEAPONS en config.py) contra los objetivos vivos.
+    # Devuelve un HitResult por cada objetivo alcanzado (el más cercano de cada perdigón), en orden de perdigón.
+    if len(targets) == 0:
+        return []
+    centers = np.asarray(centers, dtype=float)
+    sizes = np.asarray(sizes, dtype=float)
+    origin = np.asarray(origin, dtype=float)
+    directions = pellet_directions(forward, weapon.get('pellets', 1), weapon.get('spread', 0.0), rng, up)
+    if grid is None: # Todos los perdigones contra todos los objetivos en una sola operación.
+        rows = np.arange(len(targets))
+        distances = intersect_billboards(origin, directions, centers, sizes, up)
+        candidates = [(rows, pellet_distances) for pellet_distances in distances]
+    else: # Cada perdigón solo prueba los objetivos de las celdas que atraviesa.
+        candidates = []
+        for direction in directions:
+            rows = np.asarray(grid.candidates(origin, direction), dtype=int)
+            distances = intersect_billboards(origin, direction, centers[rows], sizes[rows], up)[0] if len(rows) else ()
+            candidates.append((rows, distances))
+    hits = []
+    seen = set()
+    for pellet, (rows, distances) in enumerate(candidates):
+        if len(rows) == 0:
+            continue
+        nearest = int(np.argmin(distances))
+        if not np.isfinite(distances[nearest]):
+            continue
+        row = int(rows[nearest])
+        if row in seen: # Varios perdigones al mismo objetivo cuentan como un solo impacto.
+            continue
+        seen.add(row)
+        distance = float(distances[nearest])
+        point = tuple((origin + directions[pellet] * distance).tolist())
+        hits.append(HitResult(targets[row], distance, point, time, pellet))
+    return hits
@@ -0,0 +1,117 @@
+# --- HUD del Juego ---
+# El HUD ya no es un solo Text de varias líneas que se vuelve a armar en cada disparo y aparición:
+# - Cada dato (nivel, progreso de objetivos, aciertos, precisión) es un campo aparte con su etiqueta fija.
+# - set() solo marca el campo como "sucio" si su texto cambió; flush() (una vez por fotograma) redibuja
+#   únicamente los campos sucios, así varios cambios en el mismo fotograma cuestan un solo redibujado.
+# - Los números se dibujan con un atlas de glifos (GlyphAtlas) creado una sola vez: cada campo es una
+#   malla fija de celdas y cambiar su valor solo reescribe las coordenadas de textura de esas celdas,
+#   sin crear geometría nueva durante la partida (Text de Ursina regenera sus nodos en cada cambio).
+import math
+
+GLYPHS = ' 0123456789./%-' # El primero (espacio) es la celda vacía.
+
+
+class GlyphAtlas: # Textura con un glifo por celda, todas del mismo ancho (los dígitos de casi todas las fuentes lo son).
+    def __init__(self, font_path, characters=GLYPHS, size=64):
+        from PIL import Image, ImageDraw, ImageFont
+        from panda3d.core import SamplerState, Texture
+
+        font = ImageFont.truetype(str(font_path), size)
+        ascent, descent = font.getmetrics()
+        cell_width = math.ceil(max(font.getlength(character) for character in characters)) + 2
+        cell_height = ascent + descent
+        image = Image.new('RGBA', (cell_width * len(characters), cell_height), (255, 255, 255, 0))
+        draw = ImageDraw.Draw(image)
+        self.uvs = {} # carácter -> (u0, u1)
+        for i, character in enumerate(characters):
+            offset = (cell_width - font.getlength(character)) / 2 # Centrado en su celda.
+            draw.text((i * cell_width + offset, 0), character, font=font, fill=(255, 255, 255, 255))
+            self.uvs[character] = (i / len(characters), (i + 1) / len(characters))
+        self.blank = self.uvs[characters[0]]
+        self.aspect = cell_width / cell_height # Ancho de una celda cuando su alto es 1.
+
+        image = image.transpose(Image.FLIP_TOP_BOTTOM) # Panda3D guarda las filas de abajo hacia arriba.
+        self.texture = Texture('hud_glyphs')
+        self.texture.setup2dTexture(image.width, image.height, Texture.T_unsigned_byte, Texture.F_rgba8)
+        self.texture.setRamImageAs(image.tobytes(), 'RGBA')
+        self.texture.setMinfilter(SamplerState.FT_linear_mipmap_linear)
+        self.texture.setMagfilter(SamplerState.FT_linear)
+
+
+class NumberField: # Texto corto de ancho fijo (hasta 'width' caracteres) dibujado con el atlas.
+    def __init__(self, atlas, parent, width, position=(0, 0), scale=0.03, color=(1, 1, 1, 1)):
+        from panda3d.core import (Geom, GeomNode, GeomTriangles, GeomVertexData, GeomVertexFormat, GeomVertexWriter,
+                                  TransparencyAttrib)
+
+        self.atlas = atlas
+        self.width = width
+        self.text = None
+        # La malla se crea una sola vez: 'width' celdas de 4 vértices, con el origen arriba a la izquierda.
+        vertex_data = GeomVertexData('number_field', GeomVertexFormat.getV3t2(), Geom.UHDynamic)
+        vertex_data.setNumRows(width * 4)
+        vertex = GeomVertexWriter(vertex_data, 'vertex')
+        triangles = GeomTriangles(Geom.UHStatic)
+        for i in range(width):
+            left, right = i * atlas.aspect, (i + 1) * atlas.aspect
+            for x, y in ((left, -1), (right, -1), (right, 0), (left, 0)):
+                vertex.addData3(x, 0, y)
+            triangles.addVertices(i * 4, i * 4 + 1, i * 4 + 2)
+            triangles.addVertices(i * 4, i * 4 + 2, i * 4 + 3)
+        geom = Geom(vertex_data)
+        geom.addPrimitive(triangles)
+        node = GeomNode('number_field')
+        node.addGeom(geom)
+        self.geom = node.modifyGeom(0)
+
+        self.node_path = parent.attachNewNode(node)
+        self.node_path.setPos(position[0], 0, position[1])
+        self.node_path.setScale(scale)
+        self.node_path.setTexture(atlas.texture)
+        self.node_path.setTransparency(TransparencyAttrib.M_alpha)
+        self.node_path.setColor(color)
+        self.set('')
+
+    def set(self, text): # Reescribe solo las coordenadas de textura de las celdas.
+        from panda3d.core import GeomVertexWriter
+
+        text = text[:self.width].ljust(self.width)
+        if text == self.text:
+            return
+        self.text = text
+        texcoord = GeomVertexWriter(self.geom.modifyVertexData(), 'texcoord')
+        for character in text:
+            u0, u1 = self.atlas.uvs.get(character, self.atlas.blank)
+            texcoord.setData2(u0, 0)
+            texcoord.setData2(u1, 0)
+            texcoord.setData2(u1, 1)
+            texcoord.setData2(u0, 1)
+
+
+class Hud:
+    def __init__(self, atlas, parent, fields, line_height=0.045, text_scale=1.2, color=(1, 1, 1, 1)):
+        # 'fields' es una lista de (nombre, etiqueta, ancho): una línea por campo, de arriba hacia abajo.
+        from ursina import Text, Vec4
+
+        self.fields = {}
+        self.values = {}
+        self.dirty = set()
+        self.redraws = 0 # Campos redibujados en total (para el perfilador y las pruebas de rendimiento).
+        glyph_height = Text.size * text_scale # Misma altura que las etiquetas.
+        for row, (name, label, width) in enumerate(fields):
+            y = -row * line_height
+            text = Text(parent=parent, text=label, origin=(-.5, .5), position=(0, y), scale=text_scale, color=Vec4(*color))
+            self.fields[name] = NumberField(atlas, parent, width, position=(text.width * text_scale, y), scale=glyph_height, color=color)
+            self.values[name] = ''
+
+    def set(self, name, text): # Barato: solo recuerda el valor; se dibuja en el próximo flush().
+        if self.values[name] != text:
+            self.values[name] = text
+            self.dirty.add(name)
+
+    def flush(self): # Llamar una vez por fotograma.
+        if not self.dirty:
+            return
+        for name in self.dirty:
+            self.fields[name].set(self.values[name])
+        self.redraws += len(self.dirty)
+        self.dirty.clear()
@@ -0,0 +1,99 @@
+# --- Partículas de los Impactos ---
+# Cada impacto ya no toma una entidad HitEffect con sus propias animaciones (animate_scale, fade_out) y una
+# acción pendiente para devolverla al pool: ParticleSystem guarda todas las partículas vivas en arreglos de
+# NumPy preasignados y update() las envejece, mueve, escala y desvanece a todas juntas una vez por fotograma.
+# Se dibujan en una sola llamada con un BillboardBatch (billboards.py). Agregar efectos más ricos (chispas,
+# restos) solo agrega filas a los arreglos: ningún objeto de Python por impacto ni por partícula.
+# - emit(): una partícula (el destello del impacto: crece y se desvanece en su lugar).
+# - burst(): varias partículas con velocidades al azar en todas las direcciones y gravedad (chispas).
+# Con el búfer lleno, las partículas nuevas se descartan (es un efecto visual, no cambia el juego).
+import numpy as np
+
+
+def out_quad(t): # Mismas curvas que usaban las animaciones de Ursina (ursina.curve).
+    return t * (2 - t)
+
+
+def in_expo(t):
+    return np.power(2.0, 10 * (t - 1))
+
+
+class ParticleSystem:
+    def __init__(self, batch, capacity=1024, seed=None): # 'batch' es el BillboardBatch (textura) que las dibuja.
+        self.batch = batch
+        self.capacity = capacity
+        self.count = 0 # Partículas vivas: ocupan las primeras 'count' filas.
+        self.dropped = 0 # Partículas descartadas por falta de lugar.
+        self.rng = np.random.default_rng(seed) # Solo visual: no toca los números aleatorios del motor.
+        self.positions = np.zeros((capacity, 3))
+        self.velocities = np.zeros((capacity, 3))
+        self.gravity = np.zeros(capacity)
+        self.ages = np.zeros(capacity)
+        self.lifetimes = np.ones(capacity)
+        self.sizes = np.zeros((capacity, 2)) # Tamaño al nacer y al morir (crece o se achica con out_quad).
+        self.colors = np.ones((capacity, 4)) # Color al nacer; el alfa se desvanece hasta 'end_alpha' con in_expo.
+        self.end_alpha = np.zeros(capacity)
+
+    def _reserve(self, count): # Filas libres para 'count' partículas nuevas (menos si no entran).
+        start = self.count
+        stop = min(self.capacity, start + count)
+        self.dropped += count - (stop - start)
+        self.count = stop
+        return slice(start, stop)
+
+    def emit(self, position, size, end_size=None, lifetime=0.2, color=(1, 1, 1, 1), end_alpha=0.0,
+             velocity=(0, 0, 0), gravity=0.0):
+        rows = self._reserve(1)
+        self._init(rows, position, velocity, gravity, size, end_size, lifetime, color, end_alpha)
+
+    def burst(self, position, count, speed, size, end_size=None, lifetime=0.4, color=(1, 1, 1, 1), end_alpha=0.0,
+              gravity=9.8): # 'count' partículas que salen de 'position' en direcciones al azar, a 'speed' en promedio.
+        rows = self._reserve(count)
+        count = rows.stop - rows.start
+        if not count:
+            return
+        directions = self.rng.normal(size=(count, 3))
+        directions /= np.linalg.norm(directions, axis=1)[:, None]
+        velocities = directions * (speed * self.rng.uniform(0.5, 1.5, size=(count, 1)))
+        lifetimes = lifetime * self.rng.uniform(0.7, 1.3, size=count)
+        self._init(rows, position, velocities, gravity, size, end_size, lifetimes, color, end_alpha)
+
+    def _init(self, rows, position, velocity, gravity, size, end_size, lifetime, color, end_alpha):
+        self.positions[rows] = position
+        self.velocities[rows] = velocity
+        self.gravity[rows] = gravity
+        self.ages[rows] = 0
+        self.lifetimes[rows] = lifetime
+        self.sizes[rows] = (size, size if end_size is None else end_size)
+        self.colors[rows] = color
+        self.end_alpha[rows] = end_alpha
+
+    def update(self, dt): # Un solo paso para todas las partículas; llamar una vez por fotograma.
+        count = self.count
+        if count:
+            ages = self.ages[:count]
+            ages += dt
+            alive = ages < self.lifetimes[:count]
+            if not alive.all(): # Compacta las vivas al principio de los arreglos, conservando su orden.
+                count = int(alive.sum())
+                for array in (self.positions, self.velocities, self.gravity, self.ages, self.lifetimes,
+                              self.sizes, self.colors, self.end_alpha):
+                    array[:count] = array[:self.count][alive]
+                self.count = count
+        if not count:
+            self.batch.draw(self.positions[:0], self.sizes[:0, 0])
+            return
+        velocities = self.velocities[:count]
+        velocities[:, 1] -= self.gravity[:count] * dt
+        positions = self.positions[:count]
+        positions += velocities * dt
+        t = self.ages[:count] / self.lifetimes[:count]
+        sizes = self.sizes[:count]
+        scale = sizes[:, 0] + (sizes[:, 1] - sizes[:, 0]) * out_quad(t)
+        colors = self.colors[:count].copy()
+        colors[:, 3] += (self.end_alpha[:count] - colors[:, 3]) * in_expo(t)
+        self.batch.draw(positions, scale, colors)
+
+    def clear(self): # Quita todas las partículas (al empezar un nivel o salir a un menú).
+        self.count = 0
+        self.batch.draw(self.positions[:0], self.sizes[:0, 0])
@@ -0,0 +1,57 @@
+# --- Pool de Entidades ---
+# Reutiliza entidades ya construidas en lugar de crearlas y destruirlas en cada uso.
+# Crear un objetivo (quad con textura, colisionador y sombra) y destruirlo en cada disparo
+# provoca picos en el tiempo de fotograma, así que el pool las deshabilita y las guarda
+# para volver a habilitarlas la próxima vez que se necesiten.
+
+
+class EntityPool:
+    def __init__(self, factory, size=0): # Recibe la función que construye una entidad nueva y el tamaño inicial del pool.
+        self.factory = factory # Función (o clase) que crea una entidad nueva cuando el pool se queda vacío.
+        self.free = [] # Entidades deshabilitadas listas para reutilizarse.
+        self.active = {} # Entidades en uso: {entidad: None} (un conjunto que conserva el orden, como en registry.py).
+        self.hits = 0 # Veces que se reutilizó una entidad ya construida.
+        self.misses = 0 # Veces que hubo que construir una entidad nueva porque no quedaban libres.
+        self.created = 0 # Total de entidades construidas por el pool.
+        self.prewarm(size) # Construye por adelantado las entidades iniciales.
+
+    def _build(self): # Construye una entidad nueva y la deja deshabilitada.
+        entity = self.factory()
+        entity.disable()
+        self.created += 1
+        return entity
+
+    def prewarm(self, size): # Asegura que el pool tenga al menos 'size' entidades construidas (libres + activas).
+        while len(self.free) + len(self.active) < size:
+            self.free.append(self._build())
+
+    def acquire(self): # Entrega una entidad lista para usar. Crece si no quedan libres.
+        if self.free:
+            entity = self.free.pop()
+            self.hits += 1
+        else:
+            entity = self._build()
+            self.misses += 1
+        self.active[entity] = None
+        return entity
+
+    def release(self, entity): # Devuelve una entidad al pool. Ignora las que ya fueron liberadas.
+        if entity not in self.active: # Búsqueda en el diccionario, no en una lista: release_all() no es cuadrático.
+            return False
+        del self.active[entity]
+        entity.disable() # Se oculta en lugar de destruirse.
+        self.free.append(entity)
+        return True
+
+    def release_all(self): # Devuelve al pool todas las entidades en uso (por ejemplo al salir de un nivel).
+        for entity in list(self.active):
+            self.release(entity)
+
+    def stats(self): # Devuelve los contadores del pool para diagnóstico.
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'created': self.created,
+            'active': len(self.active),
+            'free': len(self.free),
+        }
@@ -0,0 +1,139 @@
+# --- Perfilador de Fotogramas ---
+# Mide el tiempo de cada fotograma y de las partes del juego que pueden provocar tirones (aparición de
+# objetivos, impactos, HUD, inicio y fin de nivel, cambio de música) con "spans" con nombre.
+# - Guarda una ventana móvil de tiempos para calcular p50/p95/p99 (el promedio de FPS esconde los tirones).
+# - ProfilerOverlay muestra esos datos en pantalla (se activa con una tecla).
+# - dump() guarda la sesión en CSV (cada medición, hasta MAX_RECORDS) y JSON (resumen) para analizarla después.
+# Apagado, cada función medida solo cuesta una comprobación de 'enabled'.
+import csv
+import functools
+import json
+import os
+import time
+from collections import deque
+
+import numpy as np
+
+PROFILE_FOLDER = 'profiles'
+PERCENTILES = (50, 95, 99)
+MAX_RECORDS = 200_000 # Mediciones que guarda dump() como máximo (unos minutos de juego); las más viejas se descartan.
+
+
+class Profiler:
+    def __init__(self, enabled=False, window=600, max_records=MAX_RECORDS): # 'window' es el número de mediciones recientes que se conservan.
+        self.enabled = enabled
+        self.window = window
+        self.frame_times = deque(maxlen=window) # Duración (s) de los últimos fotogramas.
+        self.spans = {} # nombre -> deque con las duraciones recientes (s)
+        # (momento, tipo, nombre, duración) para dump(): las últimas 'max_records', así una sesión larga no crece sin límite.
+        self.records = deque(maxlen=max_records)
+        self.recorded = 0 # Total de mediciones de la sesión (incluidas las que ya se descartaron de 'records').
+        self.started = time.perf_counter()
+
+    # --- Medición ---
+    def timed(self, name): # Decorador: mide cada llamada a la función como el span 'name'.
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                started = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.add_span(name, started, time.perf_counter() - started)
+            return wrapper
+        return decorator
+
+    def instrument(self, owner, attribute, name=None): # Envuelve un método ya existente (p. ej. los del motor).
+        setattr(owner, attribute, self.timed(name or attribute)(getattr(owner, attribute)))
+
+    def add_span(self, name, started, duration):
+        samples = self.spans.get(name)
+        if samples is None:
+            samples = self.spans[name] = deque(maxlen=self.window)
+        samples.append(duration)
+        self.records.append((started - self.started, 'span', name, duration))
+        self.recorded += 1
+
+    def frame(self, dt): # Llamar una vez por fotograma con la duración del fotograma anterior.
+        if not self.enabled:
+            return
+        self.frame_times.append(dt)
+        self.records.append((time.perf_counter() - self.started, 'frame', 'frame', dt))
+        self.recorded += 1
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        return self.enabled
+
+    # --- Resultados ---
+    @staticmethod
+    def _summary(samples): # Cantidad, promedio, percentiles y máximo en milisegundos.
+        if not samples:
+            return {'count': 0}
+        values = np.fromiter(samples, dtype=float, count=len(samples)) * 1000
+        summary = {'count': len(values), 'mean_ms': float(values.mean()), 'max_ms': float(values.max())}
+        for percentile, value in zip(PERCENTILES, np.percentile(values, PERCENTILES)):
+            summary[f'p{percentile}_ms'] = float(value)
+        return summary
+
+    def summary(self): # Resumen de la ventana reciente: fotogramas y cada span.
+        return {
+            'frame': self._summary(self.frame_times),
+            'spans': {name: self._summary(samples) for name, samples in sorted(self.spans.items())},
+        }
+
+    def dump(self, folder=PROFILE_FOLDER, extra=None): # Guarda la sesión en CSV y JSON ('extra': más datos para el JSON). Devuelve la ruta base.
+        os.makedirs(folder, exist_ok=True)
+        base = os.path.join(folder, time.strftime('session_%Y%m%d_%H%M%S'))
+        with open(base + '.csv', 'w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(['time_s', 'kind', 'name', 'duration_ms'])
+            for moment, kind, name, duration in self.records:
+                writer.writerow([f'{moment:.6f}', kind, name, f'{duration * 1000:.4f}'])
+        session = {'duration_s': time.perf_counter() - self.started, 'window': self.window,
+                   'records': len(self.records), 'records_dropped': self.recorded - len(self.records), **self.summary(), **(extra or {})}
+        with open(base + '.json', 'w', encoding='utf-8') as file:
+            json.dump(session, file, indent=1)
+        return base
+
+    def report(self, top=6): # Texto corto para el overlay.
+        summary = self.summary()
+        frame = summary['frame']
+        if not frame['count']:
+            return 'perfilador: sin datos'
+        lines = [
+            f"fotograma  p50 {frame['p50_ms']:.1f}  p95 {frame['p95_ms']:.1f}  p99 {frame['p99_ms']:.1f}  max {frame['max_ms']:.1f} ms",
+        ]
+        spans = sorted(summary['spans'].items(), key=lambda item: -item[1]['p95_ms'])[:top]
+        for name, span in spans:
+            lines.append(f"{name:<18} p95 {span['p95_ms']:.2f}  max {span['max_ms']:.2f} ms  ({span['count']})")
+        return '\n'.join(lines)
+
+
+class ProfilerOverlay: # Texto en pantalla con el reporte del perfilador; se actualiza unas veces por segundo.
+    def __init__(self, profiler, interval=0.25, extra=None): # 'extra()' agrega líneas (p. ej. entidades por categoría).
+        from ursina import Text, camera, color, window
+
+        self.profiler = profiler
+        self.interval = interval
+        self.extra = extra
+        self.elapsed = 0.0
+        self.text = Text(parent=camera.ui, text='', position=window.top_left + (0.02, -0.06), origin=(-0.5, 0.5),
+                         scale=0.7, color=color.lime, background=True, enabled=profiler.enabled)
+
+    def toggle(self): # Activa o desactiva el perfilador junto con el texto.
+        self.text.enabled = self.profiler.toggle()
+
+    def update(self, dt):
+        if not self.text.enabled:
+            return
+        self.elapsed += dt
+        if self.elapsed < self.interval:
+            return
+        self.elapsed = 0.0
+        report = self.profiler.report()
+        if self.extra:
+            report += '\n' + self.extra()
+        self.text.text = report
@@ -0,0 +1,51 @@
+# --- Registro de Entidades ---
+# Lleva, por categoría (objetivos, efectos, interfaz, armas, textos de depuración), las entidades vivas
+# a medida que se crean y se destruyen. Así las operaciones sobre una categoría ("ocultar todos los
+# efectos", "colorear los textos de depuración") solo recorren esas entidades y no toda scene.entities,
+# que crece con los menús, el HUD, las armas y los efectos.
+
+
+class EntityRegistry:
+    def __init__(self):
+        self.categories = {} # categoría -> {entidad: None} (un conjunto que conserva el orden de registro)
+        self.category_of = {} # entidad -> categoría
+
+    def add(self, entity, category): # Registra una entidad y la devuelve, para poder usarlo al crearla.
+        self.remove(entity)
+        self.categories.setdefault(category, {})[entity] = None
+        self.category_of[entity] = category
+        # Ursina llama a on_destroy() al destruir la entidad: ahí sale del registro.
+        previous = getattr(entity, 'on_destroy', None)
+
+        def on_destroy():
+            self.remove(entity)
+            if previous:
+                previous()
+        entity.on_destroy = on_destroy
+        return entity
+
+    def remove(self, entity): # Saca una entidad del registro (no hace nada si no estaba).
+        category = self.category_of.pop(entity, None)
+        if category is None:
+            return False
+        del self.categories[category][entity]
+        return True
+
+    def entities(self, category): # Entidades registradas en una categoría.
+        return list(self.categories.get(category, ()))
+
+    def enabled(self, category): # Solo las que están habilitadas.
+        return [entity for entity in self.categories.get(category, ()) if entity.enabled]
+
+    def disable_all(self, category): # Deshabilita todas las entidades de una categoría.
+        for entity in self.categories.get(category, ()):
+            entity.disable()
+
+    def counts(self): # Entidades por categoría (registradas y habilitadas), para diagnóstico.
+        return {
+            category: {'total': len(entities), 'enabled': sum(1 for entity in entities if entity.enabled)}
+            for category, entities in self.categories.items()
+        }
+
+    def __len__(self): # Total de entidades registradas.
+        return len(self.category_of)
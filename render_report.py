@@ -0,0 +1,237 @@
+# --- Reporte de Dibujado por Nivel ---
+# A diferencia de bench.py (funciones sueltas), juega cada nivel completo en una ventana fuera de pantalla
+# de resolución fija y mide cómo se dibuja: sirve para detectar que una textura nueva del escenario o un
+# modelo de arma más pesado volvieron más cara la escena. Pensado para correr sin supervisión en Linux
+# sin GPU: fuerza el dibujado por software de Mesa (llvmpipe) si no se indicó otra cosa.
+# - Entrada: el tirador de referencia del motor (first_target_shooter) o una sesión grabada (.tabs).
+# - El reloj del juego avanza con un dt fijo, así que cada corrida simula exactamente los mismos fotogramas.
+# - Por fotograma: tiempo de CPU (lógica del juego y de Ursina) y de GPU (la tarea igLoop de Panda3D: recorrido
+#   de la escena y dibujado, esperando a que termine con gl-finish; con llvmpipe es el tiempo del rasterizador).
+# - Cada cierto número de fotogramas: nodos, Geoms (cada Geom visible es una llamada de dibujado), vértices y
+#   memoria de las texturas de la escena (3D e interfaz), y texturas ya subidas a la GPU. Se guarda el máximo.
+# Escribe un JSON por nivel en profiles/render_<fecha>/ y puede compararse con una corrida anterior.
+#
+# Uso: python render_report.py                                 los tres niveles con el tirador de referencia
+#      python render_report.py --levels 3 --size 1920x1080
+#      python render_report.py --session sessions/archivo.tabs   repite una partida grabada
+#      python render_report.py --compare profiles/render_20250101_120000 [--threshold 0.25]
+#          falla (código de salida 1) si algún nivel empeoró más de un 25 % respecto de esa corrida
+import argparse
+import json
+import os
+import sys
+import time
+
+DEFAULT_SIZE = (1280, 720)
+FRAME_RATE = 60 # dt fijo del reloj del juego (1 / FRAME_RATE).
+MAX_SECONDS = 120 # Segundos de juego como máximo por nivel (por si el nivel no termina).
+SAMPLE_EVERY = 30 # Fotogramas entre cada análisis de la escena (recorrerla no entra en los tiempos medidos).
+REPORT_FOLDER = 'profiles'
+DEFAULT_THRESHOLD = 0.25
+COMPARED = ('cpu.p95_ms', 'gpu.p95_ms', 'scene.nodes', 'scene.geoms', 'scene.vertices', 'scene.texture_bytes')
+
+
+def configure_rendering(): # Antes de abrir la ventana.
+    from panda3d.core import loadPrcFileData
+
+    os.environ.setdefault('LIBGL_ALWAYS_SOFTWARE', '1') # Mesa: llvmpipe aunque haya un controlador de GPU.
+    # Sin glFinish() al final de cada fotograma, el controlador devuelve el control antes de dibujar y el
+    # tiempo de la GPU se perdería en el fotograma siguiente.
+    loadPrcFileData('render_report', 'gl-finish true')
+
+
+def fix_clock(frame_rate=FRAME_RATE): # El reloj global informa siempre el mismo dt, tarde lo que tarde el fotograma.
+    from panda3d.core import ClockObject
+
+    clock = ClockObject.getGlobalClock()
+    clock.setMode(ClockObject.MForced)
+    clock.setFrameRate(frame_rate)
+
+
+def analyze_scene(app): # Tamaño de la escena que se está dibujando (mundo 3D e interfaz).
+    from panda3d.core import SceneGraphAnalyzer
+    from ursina import camera
+
+    analyzer = SceneGraphAnalyzer()
+    for root in (app.render, camera.ui.getTop()):
+        analyzer.addNode(root.node())
+    return {
+        'nodes': analyzer.getNumNodes(),
+        'geoms': analyzer.getNumGeoms(),
+        'vertices': analyzer.getNumVertices(),
+        'texture_bytes': analyzer.getTextureBytes(),
+        'textures_on_gpu': app.win.getGsg().getPreparedObjects().getNumPreparedTextures(),
+    }
+
+
+class LevelRecorder: # Tiempos y tamaño de la escena de un nivel.
+    def __init__(self, level):
+        self.level = level
+        self.cpu = []
+        self.gpu = []
+        self.scene = {} # Máximo de cada dato de analyze_scene().
+
+    def add_frame(self, cpu, gpu):
+        self.cpu.append(cpu)
+        self.gpu.append(gpu)
+
+    def sample(self, scene):
+        for name, value in scene.items():
+            self.scene[name] = max(self.scene.get(name, 0), value)
+
+    def report(self, **extra):
+        from profiler import Profiler
+
+        return {
+            'level': self.level,
+            'frames': len(self.cpu),
+            'game_seconds': len(self.cpu) / FRAME_RATE,
+            'cpu': Profiler._summary(self.cpu),
+            'gpu': Profiler._summary(self.gpu),
+            'scene': self.scene,
+            **extra,
+            'frame_times_ms': [[round(cpu * 1000, 3), round(gpu * 1000, 3)] for cpu, gpu in zip(self.cpu, self.gpu)],
+        }
+
+
+class FramePlayer: # Avanza un fotograma completo del juego y separa el tiempo de CPU del de GPU.
+    def __init__(self, game, shooter=None):
+        self.game = game
+        self.shooter = shooter # shooter(engine) -> (origen, dirección) o None, como en engine.run_level.
+        self.render_task = game['app'].taskMgr.mgr.findTask('igLoop') # La tarea de Panda3D que dibuja el fotograma.
+
+    def step(self): # Devuelve (segundos de CPU, segundos de GPU).
+        engine = self.game['engine']
+        if self.shooter is not None and engine.active:
+            aim = self.shooter(engine)
+            if aim is not None:
+                engine.fire(*aim)
+        started = time.perf_counter()
+        self.game['update']() # El update() del juego no es el de __main__: Ursina no lo llama solo.
+        self.game['app'].step()
+        total = time.perf_counter() - started
+        render = self.render_task.getDt() # Duración de la última ejecución de igLoop.
+        return total - render, render
+
+
+def play_levels(game, levels, max_seconds=MAX_SECONDS): # Juega cada nivel con el tirador de referencia.
+    from engine import first_target_shooter
+
+    engine = game['engine']
+    player = FramePlayer(game, first_target_shooter)
+    recorders = []
+    for level in levels:
+        game['start_level'](level)
+        recorder = LevelRecorder(level)
+        while engine.active and len(recorder.cpu) < max_seconds * FRAME_RATE:
+            recorder.add_frame(*player.step())
+            if len(recorder.cpu) % SAMPLE_EVERY == 1:
+                recorder.sample(analyze_scene(game['app']))
+        game['results_panel'].hide()
+        recorders.append(recorder)
+    return recorders
+
+
+def play_session(game): # Repite la sesión que cargó el juego (REPLAY); los fotogramas fuera de un nivel no cuentan.
+    engine = game['engine']
+    player = FramePlayer(game)
+    recorders = {}
+    while game['replay_index'] <= len(game['replay_events']): # replay_frame() lo pasa del final al terminar.
+        cpu, gpu = player.step()
+        if not engine.active:
+            continue
+        recorder = recorders.setdefault(engine.current_level, LevelRecorder(engine.current_level))
+        recorder.add_frame(cpu, gpu)
+        if len(recorder.cpu) % SAMPLE_EVERY == 1:
+            recorder.sample(analyze_scene(game['app']))
+    return list(recorders.values())
+
+
+def metric(report, path): # 'cpu.p95_ms' -> report['cpu']['p95_ms']
+    value = report
+    for key in path.split('.'):
+        value = value.get(key, 0)
+    return value
+
+
+def compare(reports, baseline_folder, threshold): # Devuelve los (nivel, dato, proporción) que empeoraron más que 'threshold'.
+    regressions = []
+    print(f"\n{'nivel':<6} {'dato':<20} {'base':>14} {'ahora':>14} {'cambio':>9}")
+    for report in reports:
+        path = os.path.join(baseline_folder, f"level_{report['level']}.json")
+        if not os.path.exists(path):
+            continue
+        with open(path, encoding='utf-8') as file:
+            baseline = json.load(file)
+        for name in COMPARED:
+            base, now = metric(baseline, name), metric(report, name)
+            ratio = now / base if base else 1.0
+            flag = ''
+            if ratio > 1 + threshold:
+                regressions.append((report['level'], name, ratio))
+                flag = '  <-- REGRESIÓN'
+            print(f"{report['level']:<6} {name:<20} {base:14.2f} {now:14.2f} {(ratio - 1) * 100:+8.1f}%{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Reporte de dibujado por nivel de TiroAlBlanco, sin pantalla.')
+    parser.add_argument('--levels', type=int, nargs='+', help='niveles a jugar (por defecto, todos)')
+    parser.add_argument('--session', help='sesión grabada (.tabs) a repetir en lugar del tirador de referencia')
+    parser.add_argument('--size', default='%dx%d' % DEFAULT_SIZE, help='resolución del búfer, p. ej. 1280x720')
+    parser.add_argument('--max-seconds', type=float, default=MAX_SECONDS, help='segundos de juego como máximo por nivel')
+    parser.add_argument('--folder', default=REPORT_FOLDER, help='carpeta donde se crea la de esta corrida')
+    parser.add_argument('--compare', help='carpeta de una corrida anterior contra la que comparar')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help='empeoramiento tolerado (0.25 = 25 %%)')
+    args = parser.parse_args(argv)
+    size = tuple(int(value) for value in args.size.lower().split('x'))
+
+    os.chdir(os.path.dirname(os.path.abspath(__file__))) # Las rutas de los recursos son relativas al juego.
+    if args.session:
+        os.environ['REPLAY'] = os.path.abspath(args.session) # El juego repite la sesión por su cuenta (replay_frame).
+    configure_rendering()
+    from bench import load_game
+    from config import LEVEL_CONFIG
+
+    levels = args.levels or sorted(LEVEL_CONFIG) # Antes de load_game(), que agrega el nivel de bench.py.
+    game = load_game(size)
+    fix_clock()
+    game['go_to_level_select']()
+    gsg = game['app'].win.getGsg()
+    if args.session:
+        recorders = play_session(game)
+        source = os.path.basename(args.session)
+    else:
+        recorders = play_levels(game, levels, args.max_seconds)
+        source = 'first_target_shooter'
+
+    folder = os.path.join(args.folder, time.strftime('render_%Y%m%d_%H%M%S'))
+    os.makedirs(folder, exist_ok=True)
+    reports = []
+    print(f"\n{gsg.getDriverRenderer()} a {size[0]}x{size[1]}, entrada: {source}")
+    print(f"{'nivel':<6} {'fotogramas':>10} {'cpu p50/p95 (ms)':>18} {'gpu p50/p95 (ms)':>18} {'geoms':>6} {'nodos':>6} {'texturas (MB)':>14}")
+    for recorder in recorders:
+        report = recorder.report(config=LEVEL_CONFIG.get(recorder.level), input=source, resolution=list(size),
+                                 renderer=gsg.getDriverRenderer(), vendor=gsg.getDriverVendor())
+        reports.append(report)
+        with open(os.path.join(folder, f'level_{recorder.level}.json'), 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=1)
+        cpu, gpu, scene = report['cpu'], report['gpu'], report['scene']
+        if not report['frames']:
+            continue
+        print(f"{recorder.level:<6} {report['frames']:>10} {cpu['p50_ms']:8.2f}/{cpu['p95_ms']:<9.2f} {gpu['p50_ms']:8.2f}/{gpu['p95_ms']:<9.2f} "
+              f"{scene['geoms']:>6} {scene['nodes']:>6} {scene['texture_bytes'] / 2 ** 20:14.1f}")
+    print('reportes guardados en', folder)
+
+    if args.compare:
+        regressions = compare(reports, args.compare, args.threshold)
+        if regressions:
+            print(f'\n{len(regressions)} datos empeoraron más de un {args.threshold * 100:.0f} %:',
+                  ', '.join(f'nivel {level} {name} (x{ratio:.2f})' for level, name, ratio in regressions))
+            return 1
+        print(f'\nsin regresiones (umbral {args.threshold * 100:.0f} %)')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
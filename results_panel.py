@@ -0,0 +1,79 @@
+# --- Panel de Resultados ---
+# El panel de fin de nivel se construye una sola vez (al iniciar el juego) y después solo se muestra,
+# se oculta y se le cambian los textos. Antes end_level() creaba cada vez el panel con sus textos y
+# botones; cada Text(font=...) de Ursina además vacía la caché de glifos de la fuente compartida
+# (font.clear()), así que cada reintento volvía a rasterizar las letras y a armar todas las entidades.
+# Al construirlo se dejan dibujados en la fuente los glifos que usan los resultados (números incluidos),
+# para que mostrarlo solo cambie textos ya rasterizados.
+
+TEXT_FONT = 'assets/fonts/CenturyGothicBold.ttf'
+TITLE_FONT = 'assets/fonts/keetano_katana.ttf'
+GLYPHS = '0123456789.,%/()ÁÉÍÓÚáéíóúÑñ abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ:'
+
+
+def warm_glyphs(font, characters=GLYPHS): # Rasteriza de antemano los glifos en las páginas de textura de la fuente.
+    for character in characters:
+        font.getGlyph(ord(character))
+
+
+class ResultsPanel:
+    def __init__(self, assets, on_retry, on_menu, registry=None):
+        # 'on_retry(level)' y 'on_menu()' se llaman desde los botones; 'registry' (registry.EntityRegistry) es opcional.
+        from ursina import Button, Entity, Text, camera, color
+
+        self.on_retry = on_retry
+        self.on_menu = on_menu
+        self.level = None
+        assets.acquire('font', TEXT_FONT) # Quedan retenidas en la caché de recursos mientras exista el panel.
+        assets.acquire('font', TITLE_FONT)
+
+        self.panel = Entity(parent=camera.ui, model='quad', scale=(.8, .7), color=color.white.tint(.2), z=1, enabled=False)
+        assets.hold(self.panel, 'font', TEXT_FONT)
+        assets.hold(self.panel, 'font', TITLE_FONT)
+        self.title = Text(parent=self.panel, text='', color=color.black, origin=(0, 0), y=.2, scale=3, font=TITLE_FONT)
+        self.accuracy = Text(parent=self.panel, text='', color=color.black, origin=(0, 0), y=0, scale=1.9, font=TEXT_FONT)
+        self.hits = Text(parent=self.panel, text='', color=color.black, origin=(0, 0), y=-.1, scale=1.9, font=TEXT_FONT)
+        button = dict(parent=self.panel, highlight_color=color.orange, pressed_color=color.yellow, color=color.red,
+                      text_color=color.white, font=TEXT_FONT, model='quad', radius=0.18)
+        self.retry_button = Button(text='Reintentar', scale=(0.35, 0.12), y=-.25,
+                                   texture=assets.texture('assets/textures/button_rententar.jpg'), **button)
+        self.menu_button = Button(text='Menú de Niveles', scale=(0.35, 0.12), y=-.4,
+                                  texture=assets.texture('assets/textures/button_menu.jpg'), **button)
+        # Al superar el nivel solo queda el botón del menú, más grande (se crea aparte para no deformar su texto).
+        self.passed_menu_button = Button(text='Menú de Niveles', scale=(0.40, 0.15), y=-.3,
+                                         texture=assets.texture('assets/textures/button_menu.jpg'), **button)
+        for entity, path in ((self.retry_button, 'assets/textures/button_rententar.jpg'), (self.menu_button, 'assets/textures/button_menu.jpg'),
+                             (self.passed_menu_button, 'assets/textures/button_menu.jpg')):
+            assets.hold(entity, 'texture', path) # Destruir el panel destruye los botones y suelta sus texturas.
+        self.retry_button.on_click = self._retry
+        self.menu_button.on_click = self.passed_menu_button.on_click = self._menu
+        if registry is not None:
+            registry.add(self.panel, 'results')
+
+        for text in (self.title, self.accuracy): # Después de crear los textos, que vacían la caché de glifos al asignar la fuente.
+            warm_glyphs(text.font)
+
+    @property
+    def enabled(self):
+        return self.panel.enabled
+
+    def show(self, result): # Llena el panel con los resultados del motor y lo muestra.
+        self.level = result['level']
+        self.accuracy.text = f"Precisión: {result['accuracy']:.1f}% (Objetivo: {result['goal']}%)"
+        self.hits.text = f"Aciertos: {result['hits']} / {result['shots']}"
+        passed = result['passed'] # El motor ya desbloqueó el siguiente nivel si corresponde.
+        self.title.text = f" NIVEL {self.level} COMPLETADO " if passed else 'INTENTALO DE NUEVO'
+        self.passed_menu_button.enabled = passed
+        self.retry_button.enabled = self.menu_button.enabled = not passed # Precisión insuficiente: reintentar o volver al menú.
+        self.panel.enable()
+
+    def hide(self):
+        self.panel.disable()
+
+    def _retry(self):
+        self.hide()
+        self.on_retry(self.level)
+
+    def _menu(self):
+        self.hide()
+        self.on_menu()
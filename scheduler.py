@@ -0,0 +1,71 @@
+# --- Planificador de Eventos ---
+# Línea de tiempo de acciones pendientes (apariciones, oleadas, fin de nivel, efectos visuales) que
+# avanza con un solo tick por fotograma. Reemplaza a las cadenas de invoke(): todo lo pendiente se
+# puede cancelar de una vez al reiniciar un nivel o volver a un menú, así no quedan llamadas viejas
+# que se ejecuten en la partida siguiente.
+import heapq
+
+
+class ScheduledEvent:
+    __slots__ = ('time', 'order', 'func', 'args', 'key', 'cancelled')
+
+    def __init__(self, time, order, func, args, key):
+        self.time = time # Momento (reloj del planificador) en que se ejecuta.
+        self.order = order # Desempate: a igual momento, se ejecutan en el orden en que se programaron.
+        self.func = func
+        self.args = args
+        self.key = key # Clave opcional: solo puede haber un evento pendiente por clave.
+        self.cancelled = False
+
+    def __lt__(self, other):
+        return (self.time, self.order) < (other.time, other.order)
+
+
+class Scheduler:
+    def __init__(self):
+        self.now = 0.0 # Reloj del planificador en segundos (solo avanza con tick()).
+        self.events = [] # Montículo de ScheduledEvent ordenado por momento.
+        self.keys = {} # clave -> evento pendiente con esa clave
+        self._order = 0
+
+    def __len__(self): # Eventos pendientes (sin contar los cancelados).
+        return sum(1 for event in self.events if not event.cancelled)
+
+    def at(self, time, func, *args, key=None): # Programa func(*args) para el momento 'time'.
+        if key is not None and key in self.keys:
+            return self.keys[key] # Ya hay uno pendiente con esa clave (p. ej. el fin de nivel).
+        self._order += 1
+        event = ScheduledEvent(time, self._order, func, args, key)
+        heapq.heappush(self.events, event)
+        if key is not None:
+            self.keys[key] = event
+        return event
+
+    def after(self, delay, func, *args, key=None): # Programa func(*args) dentro de 'delay' segundos.
+        return self.at(self.now + delay, func, *args, key=key)
+
+    def cancel(self, event): # Cancela un evento; se descarta cuando llega su turno.
+        event.cancelled = True
+        if event.key is not None and self.keys.get(event.key) is event:
+            del self.keys[event.key]
+
+    def cancel_all(self): # Descarta todo lo pendiente de una vez.
+        self.events.clear()
+        self.keys.clear()
+
+    def pending(self, key): # ¿Hay un evento pendiente con esta clave?
+        return key in self.keys
+
+    def tick(self, now): # Avanza el reloj hasta 'now' y ejecuta, en orden, los eventos que vencieron.
+        self.now = now
+        events = self.events
+        while events and events[0].time <= now:
+            event = heapq.heappop(events)
+            if event.cancelled:
+                continue
+            if event.key is not None:
+                self.keys.pop(event.key, None)
+            event.func(*event.args) # Puede programar eventos nuevos (incluso para este mismo tick).
+
+    def advance(self, dt): # Igual que tick(), pero avanzando 'dt' segundos desde el momento actual.
+        self.tick(self.now + dt)
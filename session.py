@@ -0,0 +1,187 @@
+# --- Grabación y Repetición de Partidas ---
+# Graba todo lo que entra al motor (engine.py) durante una sesión: la semilla, el dt de cada tick,
+# cada disparo con la orientación de la cámara y los cambios de nivel. Como el motor es determinista con
+# la misma semilla y las mismas entradas, repetir la grabación reproduce exactamente las mismas
+# apariciones, impactos y precisión final, ya sea en la ventana o sin ventana a máxima velocidad.
+#
+# Formato (.tabs): cabecera sin comprimir (MAGIC, versión, semilla) seguida de un flujo zlib con
+# registros binarios (tipo de 1 byte + datos). Lo escribe un hilo aparte, así que grabar en el
+# fotograma solo cuesta meter una tupla en una cola. El juego solo graba si se inicia con RECORD=1.
+#
+# Uso: python session.py sessions/archivo.tabs   (repite la sesión sin ventana y muestra los resultados)
+import math
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+
+from config import LEVEL_CONFIG
+
+SESSION_FOLDER = 'sessions'
+MAGIC = b'TABS'
+VERSION = 2 # La 1 no guardaba a qué menú se salía en STOP (se repite como el menú de niveles).
+HEADER = struct.Struct('<4sHQ') # MAGIC, versión, semilla
+
+# Tipos de registro y su contenido.
+FRAME, SHOT, LEVEL, STOP = 1, 2, 3, 4
+RECORDS = {
+    FRAME: struct.Struct('<d'), # dt que recibió engine.step() (un tick de timestep.py)
+    SHOT: struct.Struct('<9d'), # origen, dirección y 'arriba' de la cámara (NaN si el disparo no trae rayo)
+    LEVEL: struct.Struct('<B'), # nivel que se inició
+    STOP: struct.Struct('<B'), # salida a un menú (engine.stop) y a cuál: MENU_LEVELS o MENU_MAIN
+}
+RECORDS_BY_VERSION = {1: {**RECORDS, STOP: struct.Struct('<')}, VERSION: RECORDS}
+MENU_LEVELS, MENU_MAIN = 0, 1 # Menú al que se salió en un registro STOP.
+
+
+def new_seed(): # Semilla aleatoria para una partida nueva (cabe en los 8 bytes de la cabecera).
+    return int.from_bytes(os.urandom(8), 'little') >> 1
+
+
+# --- Grabación ---
+class SessionWriter: # Escribe los registros desde un hilo de trabajo para no frenar el fotograma.
+    def __init__(self, path, seed, flush_every=256): # 'flush_every': registros entre cada volcado a disco.
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.path = path
+        self.seed = seed
+        self.flush_every = flush_every
+        self.queue = queue.SimpleQueue()
+        self.records = 0
+        self.file = open(path, 'wb')
+        self.file.write(HEADER.pack(MAGIC, VERSION, seed))
+        self.thread = threading.Thread(target=self._run, name='session-writer', daemon=True)
+        self.thread.start()
+
+    def write(self, kind, *values): # Se llama desde el hilo principal; nunca bloquea.
+        self.queue.put((kind, values))
+
+    def _run(self):
+        compressor = zlib.compressobj(6)
+        pending = []
+        while True:
+            item = self.queue.get()
+            if item is not None:
+                kind, values = item
+                pending.append(bytes((kind,)) + RECORDS[kind].pack(*values))
+                self.records += 1
+            # Vuelca cuando se juntaron bastantes registros o la cola quedó vacía (o al cerrar).
+            if item is None or len(pending) >= self.flush_every or self.queue.empty():
+                if pending:
+                    self.file.write(compressor.compress(b''.join(pending)))
+                    # SYNC_FLUSH deja el archivo legible hasta aquí aunque el juego se cierre de golpe.
+                    self.file.write(compressor.flush(zlib.Z_SYNC_FLUSH))
+                    self.file.flush()
+                    pending = []
+            if item is None:
+                self.file.write(compressor.flush())
+                self.file.close()
+                return
+
+    def close(self): # Termina de escribir lo pendiente y cierra el archivo.
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join()
+
+
+class SessionRecorder: # Graba las entradas de un GameEngine envolviendo sus métodos públicos.
+    def __init__(self, engine, writer):
+        self.engine = engine
+        self.writer = writer
+        self._wrap('step', lambda dt: (FRAME, dt))
+        self._wrap('fire', lambda origin=None, direction=None, up=(0.0, 1.0, 0.0):
+                   (SHOT, *(origin or (math.nan,) * 3), *(direction or (math.nan,) * 3), *up))
+        self._wrap('start_level', lambda level: (LEVEL, level))
+        self._wrap('stop', lambda menu=MENU_LEVELS: (STOP, menu))
+
+    def _wrap(self, name, record): # Graba la llamada antes de pasarla al motor (en el mismo orden en que ocurren).
+        method = getattr(self.engine, name)
+        writer = self.writer
+
+        def wrapper(*args, **kwargs):
+            writer.write(*record(*args, **kwargs))
+            return method(*args, **kwargs)
+        setattr(self.engine, name, wrapper)
+
+    def close(self):
+        self.writer.close()
+
+
+def session_path(folder=SESSION_FOLDER): # Ruta para una sesión nueva, con fecha y hora.
+    return os.path.join(folder, time.strftime('session_%Y%m%d_%H%M%S.tabs'))
+
+
+# --- Lectura y Repetición ---
+def read_session(path): # Devuelve (semilla, lista de (tipo, valores)).
+    with open(path, 'rb') as file:
+        header = file.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ValueError(f'{path} no es una sesión grabada compatible')
+        magic, version, seed = HEADER.unpack(header)
+        if magic != MAGIC or version not in RECORDS_BY_VERSION:
+            raise ValueError(f'{path} no es una sesión grabada compatible')
+        try: # decompressobj tolera un flujo sin cerrar (sesión que terminó de golpe).
+            data = zlib.decompressobj().decompress(file.read())
+        except zlib.error as error:
+            raise ValueError(f'{path}: datos dañados ({error})') from error
+    records = RECORDS_BY_VERSION[version]
+    events = []
+    offset = 0
+    while offset < len(data):
+        kind = data[offset]
+        record = records.get(kind)
+        if record is None:
+            raise ValueError(f'{path}: tipo de registro desconocido {kind} en el byte {offset} (¿archivo dañado o de una versión más nueva?)')
+        if offset + 1 + record.size > len(data):
+            break # Registro incompleto al final del archivo.
+        events.append((kind, record.unpack_from(data, offset + 1)))
+        offset += 1 + record.size
+    return seed, events
+
+
+def apply_event(engine, kind, values): # Repite una entrada grabada sobre el motor.
+    if kind == FRAME:
+        engine.step(values[0])
+    elif kind == SHOT:
+        origin, direction, up = values[0:3], values[3:6], values[6:9]
+        if math.isnan(origin[0]):
+            origin = direction = None
+        engine.fire(origin, direction, up)
+    elif kind == LEVEL:
+        engine.start_level(values[0])
+    elif kind == STOP:
+        engine.stop(*values)
+
+
+def replay(path, level_config=LEVEL_CONFIG):
+    # Repite una sesión sin ventana a máxima velocidad. Devuelve los resultados de cada nivel terminado
+    # y un resumen (apariciones e impactos) para compararlos con la partida original.
+    from engine import GameEngine
+
+    seed, events = read_session(path)
+    engine = GameEngine(level_config, seed=seed)
+    results = []
+    counts = {'spawn': 0, 'hit': 0, 'shot': 0}
+
+    def listener(event, *args):
+        if event == 'level_end':
+            results.append(args[0])
+        elif event in counts:
+            counts[event] += 1
+    engine.on(listener)
+    for kind, values in events:
+        apply_event(engine, kind, values)
+    frames = sum(1 for kind, _ in events if kind == FRAME)
+    return results, {'seed': seed, 'frames': frames, 'time': engine.time, **counts}
+
+
+if __name__ == '__main__':
+    import sys
+    started = time.perf_counter()
+    level_results, summary = replay(sys.argv[1])
+    print(f"{summary['frames']} fotogramas ({summary['time']:.1f} s de juego) repetidos en {time.perf_counter() - started:.3f} s")
+    print(f"semilla {summary['seed']}: {summary['spawn']} apariciones, {summary['shot']} disparos, {summary['hit']} impactos")
+    for result in level_results:
+        print(f"Nivel {result['level']}: precisión {result['accuracy']:.1f}% ({result['hits']}/{result['shots']}), "
+              f"{'superado' if result['passed'] else 'no superado'}")
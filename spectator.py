@@ -0,0 +1,127 @@
+# --- Espectador de la Transmisión ---
+# Cliente de referencia de telemetry.py: se conecta al juego (TELEMETRY=1), rearma la escena a partir de
+# las diferencias que llegan en cada mensaje (SpectatorScene) y muestra una vez por segundo los objetivos
+# vivos, los contadores de la partida, los eventos y cuánto se está recibiendo. Con --view dibuja además
+# una vista de frente en la terminal (X de izquierda a derecha, Y de abajo hacia arriba).
+# Sirve de punto de partida para un tablero: SpectatorScene.positions() da las posiciones en unidades
+# de la escena, igual que las del enjambre del motor (con la precisión de telemetry.QUANTUM).
+#
+# Uso: python spectator.py [--port 47820] [--view] [--seconds 30]
+import argparse
+import asyncio
+import sys
+import time
+
+import numpy as np
+
+from telemetry import DEFAULT_HOST, DEFAULT_PORT, read_message
+
+VIEW_SIZE = (72, 18) # Columnas y filas de la vista de frente.
+VIEW_BOUNDS = (-24, 24, 0, 10) # X e Y de la escena que abarca la vista.
+
+
+class SpectatorScene: # Objetivos vivos según la transmisión: id -> [x, y, z] cuantizados, y su tamaño.
+    def __init__(self, quantum):
+        self.quantum = quantum
+        self.targets = {}
+        self.sizes = {}
+        self.state = {} # Cabecera del último mensaje: tick, reloj, nivel, activo, aciertos, disparos, puntos.
+        self.frames = 0
+
+    def apply(self, frame):
+        for target_id in frame['removed'].tolist():
+            self.targets.pop(target_id, None)
+            self.sizes.pop(target_id, None)
+        for target_id, position, size in frame['absolute'].tolist():
+            self.targets[target_id] = list(position)
+            self.sizes[target_id] = size
+        for target_id, (dx, dy, dz) in frame['moved'].tolist():
+            position = self.targets[target_id]
+            position[0] += dx
+            position[1] += dy
+            position[2] += dz
+        self.state = {key: frame[key] for key in ('tick', 'time', 'level', 'active', 'hits', 'shots', 'points')}
+        self.frames += 1
+
+    def positions(self): # Arreglo (n, 3) en unidades de la escena.
+        if not self.targets:
+            return np.zeros((0, 3))
+        return np.array(list(self.targets.values()), dtype=float) / self.quantum
+
+
+def front_view(positions, size=VIEW_SIZE, bounds=VIEW_BOUNDS): # Vista de frente en texto.
+    columns, rows = size
+    left, right, bottom, top = bounds
+    grid = [[' '] * columns for _ in range(rows)]
+    for x, y, _ in positions.tolist():
+        column = int((x - left) / (right - left) * (columns - 1))
+        row = rows - 1 - int((y - bottom) / (top - bottom) * (rows - 1))
+        if 0 <= column < columns and 0 <= row < rows:
+            grid[row][column] = 'O'
+    border = '+' + '-' * columns + '+'
+    return '\n'.join([border, *('|' + ''.join(line) + '|' for line in grid), border])
+
+
+async def watch(host, port, view=False, seconds=None):
+    reader, writer = await asyncio.open_connection(host, port)
+    kind, hello = await read_message(reader)
+    scene = SpectatorScene(hello['quantum'])
+    started = last_report = time.perf_counter()
+    received, frames, events = 0, 0, []
+    try:
+        while True:
+            remaining = None if seconds is None else started + seconds - time.perf_counter()
+            if remaining is not None and remaining <= 0:
+                break
+            try: # Con --seconds también se corta aunque el juego no esté mandando nada (p. ej. en un menú).
+                kind, frame = await asyncio.wait_for(read_message(reader), remaining)
+            except asyncio.TimeoutError:
+                break
+            received += frame['size']
+            scene.apply(frame)
+            frames += 1
+            events += frame['events']
+            now = time.perf_counter()
+            if now - last_report >= 1:
+                elapsed = now - last_report
+                state = scene.state
+                if view:
+                    print(front_view(scene.positions()))
+                print(f"nivel {state['level']} {'en juego' if state['active'] else 'detenido'}  tick {state['tick']}  "
+                      f"objetivos {len(scene.targets)}  aciertos {state['hits']}/{state['shots']}  puntos {state['points']}  | "
+                      f"{frames / elapsed:.0f} mensajes/s  {received / elapsed / 1024:.1f} KB/s")
+                for name, values in events:
+                    if name in ('level_start', 'level_end'):
+                        print(f'  {name} {values}')
+                counts = {}
+                for name, _ in events:
+                    counts[name] = counts.get(name, 0) + 1
+                if counts:
+                    print('  eventos:', ', '.join(f'{name} {count}' for name, count in sorted(counts.items())))
+                last_report, received, frames, events = now, 0, 0, []
+    except asyncio.IncompleteReadError:
+        print('el juego cerró la transmisión')
+    finally:
+        writer.close()
+    return scene
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Espectador de la transmisión en vivo de TiroAlBlanco.')
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--view', action='store_true', help='dibuja los objetivos en la terminal')
+    parser.add_argument('--seconds', type=float, help='se desconecta después de estos segundos')
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(watch(args.host, args.port, args.view, args.seconds))
+    except ConnectionRefusedError:
+        print(f'no hay una transmisión en {args.host}:{args.port} (¿se inició el juego con TELEMETRY=1?)')
+        return 1
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
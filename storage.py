@@ -0,0 +1,181 @@
+# --- Progreso y Puntajes Guardados ---
+# El nivel desbloqueado y los resultados de cada partida vivían solo en el motor y se perdían al cerrar la
+# ventana. ProfileStore los guarda en una base SQLite local (saves/profile.sqlite3):
+# - progress: datos del jugador, clave -> valor (p. ej. 'unlocked_level').
+# - results: una fila por nivel jugado (nivel, precisión, aciertos, disparos, puntos, duración, fecha, semilla).
+# - best: el mejor resultado de cada nivel (más precisión y, a igual precisión, más puntos). Se actualiza en
+#   la misma transacción que guarda las partidas, así que al arrancar load_summary() solo lee el progreso y
+#   esta tabla (una fila por nivel): el historial completo nunca se carga entero.
+# Las escrituras se encolan y un hilo aparte las guarda por tandas, cada tanda en una sola transacción (como
+# SessionWriter en session.py): terminar un nivel solo cuesta meter una tupla en una cola.
+# Las consultas del historial (leaderboard, history) recorren índices por nivel, no toda la tabla.
+#
+# Uso: python storage.py               progreso, mejores resultados y últimas partidas
+#      python storage.py --level 2     mejores partidas e historial de un nivel
+import argparse
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+
+SAVE_FOLDER = 'saves'
+SAVE_PATH = os.path.join(SAVE_FOLDER, 'profile.sqlite3')
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS progress (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    played_at REAL NOT NULL, -- time.time() al terminar el nivel
+    level INTEGER NOT NULL,
+    accuracy REAL NOT NULL,
+    hits INTEGER NOT NULL,
+    shots INTEGER NOT NULL,
+    points INTEGER NOT NULL,
+    duration REAL NOT NULL, -- segundos de juego (reloj del motor)
+    passed INTEGER NOT NULL,
+    seed INTEGER -- semilla de la sesión grabada en sessions/ (para repetir la partida)
+);
+CREATE INDEX IF NOT EXISTS results_ranking ON results (level, accuracy DESC, points DESC);
+CREATE INDEX IF NOT EXISTS results_history ON results (level, played_at DESC);
+CREATE INDEX IF NOT EXISTS results_recent ON results (played_at DESC);
+CREATE TABLE IF NOT EXISTS best (
+    level INTEGER PRIMARY KEY,
+    accuracy REAL NOT NULL,
+    points INTEGER NOT NULL,
+    hits INTEGER NOT NULL,
+    shots INTEGER NOT NULL,
+    played_at REAL NOT NULL,
+    plays INTEGER NOT NULL -- partidas jugadas del nivel
+);
+'''
+RESULT_COLUMNS = ('played_at', 'level', 'accuracy', 'hits', 'shots', 'points', 'duration', 'passed', 'seed')
+INSERT_RESULT = f"INSERT INTO results ({', '.join(RESULT_COLUMNS)}) VALUES ({', '.join('?' * len(RESULT_COLUMNS))})"
+UPDATE_BEST = '''
+INSERT INTO best (level, accuracy, points, hits, shots, played_at, plays) VALUES (:level, :accuracy, :points, :hits, :shots, :played_at, 1)
+ON CONFLICT (level) DO UPDATE SET
+    plays = plays + 1,
+    accuracy = CASE WHEN better THEN excluded.accuracy ELSE accuracy END,
+    points = CASE WHEN better THEN excluded.points ELSE points END,
+    hits = CASE WHEN better THEN excluded.hits ELSE hits END,
+    shots = CASE WHEN better THEN excluded.shots ELSE shots END,
+    played_at = CASE WHEN better THEN excluded.played_at ELSE played_at END
+'''.replace('better', '(excluded.accuracy > accuracy OR (excluded.accuracy = accuracy AND excluded.points > points))')
+SAVE_PROGRESS = 'INSERT INTO progress (key, value) VALUES (?, ?) ON CONFLICT (key) DO UPDATE SET value = MAX(value, excluded.value)'
+
+RESULT, PROGRESS = 1, 2 # Tipos de escritura encolada.
+
+
+def connect(path):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    connection = sqlite3.connect(path, timeout=10)
+    connection.row_factory = sqlite3.Row
+    # WAL: las consultas del hilo principal no esperan a que el hilo de escritura termine su transacción.
+    connection.execute('PRAGMA journal_mode=WAL')
+    connection.execute('PRAGMA synchronous=NORMAL')
+    return connection
+
+
+class ProfileStore:
+    def __init__(self, path=SAVE_PATH, flush_every=64): # 'flush_every': escrituras como máximo por transacción.
+        self.path = path
+        self.flush_every = flush_every
+        self.connection = connect(path) # Solo la usa el hilo principal (lecturas).
+        self.connection.executescript(SCHEMA)
+        self.queue = queue.SimpleQueue()
+        self.written = 0 # Escrituras ya guardadas en disco.
+        self.thread = threading.Thread(target=self._run, name='profile-writer', daemon=True)
+        self.thread.start()
+
+    # --- Lectura (hilo principal) ---
+    def load_summary(self): # Lo que necesitan los menús: {'unlocked_level': n, 'best': {nivel: fila}}.
+        progress = dict(self.connection.execute('SELECT key, value FROM progress').fetchall())
+        best = {row['level']: dict(row) for row in self.connection.execute('SELECT * FROM best')}
+        return {'unlocked_level': progress.get('unlocked_level', 1), 'best': best}
+
+    def leaderboard(self, level, limit=10): # Mejores partidas de un nivel (índice results_ranking).
+        return [dict(row) for row in self.connection.execute(
+            'SELECT * FROM results WHERE level = ? ORDER BY accuracy DESC, points DESC LIMIT ?', (level, limit))]
+
+    def history(self, level=None, limit=20, before=None): # Últimas partidas (de un nivel o de todos), por páginas con 'before'.
+        where, args = [], []
+        if level is not None:
+            where.append('level = ?')
+            args.append(level)
+        if before is not None: # 'played_at' de la última fila de la página anterior.
+            where.append('played_at < ?')
+            args.append(before)
+        sql = 'SELECT * FROM results' + (' WHERE ' + ' AND '.join(where) if where else '')
+        return [dict(row) for row in self.connection.execute(sql + ' ORDER BY played_at DESC LIMIT ?', (*args, limit))]
+
+    # --- Escritura (se llaman desde el hilo principal; nunca bloquean) ---
+    def record_result(self, result, seed=None): # 'result' es el diccionario del evento 'level_end' del motor.
+        row = {'played_at': time.time(), 'duration': result.get('duration', 0.0), 'seed': seed,
+               **{key: result[key] for key in ('level', 'accuracy', 'hits', 'shots', 'points')},
+               'passed': int(result['passed'])}
+        self.queue.put((RESULT, row))
+
+    def save_progress(self, key, value): # Solo sube: guardar un valor menor no borra el progreso.
+        self.queue.put((PROGRESS, (key, value)))
+
+    def _run(self):
+        connection = connect(self.path) # Una conexión propia: las de sqlite3 no se comparten entre hilos.
+        pending = []
+        while True:
+            item = self.queue.get()
+            if item is not None:
+                pending.append(item)
+            # Guarda cuando se juntaron bastantes escrituras o la cola quedó vacía (o al cerrar).
+            if pending and (item is None or len(pending) >= self.flush_every or self.queue.empty()):
+                results = [row for kind, row in pending if kind == RESULT]
+                with connection: # Una sola transacción por tanda.
+                    connection.executemany(INSERT_RESULT, [tuple(row[name] for name in RESULT_COLUMNS) for row in results])
+                    connection.executemany(UPDATE_BEST, results)
+                    connection.executemany(SAVE_PROGRESS, [values for kind, values in pending if kind == PROGRESS])
+                self.written += len(pending)
+                pending = []
+            if item is None:
+                connection.close()
+                return
+
+    def close(self): # Termina de guardar lo pendiente y cierra la base.
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join()
+        self.connection.close()
+
+
+def print_results(rows):
+    for row in rows:
+        print(f"  {time.strftime('%Y-%m-%d %H:%M', time.localtime(row['played_at']))}  nivel {row['level']}  "
+              f"precisión {row['accuracy']:5.1f}%  aciertos {row['hits']}/{row['shots']}  puntos {row['points']:>5}  "
+              f"{row['duration']:6.1f} s  {'superado' if row['passed'] else ''}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Progreso y resultados guardados de TiroAlBlanco.')
+    parser.add_argument('--path', default=SAVE_PATH)
+    parser.add_argument('--level', type=int, help='mejores partidas e historial de un nivel')
+    parser.add_argument('--limit', type=int, default=10)
+    args = parser.parse_args(argv)
+    if not os.path.exists(args.path):
+        print('no hay progreso guardado en', args.path)
+        return 1
+
+    store = ProfileStore(args.path)
+    summary = store.load_summary()
+    print(f"nivel desbloqueado: {summary['unlocked_level']}")
+    for level, best in sorted(summary['best'].items()):
+        print(f"  nivel {level}: récord {best['accuracy']:.1f}% ({best['points']} puntos) en {best['plays']} partidas")
+    if args.level is not None:
+        print(f'\nmejores partidas del nivel {args.level}:')
+        print_results(store.leaderboard(args.level, args.limit))
+    print('\núltimas partidas:')
+    print_results(store.history(args.level, args.limit))
+    store.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,92 @@
+# --- Enjambre de Objetivos ---
+# Guarda la posición, dirección y velocidad de todos los objetivos vivos en arreglos de NumPy
+# y los mueve a todos con una sola operación por fotograma, en lugar de que cada objetivo
+# se mueva en su propio update(). Así el costo en Python por fotograma casi no cambia
+# aunque haya cientos de ovnis en pantalla.
+import numpy as np
+
+BOUNDARY_X = 24 # Si la posición X absoluta de un objetivo supera este valor, salió de la pantalla.
+
+
+class TargetSwarm:
+    def __init__(self, capacity=16): # Capacidad inicial de los arreglos; se duplica cuando se llena.
+        self.positions = np.zeros((capacity, 3)) # Posición (x, y, z) de cada objetivo vivo.
+        self.previous = np.zeros((capacity, 3)) # Posición antes del último step(), para interpolar al dibujar.
+        self.directions = np.zeros((capacity, 3)) # Dirección de movimiento de cada objetivo.
+        self.speeds = np.zeros(capacity) # Velocidad de cada objetivo.
+        self.sizes = np.zeros(capacity) # Tamaño (lado del quad) de cada objetivo, usado para resolver disparos.
+        self.targets = [] # Objetivo que corresponde a cada fila de los arreglos.
+        self.index = {} # Fila que ocupa cada objetivo, para poder quitarlo sin recorrer la lista.
+
+    def __len__(self): # Número de objetivos vivos.
+        return len(self.targets)
+
+    def __contains__(self, target):
+        return target in self.index
+
+    def _grow(self): # Duplica la capacidad de los arreglos cuando ya no caben más objetivos.
+        capacity = len(self.speeds) * 2
+        for name in ('positions', 'previous', 'directions'):
+            grown = np.zeros((capacity, 3))
+            grown[:len(self)] = getattr(self, name)[:len(self)]
+            setattr(self, name, grown)
+        for name in ('speeds', 'sizes'):
+            grown = np.zeros(capacity)
+            grown[:len(self)] = getattr(self, name)[:len(self)]
+            setattr(self, name, grown)
+
+    def add(self, target, position, direction, speed, size=1.0): # Agrega un objetivo vivo al enjambre.
+        if len(self) == len(self.speeds):
+            self._grow()
+        row = len(self)
+        self.positions[row] = self.previous[row] = tuple(position)
+        self.directions[row] = tuple(direction)
+        self.speeds[row] = speed
+        self.sizes[row] = size
+        self.targets.append(target)
+        self.index[target] = row
+
+    def remove(self, target): # Quita un objetivo moviendo la última fila a su lugar (no hay que desplazar los arreglos).
+        row = self.index.pop(target, None)
+        if row is None:
+            return False
+        last = len(self) - 1
+        if row != last:
+            moved = self.targets[last]
+            self.positions[row] = self.positions[last]
+            self.previous[row] = self.previous[last]
+            self.directions[row] = self.directions[last]
+            self.speeds[row] = self.speeds[last]
+            self.sizes[row] = self.sizes[last]
+            self.targets[row] = moved
+            self.index[moved] = row
+        self.targets.pop()
+        return True
+
+    def clear(self): # Vacía el enjambre (los arreglos se conservan para reutilizarlos).
+        self.targets.clear()
+        self.index.clear()
+
+    def position_of(self, target): # Posición actual de un objetivo según el enjambre.
+        return self.positions[self.index[target]]
+
+    def step(self, dt): # Avanza todos los objetivos y devuelve los que salieron de la pantalla.
+        count = len(self)
+        if count == 0:
+            return []
+        positions = self.positions[:count]
+        self.previous[:count] = positions
+        positions += self.directions[:count] * (self.speeds[:count, None] * dt) # Mueve a todos en una sola operación.
+        outside = np.flatnonzero(np.abs(positions[:, 0]) > BOUNDARY_X) # Revisión de límites para todos a la vez.
+        return [self.targets[row] for row in outside]
+
+    def interpolated(self, alpha=1.0): # Posiciones entre el step() anterior (alpha=0) y el último (alpha=1).
+        count = len(self)
+        if alpha >= 1.0:
+            return self.positions[:count]
+        previous = self.previous[:count]
+        return previous + (self.positions[:count] - previous) * alpha
+
+    def sync(self, nodes, alpha=1.0): # Copia las posiciones a las entidades de la escena ('nodes': objetivo -> entidad).
+        for target, (x, y, z) in zip(self.targets, self.interpolated(alpha).tolist()):
+            nodes[target].setPos(x, y, z) # setPos de Panda3D evita el costo extra del setter 'position' de Ursina.
@@ -0,0 +1,299 @@
+# --- Transmisión en Vivo de la Partida ---
+# Publica lo que pasa en el motor (engine.py) por un socket local para que un tablero o un espectador
+# (spectator.py) corran al lado del juego en la misma máquina, sin leer las variables globales ni las
+# entidades de Ursina. TelemetryPublisher atiende a los clientes con asyncio en un hilo aparte:
+# - En el hilo del juego, después de cada tick (engine.step) solo se copian las posiciones del enjambre y
+#   los eventos del tick a una cola acotada: nada de codificar ni de tocar sockets en el fotograma.
+# - El hilo de asyncio codifica y envía. Cada cliente tiene su propia base: las posiciones van cuantizadas
+#   (1/QUANTUM unidades) y cada mensaje manda solo las diferencias con lo que ese cliente ya recibió
+#   (int16 por eje; los objetivos nuevos o que se movieron demasiado van con su posición absoluta).
+# - Un cliente lento nunca frena al juego: mientras su socket no se vacía, los ticks que le llegan se
+#   funden en uno (se saltea posiciones intermedias, los eventos se conservan hasta MAX_PENDING_EVENTS).
+#   Si el hilo de asyncio no da abasto, la cola del juego descarta los ticks más viejos.
+# Sin clientes conectados no se copia nada.
+#
+# Formato: mensajes con un prefijo de longitud (uint32) y un byte de tipo. Al conectarse, HELLO (MAGIC,
+# versión, QUANTUM); después un FRAME por tick enviado: cabecera (tick, reloj, nivel, contadores), eventos
+# (tipo de 1 byte + datos), ids quitados, objetivos con posición absoluta y objetivos con diferencia.
+#
+# Uso: TELEMETRY=1 python TiroAlBlanco.py           (puerto DEFAULT_PORT; TELEMETRY=<puerto> elige otro)
+#      python spectator.py                           en otra terminal
+import asyncio
+import collections
+import math
+import struct
+import threading
+
+import numpy as np
+
+DEFAULT_HOST = '127.0.0.1' # Solo la propia máquina.
+DEFAULT_PORT = 47820
+MAGIC = b'TABT'
+VERSION = 1
+QUANTUM = 1024 # Pasos por unidad de la escena (posiciones con precisión de ~1 mm).
+MAX_QUEUED_TICKS = 256 # Ticks copiados que esperan al hilo de asyncio.
+MAX_PENDING_EVENTS = 4096 # Eventos por cliente que esperan a que su socket se vacíe.
+WRITE_BUFFER_LIMIT = 256 * 1024 # Bytes en el búfer de un cliente antes de dejar de escribirle (y fundir ticks).
+
+LENGTH = struct.Struct('<I')
+HELLO, FRAME = 1, 2
+HELLO_HEADER = struct.Struct('<B4sHI') # tipo, MAGIC, versión, QUANTUM
+# tipo, tick, reloj del motor, nivel, activo, aciertos, disparos, puntos, y cuántos eventos, quitados, absolutos y diferencias.
+FRAME_HEADER = struct.Struct('<BIdBBIIIHHHH')
+
+# Eventos del motor y sus datos.
+SPAWN, LEAVE, SHOT, HIT, LEVEL_START, LEVEL_END = 1, 2, 3, 4, 5, 6
+EVENTS = {
+    SPAWN: struct.Struct('<I'), # id (la posición va entre los absolutos del mismo mensaje)
+    LEAVE: struct.Struct('<I'), # id
+    SHOT: struct.Struct('<6fB'), # origen y dirección (NaN si el disparo no trae rayo), objetivos alcanzados
+    HIT: struct.Struct('<I3f'), # id y punto del impacto
+    LEVEL_START: struct.Struct('<B'), # nivel
+    LEVEL_END: struct.Struct('<BfIIIBf'), # nivel, precisión, aciertos, disparos, puntos, superado, duración
+}
+EVENT_NAMES = {SPAWN: 'spawn', LEAVE: 'leave', SHOT: 'shot', HIT: 'hit', LEVEL_START: 'level_start', LEVEL_END: 'level_end'}
+
+REMOVED = np.dtype('<u4')
+ABSOLUTE = np.dtype([('id', '<u4'), ('position', '<i4', 3), ('size', '<f4')])
+MOVED = np.dtype([('id', '<u4'), ('delta', '<i2', 3)])
+DELTA_LIMIT = np.iinfo(np.int16).max
+NAN3 = (math.nan,) * 3
+
+
+def engine_event(event, args): # Evento del motor -> (tipo, datos), o None si no se transmite.
+    if event == 'spawn':
+        return SPAWN, (args[0].id,)
+    if event == 'leave':
+        return LEAVE, (args[0].id,)
+    if event == 'shot':
+        origin, direction, hits = args
+        return SHOT, (*(origin or NAN3), *(direction or NAN3), len(hits))
+    if event == 'hit':
+        return HIT, (args[0].id, *args[1])
+    if event == 'level_start':
+        return LEVEL_START, (args[0],)
+    if event == 'level_end':
+        result = args[0]
+        return LEVEL_END, (result['level'], result['accuracy'], result['hits'], result['shots'], result['points'],
+                           result['passed'], result.get('duration', 0.0))
+    return None
+
+
+class Snapshot: # Estado del motor después de un tick, ya cuantizado y ordenado por id (lo arma el hilo de asyncio).
+    def __init__(self, targets, positions, sizes):
+        ids = np.fromiter((target.id for target in targets), REMOVED, len(targets))
+        order = np.argsort(ids)
+        self.ids = ids[order]
+        self.positions = np.round(positions[order] * QUANTUM).astype(np.int32)
+        self.sizes = sizes[order].astype(np.float32)
+
+
+EMPTY = Snapshot([], np.zeros((0, 3)), np.zeros(0))
+
+
+def encode_frame(header, events, snapshot, base): # Mensaje FRAME con las diferencias entre 'base' y 'snapshot'.
+    ids, positions = snapshot.ids, snapshot.positions
+    rows = np.searchsorted(base.ids, ids)
+    rows[rows == len(base.ids)] = 0
+    known = base.ids[rows] == ids if len(base.ids) else np.zeros(len(ids), bool)
+    delta = positions[known] - base.positions[rows[known]]
+    fits = (np.abs(delta) <= DELTA_LIMIT).all(axis=1)
+    moving = fits & delta.any(axis=1) # Los que no se movieron no se mandan.
+    absolute = ~known
+    absolute[np.flatnonzero(known)[~fits]] = True # Se movieron más de lo que entra en un int16.
+    removed = np.setdiff1d(base.ids, ids, assume_unique=True).astype(REMOVED)
+
+    absolute_rows = np.zeros(int(absolute.sum()), ABSOLUTE)
+    absolute_rows['id'] = ids[absolute]
+    absolute_rows['position'] = positions[absolute]
+    absolute_rows['size'] = snapshot.sizes[absolute]
+    moved_rows = np.zeros(int(moving.sum()), MOVED)
+    moved_rows['id'] = ids[known][moving]
+    moved_rows['delta'] = delta[moving]
+
+    parts = [FRAME_HEADER.pack(FRAME, *header, len(events), len(removed), len(absolute_rows), len(moved_rows))]
+    parts += [bytes((kind,)) + EVENTS[kind].pack(*values) for kind, values in events]
+    parts += [removed.tobytes(), absolute_rows.tobytes(), moved_rows.tobytes()]
+    payload = b''.join(parts)
+    return LENGTH.pack(len(payload)) + payload
+
+
+def decode(payload): # Un mensaje (sin el prefijo de longitud) -> ('hello', datos) o ('frame', datos).
+    if payload[0] == HELLO:
+        _, magic, version, quantum = HELLO_HEADER.unpack(payload)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError('la transmisión no es de una versión compatible')
+        return 'hello', {'quantum': quantum}
+    (_, tick, time, level, active, hits, shots, points,
+     n_events, n_removed, n_absolute, n_moved) = FRAME_HEADER.unpack_from(payload)
+    offset = FRAME_HEADER.size
+    events = []
+    for _ in range(n_events):
+        kind = payload[offset]
+        record = EVENTS[kind]
+        events.append((EVENT_NAMES[kind], record.unpack_from(payload, offset + 1)))
+        offset += 1 + record.size
+    sections = []
+    for dtype, count in ((REMOVED, n_removed), (ABSOLUTE, n_absolute), (MOVED, n_moved)):
+        sections.append(np.frombuffer(payload, dtype, count, offset))
+        offset += dtype.itemsize * count
+    removed, absolute, moved = sections
+    return 'frame', {'tick': tick, 'time': time, 'level': level, 'active': bool(active), 'hits': hits,
+                     'shots': shots, 'points': points, 'events': events,
+                     'removed': removed, 'absolute': absolute, 'moved': moved, 'size': LENGTH.size + len(payload)}
+
+
+async def read_message(reader): # Siguiente mensaje de la transmisión (para los clientes).
+    length, = LENGTH.unpack(await reader.readexactly(LENGTH.size))
+    return decode(await reader.readexactly(length))
+
+
+class Client: # Un espectador conectado: lo pendiente de enviarle y lo último que recibió.
+    def __init__(self, writer):
+        self.writer = writer
+        self.base = EMPTY # Estado que el cliente ya tiene (contra el que se calculan las diferencias).
+        self.header = None # Cabecera del último tick pendiente (None: nada que enviar).
+        self.snapshot = EMPTY
+        self.events = collections.deque(maxlen=MAX_PENDING_EVENTS)
+        self.ready = asyncio.Event()
+        self.merged = 0 # Ticks fundidos con el siguiente porque el cliente no daba abasto.
+        self.dropped_events = 0
+        self.sent_bytes = 0
+
+
+class TelemetryPublisher:
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.host = host
+        self.port = port # Con 0 el sistema elige uno libre; después de start() queda el puerto real.
+        self.clients = set()
+        # Ticks copiados por el hilo del juego. Solo el hilo de asyncio los saca (popleft); si se llena, el
+        # append del hilo del juego descarta solo el más viejo, sin que los dos hilos compitan por sacarlo.
+        self.outbox = collections.deque(maxlen=MAX_QUEUED_TICKS)
+        self.events = [] # Eventos del motor desde el último tick.
+        self.ticks = 0
+        self.dropped_ticks = 0 # Ticks descartados porque el hilo de asyncio no los alcanzó a leer.
+        self.loop = None
+        self.server = None
+        self._wakeup = False # Ya hay un aviso pendiente al hilo de asyncio.
+        self._empty = True # El último tick copiado no tenía objetivos (los ticks vacíos seguidos no se copian).
+        self.thread = threading.Thread(target=self._run, name='telemetry', daemon=True)
+        self._started = threading.Event()
+
+    def start(self): # Abre el socket y empieza a aceptar espectadores.
+        self.thread.start()
+        self._started.wait()
+        if self.server is None:
+            raise OSError(f'no se pudo abrir el puerto de telemetría {self.host}:{self.port}')
+        return self
+
+    # --- Hilo del juego ---
+    def attach(self, engine): # Escucha los eventos del motor y copia su estado después de cada tick.
+        self.engine = engine
+        engine.on(self._on_event)
+        step = engine.step
+
+        def wrapper(dt): # Como SessionRecorder._wrap (session.py), pero después de avanzar el motor.
+            result = step(dt)
+            self.capture()
+            return result
+        engine.step = wrapper
+
+    def _on_event(self, event, *args):
+        if self.clients:
+            record = engine_event(event, args)
+            if record is not None:
+                self.events.append(record)
+
+    def capture(self): # Copia el estado del motor a la cola del hilo de asyncio. Nunca bloquea.
+        if not self.clients:
+            self.events.clear()
+            return
+        engine = self.engine
+        swarm = engine.swarm
+        count = len(swarm)
+        self.ticks += 1
+        if not count and self._empty and not self.events:
+            return # Nada cambió desde el último tick copiado.
+        self._empty = not count
+        if len(self.outbox) == MAX_QUEUED_TICKS: # El append de abajo descarta el tick más viejo.
+            self.dropped_ticks += 1
+        header = (self.ticks, engine.time, engine.current_level, engine.active, engine.hits, engine.shots_fired, engine.points)
+        self.outbox.append((header, self.events, list(swarm.targets), swarm.positions[:count].copy(), swarm.sizes[:count].copy()))
+        self.events = []
+        if not self._wakeup:
+            self._wakeup = True
+            self.loop.call_soon_threadsafe(self._pump)
+
+    # --- Hilo de asyncio ---
+    def _run(self):
+        self.loop = asyncio.new_event_loop()
+        try:
+            self.server = self.loop.run_until_complete(asyncio.start_server(self._serve, self.host, self.port))
+            self.port = self.server.sockets[0].getsockname()[1]
+        except OSError:
+            self._started.set()
+            return
+        self._started.set()
+        self.loop.run_forever() # Hasta close() (_shutdown).
+        self.loop.close()
+
+    def _pump(self): # Reparte los ticks copiados entre los clientes.
+        self._wakeup = False
+        while self.outbox:
+            header, events, targets, positions, sizes = self.outbox.popleft()
+            snapshot = Snapshot(targets, positions, sizes)
+            for client in self.clients:
+                if client.header is not None:
+                    client.merged += 1 # El tick anterior todavía no salió: este lo reemplaza.
+                overflow = len(client.events) + len(events) - MAX_PENDING_EVENTS
+                if overflow > 0:
+                    client.dropped_events += overflow
+                client.events.extend(events)
+                client.header, client.snapshot = header, snapshot
+                client.ready.set()
+
+    async def _serve(self, reader, writer):
+        client = Client(writer)
+        writer.transport.set_write_buffer_limits(WRITE_BUFFER_LIMIT)
+        writer.write(LENGTH.pack(HELLO_HEADER.size) + HELLO_HEADER.pack(HELLO, MAGIC, VERSION, QUANTUM))
+        self.clients.add(client)
+        sender = asyncio.ensure_future(self._send(client))
+        closed = asyncio.ensure_future(reader.read()) # Los clientes no mandan nada: termina cuando se desconectan.
+        try:
+            await asyncio.wait((sender, closed), return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            self.clients.discard(client)
+            sender.cancel()
+            closed.cancel()
+            writer.close()
+
+    async def _send(self, client):
+        writer = client.writer
+        try:
+            while True:
+                await client.ready.wait()
+                client.ready.clear()
+                events = list(client.events)
+                client.events.clear()
+                message = encode_frame(client.header, events, client.snapshot, client.base)
+                client.base, client.header = client.snapshot, None
+                writer.write(message)
+                client.sent_bytes += len(message)
+                await writer.drain() # Mientras el socket está lleno, los ticks nuevos se funden en client.header.
+        except ConnectionError:
+            pass
+
+    async def _shutdown(self):
+        self.server.close()
+        for client in list(self.clients):
+            client.writer.close()
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.loop.stop()
+
+    def close(self): # Desconecta a los espectadores y cierra el socket.
+        if self.server is not None and self.thread.is_alive():
+            asyncio.run_coroutine_threadsafe(self._shutdown(), self.loop)
+            self.thread.join()
@@ -0,0 +1,25 @@
+# Pruebas del motor sin ventana: python -m pytest
+from config import END_DELAY, SPAWN_DELAY, STRESS_LEVEL_CONFIG
+from engine import GameEngine, first_target_shooter, run_level
+
+
+def test_level_ends_after_last_target_despite_time_limit():
+    config = {1: {'targets': 3, 'concurrent': 3, 'speed': (10, 15), 'accuracy_goal': 0, 'weapon': 'rifle', 'time_limit': 60}}
+    engine = GameEngine(config, seed=1)
+    last = []
+    engine.on(lambda event, *args: last.append(engine.time) if event in ('hit', 'leave') else None)
+    result = run_level(engine, 1, first_target_shooter, dt=1 / 120)
+    assert result['duration'] < 60
+    # La próxima revisión de apariciones (como mucho SPAWN_DELAY después) ve que no quedan y termina END_DELAY más tarde.
+    assert last[-1] + END_DELAY <= engine.time <= last[-1] + SPAWN_DELAY + END_DELAY + 1 / 120 + 1e-9
+
+
+def test_time_limit_still_ends_level():
+    config = {1: {'targets': 1000, 'concurrent': 1, 'speed': (0.01, 0.01), 'accuracy_goal': 0, 'weapon': 'rifle', 'time_limit': 5}}
+    result = run_level(GameEngine(config, seed=1), 1, dt=1 / 120)
+    assert abs(result['duration'] - 5) <= 1 / 120 + 1e-9
+
+
+def test_stress_level_ends_when_targets_run_out():
+    result = run_level(GameEngine(STRESS_LEVEL_CONFIG, seed=1), 1, first_target_shooter, dt=1 / 60)
+    assert result['duration'] < STRESS_LEVEL_CONFIG[1]['time_limit']
@@ -0,0 +1,76 @@
+# Pruebas de la resolución de disparos (hitscan.py) sin ventana: python -m pytest
+import math
+import random
+
+import numpy as np
+
+from config import WEAPONS
+from hitscan import BroadPhaseGrid, intersect_billboards, pellet_directions, resolve_shot
+
+
+def angle_between(a, b): # Grados entre dos vectores.
+    cosine = np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b))
+    return math.degrees(math.acos(min(1.0, max(-1.0, cosine))))
+
+
+def test_billboard_hit_and_miss():
+    centers = np.array([(0.0, 0.0, 10.0)])
+    sizes = np.array([2.0])
+    hit = intersect_billboards((0, 0, 0), [(0, 0, 1)], centers, sizes)
+    assert hit.shape == (1, 1)
+    assert hit[0, 0] == 10.0
+    assert np.isinf(intersect_billboards((0, 0, 0), [(0.5, 0, 1)], centers, sizes)[0, 0]) # Pasa a 5 unidades del centro.
+    assert np.isinf(intersect_billboards((0, 0, 0), [(0, 0, -1)], centers, sizes)[0, 0]) # Está detrás del origen.
+
+
+def test_billboard_edges():
+    # Con el origen sobre la normal del quad, el rayo (x, y, 10) cruza el plano a (x, y) del centro: el borde es 1.
+    centers = np.array([(0.0, 0.0, 10.0)])
+    sizes = np.array([2.0])
+    for inside, outside in (((0.999, 0, 10), (1.001, 0, 10)), ((0, -0.999, 10), (0, -1.001, 10)),
+                            ((0.999, 0.999, 10), (1.001, 0.999, 10))):
+        assert np.isfinite(intersect_billboards((0, 0, 0), [inside], centers, sizes)[0, 0])
+        assert np.isinf(intersect_billboards((0, 0, 0), [outside], centers, sizes)[0, 0])
+
+
+def test_pellet_count_and_spread():
+    forward = np.array((0.2, -0.1, 1.0))
+    shotgun = WEAPONS['shotgun']
+    directions = pellet_directions(forward, shotgun['pellets'], shotgun['spread'], random.Random(3))
+    assert len(directions) == shotgun['pellets']
+    assert angle_between(directions[0], forward) < 1e-6 # El primero sale recto.
+    for direction in directions:
+        assert abs(np.linalg.norm(direction) - 1) < 1e-9
+        assert angle_between(direction, forward) <= shotgun['spread'] + 1e-6
+    again = pellet_directions(forward, shotgun['pellets'], shotgun['spread'], random.Random(3))
+    assert np.array_equal(np.array(directions), np.array(again)) # Mismo rng, mismo reparto.
+    assert len(pellet_directions(forward, 1, 4.0)) == 1
+    assert len(pellet_directions((0, 1, 0), 8, 4.0, random.Random(1))) == 8 # Recto hacia arriba.
+
+
+def test_resolve_shot_nearest_target_once():
+    targets = ['lejos', 'cerca']
+    centers = [(0.0, 0.0, 20.0), (0.0, 0.0, 10.0)]
+    hits = resolve_shot(targets, centers, [2.0, 2.0], (0, 0, 0), (0, 0, 1), {'pellets': 8, 'spread': 0.5}, time=1.5, rng=random.Random(2))
+    assert [hit.target for hit in hits] == ['cerca'] # Los ocho perdigones dan en el mismo: un solo impacto.
+    assert hits[0].distance == 10.0 and hits[0].time == 1.5 and hits[0].pellet == 0
+
+
+def test_grid_matches_brute_force():
+    rng = np.random.default_rng(7)
+    count = 400
+    centers = np.column_stack((rng.uniform(-20, 20, count), rng.uniform(0, 10, count), rng.uniform(5, 60, count)))
+    sizes = rng.uniform(1, 3, count)
+    targets = list(range(count))
+    grid = BroadPhaseGrid().build(centers, sizes)
+    origin = (0.0, 2.0, -5.0)
+    hits = 0
+    for shot in range(200):
+        forward = np.array((rng.uniform(-0.5, 0.5), rng.uniform(-0.1, 0.2), 1.0))
+        for weapon in (WEAPONS['rifle'], WEAPONS['shotgun']):
+            brute = resolve_shot(targets, centers, sizes, origin, forward, weapon, rng=random.Random(shot))
+            fast = resolve_shot(targets, centers, sizes, origin, forward, weapon, rng=random.Random(shot), grid=grid)
+            assert [(hit.target, hit.pellet) for hit in fast] == [(hit.target, hit.pellet) for hit in brute]
+            assert np.allclose([hit.distance for hit in fast], [hit.distance for hit in brute])
+            hits += len(brute)
+    assert hits > 50 # La escena de prueba tiene que producir impactos para que la comparación sirva.
@@ -0,0 +1,52 @@
+# Pruebas del planificador (scheduler.py): python -m pytest
+from scheduler import Scheduler
+
+
+def test_keyed_event_is_unique_until_cancelled_or_fired():
+    scheduler = Scheduler()
+    fired = []
+    end = scheduler.at(5, fired.append, 'end@5', key='end')
+    assert scheduler.at(2, fired.append, 'end@2', key='end') is end # Ya hay uno pendiente: se devuelve ese.
+    assert scheduler.pending('end') and len(scheduler) == 1
+
+    scheduler.cancel(end) # Al cancelarlo, la clave queda libre para programarlo de nuevo en otro momento.
+    assert not scheduler.pending('end')
+    again = scheduler.at(3, fired.append, 'end@3', key='end')
+    assert again is not end and scheduler.pending('end') and len(scheduler) == 1
+
+    scheduler.tick(10)
+    assert fired == ['end@3'] # El cancelado nunca se ejecuta.
+    assert not scheduler.pending('end')
+    assert scheduler.after(1, fired.append, 'end@11', key='end') is not again # Ya se ejecutó: se puede volver a programar.
+    scheduler.advance(1)
+    assert fired == ['end@3', 'end@11']
+
+
+def test_cancelling_a_stale_event_keeps_the_new_key():
+    scheduler = Scheduler()
+    fired = []
+    old = scheduler.at(1, fired.append, 'old', key='end')
+    scheduler.cancel(old)
+    new = scheduler.at(2, fired.append, 'new', key='end')
+    scheduler.cancel(old) # Cancelar otra vez el viejo no suelta la clave del nuevo.
+    assert scheduler.keys['end'] is new
+    scheduler.tick(2)
+    assert fired == ['new']
+
+
+def test_firing_order():
+    scheduler = Scheduler()
+    fired = []
+    scheduler.at(2, fired.append, 'b')
+    scheduler.at(1, fired.append, 'a')
+    scheduler.at(2, fired.append, 'c') # A igual momento, en el orden en que se programaron.
+    scheduler.at(2, lambda: scheduler.after(0, fired.append, 'd')) # Programado desde otro evento para el mismo tick.
+    scheduler.at(3, fired.append, 'e', key='end')
+    scheduler.tick(1.5)
+    assert fired == ['a']
+    scheduler.tick(2)
+    assert fired == ['a', 'b', 'c', 'd']
+    assert scheduler.now == 2 and scheduler.pending('end')
+    scheduler.cancel_all()
+    scheduler.tick(5)
+    assert fired == ['a', 'b', 'c', 'd'] and not scheduler.pending('end') and len(scheduler) == 0
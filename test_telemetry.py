@@ -0,0 +1,65 @@
+# Pruebas del formato de la transmisión (telemetry.py) sin sockets: python -m pytest
+from collections import namedtuple
+
+import numpy as np
+
+from spectator import SpectatorScene
+from telemetry import DELTA_LIMIT, EMPTY, HIT, LENGTH, QUANTUM, SPAWN, Snapshot, decode, encode_frame
+
+Target = namedtuple('Target', 'id')
+
+
+def snapshot(positions): # {id: posición en cuantos} -> Snapshot (tamaño = id, para reconocerlos).
+    ids = sorted(positions)
+    quantized = np.array([positions[target_id] for target_id in ids], dtype=float).reshape(-1, 3)
+    return Snapshot([Target(target_id) for target_id in ids], quantized / QUANTUM, np.array(ids, dtype=float))
+
+
+def round_trip(scene, header, events, current, base):
+    message = encode_frame(header, events, current, base)
+    length, = LENGTH.unpack_from(message)
+    assert length == len(message) - LENGTH.size
+    kind, frame = decode(message[LENGTH.size:])
+    assert kind == 'frame'
+    scene.apply(frame)
+    return frame
+
+
+def scene_state(scene):
+    return {target_id: tuple(position) for target_id, position in scene.targets.items()}
+
+
+def test_frame_round_trip_with_deltas_adds_and_removes():
+    scene = SpectatorScene(QUANTUM)
+    first = snapshot({1: (0, 0, 0), 2: (100, 200, 300), 3: (-5, 7, 9), 4: (1, 1, 1), 5: (DELTA_LIMIT, -DELTA_LIMIT, 0)})
+    frame = round_trip(scene, (1, 0.5, 1, 1, 0, 0, 0), [(SPAWN, (1,)), (HIT, (2, 1.0, 2.0, 3.0))], first, EMPTY)
+    assert len(frame['absolute']) == 5 and len(frame['moved']) == 0 and len(frame['removed']) == 0
+    assert frame['events'] == [('spawn', (1,)), ('hit', (2, 1.0, 2.0, 3.0))]
+    assert scene_state(scene) == {1: (0, 0, 0), 2: (100, 200, 300), 3: (-5, 7, 9), 4: (1, 1, 1), 5: (DELTA_LIMIT, -DELTA_LIMIT, 0)}
+    assert scene.sizes == {1: 1.0, 2: 2.0, 3: 3.0, 4: 4.0, 5: 5.0}
+
+    second = snapshot({
+        1: (DELTA_LIMIT, -DELTA_LIMIT, 1), # Justo en el límite del int16: va como diferencia.
+        2: (100 + DELTA_LIMIT + 1, 200, 300), # Se pasa por uno: va con su posición absoluta.
+        4: (1, 1, 1), # Quieto: no se manda.
+        5: (0, 0, 0), # Vuelve desde el límite.
+        6: (-DELTA_LIMIT * 3, 12, 40), # Nuevo.
+    }) # El 3 se fue.
+    frame = round_trip(scene, (2, 0.6, 1, 1, 1, 1, 100), [], second, first)
+    assert frame['removed'].tolist() == [3]
+    assert sorted(frame['absolute']['id'].tolist()) == [2, 6]
+    assert sorted(frame['moved']['id'].tolist()) == [1, 5]
+    assert (frame['tick'], frame['hits'], frame['points']) == (2, 1, 100)
+    expected = {target_id: tuple(position) for target_id, position in zip(second.ids.tolist(), second.positions.tolist())}
+    assert scene_state(scene) == expected
+    assert np.allclose(sorted(map(tuple, scene.positions().tolist())), sorted(map(tuple, second.positions / QUANTUM)))
+
+    empty = round_trip(scene, (3, 0.7, 1, 0, 1, 1, 100), [], EMPTY, second) # Fin del nivel: se van todos.
+    assert sorted(empty['removed'].tolist()) == [1, 2, 4, 5, 6]
+    assert scene.targets == {}
+
+
+def test_unchanged_frame_sends_no_positions():
+    state = snapshot({7: (3, 4, 5), 8: (-1, -2, -3)})
+    frame = decode(encode_frame((5, 1.0, 2, 1, 0, 0, 0), [], state, state)[LENGTH.size:])[1]
+    assert len(frame['removed']) == len(frame['absolute']) == len(frame['moved']) == 0
@@ -0,0 +1,37 @@
+# Pruebas del reloj de paso fijo (timestep.py) con dt fijos: python -m pytest
+import pytest
+
+from config import SIM_MAX_TICKS, SIM_TICK_RATE
+from timestep import FixedTimestep
+
+
+def test_ticks_per_frame():
+    clock = FixedTimestep(120, SIM_MAX_TICKS)
+    assert [clock.advance(1 / 60) for _ in range(600)] == [2] * 600 # 1/60 s son exactamente 2 ticks, sin desfasarse.
+    clock = FixedTimestep(120, SIM_MAX_TICKS)
+    assert [clock.advance(1 / 240) for _ in range(6)] == [0, 1, 0, 1, 0, 1] # Fotogramas más rápidos que el tick.
+    clock = FixedTimestep(120, SIM_MAX_TICKS)
+    assert [clock.advance(1 / 90) for _ in range(3)] == [1, 1, 2] # 4 ticks en 3 fotogramas de 1/90 s.
+    assert clock.ticks == 4 and clock.accumulator == pytest.approx(0)
+
+
+def test_max_ticks_clamp_drops_the_rest():
+    clock = FixedTimestep(SIM_TICK_RATE, SIM_MAX_TICKS)
+    assert clock.advance(0.5) == SIM_MAX_TICKS # Una traba de medio segundo no encadena 60 ticks.
+    assert clock.dropped == pytest.approx(0.5 - SIM_MAX_TICKS / SIM_TICK_RATE)
+    assert clock.accumulator == pytest.approx(0) # El tiempo descartado no vuelve en el fotograma siguiente.
+    assert clock.advance(1 / SIM_TICK_RATE) == 1
+    assert clock.ticks == SIM_MAX_TICKS + 1
+
+
+def test_alpha():
+    clock = FixedTimestep(100, SIM_MAX_TICKS)
+    assert clock.alpha == 0
+    clock.advance(0.0025)
+    assert clock.alpha == pytest.approx(0.25) # Un cuarto del camino hacia el próximo tick.
+    clock.advance(0.01)
+    assert clock.alpha == pytest.approx(0.25) # Tras un tick completo queda la misma fracción.
+    clock.advance(0.005)
+    assert clock.alpha == pytest.approx(0.75)
+    clock.reset()
+    assert clock.alpha == 0 and clock.advance(0.005) == 0
@@ -0,0 +1,189 @@
+# --- Caché de Texturas Preprocesadas ---
+# Paso de construcción que convierte cada textura de assets/textures en una versión lista para la GPU:
+# reducida al tamaño que realmente ocupa en pantalla (potencia de dos), con todos sus mipmaps ya
+# generados y comprimida (DXT1 sin transparencia, DXT5 con transparencia), guardada como .txo de Panda3D.
+# Los archivos se nombran por el hash de su contenido, así que solo se reconstruye lo que cambió.
+# En el juego, resolve() devuelve la versión de la caché si está al día, o la original si no, y
+# content_aliases() agrupa las texturas con los mismos bytes para que se carguen una sola vez.
+#
+# Uso: python texture_cache.py            (construye solo lo que cambió)
+#      python texture_cache.py --force    (reconstruye todo)
+#      python texture_cache.py --no-compress
+import fnmatch
+import hashlib
+import json
+import math
+import os
+import sys
+import time
+
+from config import TEXTURE_MAX_SIZE, DEFAULT_TEXTURE_MAX_SIZE
+
+SOURCE_FOLDER = 'assets/textures'
+CACHE_FOLDER = 'assets/cache/textures'
+MANIFEST_PATH = os.path.join(CACHE_FOLDER, 'manifest.json')
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+FORMAT_VERSION = 2 # Cambiarlo obliga a reconstruir todo si cambia la forma de procesar las texturas.
+
+
+def file_hash(path): # Hash del contenido del archivo (sha256).
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def max_size_for(path): # Tamaño máximo (en píxeles, lado mayor) configurado para una textura.
+    for pattern, size in TEXTURE_MAX_SIZE.items():
+        if fnmatch.fnmatch(path, pattern):
+            return size
+    return DEFAULT_TEXTURE_MAX_SIZE
+
+
+def _power_of_two_below(value): # Mayor potencia de dos que no supera 'value'.
+    power = 1
+    while power * 2 <= value:
+        power *= 2
+    return power
+
+
+def load_manifest(path=MANIFEST_PATH):
+    try:
+        with open(path, encoding='utf-8') as file:
+            manifest = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    return manifest if manifest.get('version') == FORMAT_VERSION else {}
+
+
+# --- Construcción ---
+def build_texture(source, output, max_size, compress=True):
+    # Reduce, genera mipmaps, comprime y escribe un .txo. Devuelve el tamaño final (ancho, alto).
+    from PIL import Image
+    from panda3d.core import Filename, SamplerState, Texture
+
+    image = Image.open(source)
+    has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+    image = image.convert('RGBA' if has_alpha else 'RGB')
+    # Potencias de dos (Panda3D reescalaría en cada carga si no lo son): el lado mayor, sin pasar de 'max_size',
+    # y el menor, la potencia de dos más cercana a la misma proporción. 1920x1080 queda en 1024x512.
+    longest = min(_power_of_two_below(max(image.size)), _power_of_two_below(max_size))
+    shortest = 2 ** max(0, round(math.log2(longest * min(image.size) / max(image.size))))
+    width, height = (longest, shortest) if image.width >= image.height else (shortest, longest)
+    if (width, height) != image.size:
+        image = image.resize((width, height), Image.LANCZOS)
+
+    texture = Texture(os.path.basename(source))
+    texture.setup2dTexture(width, height, Texture.T_unsigned_byte, Texture.F_rgba8 if has_alpha else Texture.F_rgb8)
+    # Panda3D guarda las filas de abajo hacia arriba.
+    texture.setRamImageAs(image.transpose(Image.FLIP_TOP_BOTTOM).tobytes(), image.mode)
+    texture.setMinfilter(SamplerState.FT_linear_mipmap_linear)
+    texture.setMagfilter(SamplerState.FT_linear)
+    texture.generateRamMipmapImages() # Todos los niveles de mipmap quedan guardados en el archivo.
+    if compress:
+        mode = Texture.CM_dxt5 if has_alpha else Texture.CM_dxt1
+        if texture.compressRamImage(mode, Texture.QL_best, None):
+            texture.setCompression(mode)
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    if not texture.write(Filename.fromOsSpecific(output)):
+        raise IOError(f'No se pudo escribir {output}')
+    return width, height
+
+
+def build_all(source_folder=SOURCE_FOLDER, force=False, compress=True, log=print):
+    # Procesa todas las texturas de 'source_folder' y salta las que no cambiaron desde la última vez.
+    manifest = load_manifest()
+    entries = manifest.get('textures', {})
+    built = skipped = 0
+    for name in sorted(os.listdir(source_folder)):
+        if not name.lower().endswith(IMAGE_EXTENSIONS):
+            continue
+        source = f'{source_folder}/{name}'
+        stat = os.stat(source)
+        max_size = max_size_for(source)
+        entry = entries.get(source)
+        # Si el tamaño y la fecha no cambiaron, ni siquiera hace falta volver a calcular el hash.
+        if not force and entry and entry['mtime'] == stat.st_mtime and entry['bytes'] == stat.st_size \
+                and entry['max_size'] == max_size and os.path.exists(entry['output']):
+            skipped += 1
+            continue
+        digest = file_hash(source)
+        output = f'{CACHE_FOLDER}/{digest[:20]}_{max_size}.txo'
+        if force or not os.path.exists(output):
+            started = time.perf_counter()
+            width, height = build_texture(source, output, max_size, compress)
+            log(f'{source} -> {output} ({width}x{height}, {time.perf_counter() - started:.2f} s)')
+            built += 1
+        else:
+            width, height = entry['size'] if entry else (0, 0)
+            skipped += 1
+        entries[source] = {
+            'hash': digest, 'mtime': stat.st_mtime, 'bytes': stat.st_size,
+            'max_size': max_size, 'output': output, 'size': [width, height],
+        }
+    # Quita del manifiesto las texturas que ya no existen.
+    entries = {source: entry for source, entry in entries.items() if os.path.exists(source)}
+    os.makedirs(CACHE_FOLDER, exist_ok=True)
+    with open(MANIFEST_PATH, 'w', encoding='utf-8') as file:
+        json.dump({'version': FORMAT_VERSION, 'textures': entries}, file, indent=1, sort_keys=True)
+    log(f'{built} texturas construidas, {skipped} sin cambios.')
+    return built, skipped
+
+
+# --- Índice de Contenido ---
+def content_aliases(source_folder=SOURCE_FOLDER, manifest_path=MANIFEST_PATH, log=print):
+    # Agrupa los archivos idénticos byte a byte y devuelve ruta -> ruta canónica (la primera en orden
+    # alfabético) solo para los que tienen duplicados. Ej: los nueve botones iguales se resuelven a 'button_level1.jpg'.
+    # Solo usa los hashes del manifiesto que siguen al día: se llama al abrir el juego, antes del primer
+    # fotograma, y calcular ahí el hash de cada textura lo retrasaba. Las que no están en el manifiesto (o
+    # cambiaron desde la última construcción) se cargan por separado hasta correr 'python texture_cache.py'.
+    entries = load_manifest(manifest_path).get('textures', {})
+    groups = {} # hash -> rutas con ese contenido
+    sizes = {}
+    stale = 0
+    for path, entry in sorted(entries.items()):
+        if os.path.dirname(path) != source_folder:
+            continue
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        if entry['mtime'] != stat.st_mtime or entry['bytes'] != stat.st_size:
+            stale += 1
+            continue
+        groups.setdefault(entry['hash'], []).append(path)
+        sizes[entry['hash']] = stat.st_size
+    if stale or not entries:
+        log('índice de texturas repetidas incompleto: falta construir la caché (python texture_cache.py).')
+    aliases = {}
+    duplicated_bytes = 0
+    for digest, paths in groups.items():
+        if len(paths) > 1:
+            aliases.update((path, paths[0]) for path in paths)
+            duplicated_bytes += sizes[digest] * (len(paths) - 1)
+    if aliases:
+        log(f'{len(aliases)} texturas comparten contenido con otras ({duplicated_bytes / 1024:.0f} KB duplicados en disco).')
+    return aliases
+
+
+# --- Uso en el Juego ---
+class TextureCache:
+    def __init__(self, manifest_path=MANIFEST_PATH):
+        self.entries = load_manifest(manifest_path).get('textures', {})
+
+    def resolve(self, path): # Devuelve la ruta del .txo si está al día con el archivo original; si no, la original.
+        entry = self.entries.get(path)
+        if entry is None or not os.path.exists(entry['output']):
+            return path
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return entry['output']
+        if entry['mtime'] == stat.st_mtime and entry['bytes'] == stat.st_size:
+            return entry['output']
+        return path # La textura original cambió después de construir la caché.
+
+
+if __name__ == '__main__':
+    build_all(force='--force' in sys.argv, compress='--no-compress' not in sys.argv)
@@ -0,0 +1,40 @@
+# --- Reloj de Simulación de Paso Fijo ---
+# El motor ya no avanza con el dt variable de cada fotograma: si un fotograma se trababa (subida de una
+# textura, apertura de la música, armado de un panel), un objetivo rápido saltaba varias unidades de
+# golpe y podía cruzar la mira o el límite de la pantalla de una forma que cambiaba el puntaje.
+# FixedTimestep acumula el tiempo real y lo entrega en ticks de duración fija (p. ej. 1/120 s):
+# - Con fotogramas más rápidos que el tick, hay fotogramas sin ningún tick; con fotogramas lentos, varios.
+# - Como mucho 'max_ticks' por fotograma: tras una traba larga el juego se frena un instante en lugar de
+#   encadenar fotogramas cada vez más lentos por ponerse al día (el tiempo que sobra se descarta).
+# - alpha (de 0 a 1) dice cuánto se avanzó hacia el próximo tick: la escena dibuja a los objetivos
+#   interpolando entre las dos últimas posiciones simuladas (swarm.interpolated), así se mueven suave
+#   aunque el dibujado vaya a otro ritmo que la simulación.
+# Con las mismas entradas, la simulación recibe la misma secuencia de ticks en cualquier máquina.
+EPSILON = 1e-9 # Tolerancia de redondeo: 1/60 s deben ser exactamente 2 ticks de 1/120 s.
+
+
+class FixedTimestep:
+    def __init__(self, rate=120, max_ticks=8): # 'rate': ticks por segundo; 'max_ticks': ticks por fotograma como máximo.
+        self.step = 1 / rate # Duración de cada tick (el dt que recibe el motor).
+        self.max_ticks = max_ticks
+        self.accumulator = 0.0 # Tiempo real que todavía no se simuló (menos de un tick tras advance()).
+        self.ticks = 0 # Ticks entregados en total.
+        self.dropped = 0.0 # Segundos descartados por el límite de ticks por fotograma.
+
+    def advance(self, dt): # Suma el tiempo del fotograma y devuelve cuántos ticks hay que simular.
+        self.accumulator += dt
+        ticks = int(self.accumulator / self.step + EPSILON)
+        if ticks > self.max_ticks: # Lo que no entra en este fotograma se descarta.
+            ticks = self.max_ticks
+            self.dropped += self.accumulator - ticks * self.step
+            self.accumulator = ticks * self.step
+        self.accumulator = max(0.0, self.accumulator - ticks * self.step)
+        self.ticks += ticks
+        return ticks
+
+    @property
+    def alpha(self): # Fracción del próximo tick ya transcurrida, para interpolar lo que se dibuja.
+        return min(1.0, self.accumulator / self.step)
+
+    def reset(self): # Al empezar un nivel: nada del tiempo anterior pasa a la partida nueva.
+        self.accumulator = 0.0
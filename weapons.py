@@ -0,0 +1,236 @@
+# --- Modelos de las Armas ---
+# Cada arma (pistola, rifle, escopeta) se describe como una lista de piezas sencillas (cubos, cilindros),
+# pero en lugar de dibujar cada pieza como una entidad con su propia textura, se "hornea" en una sola
+# malla estática: las texturas de las piezas se juntan en un atlas, el color y la posición de cada pieza
+# quedan guardados en los vértices y Panda3D une todo en una sola geometría (una sola llamada de dibujo).
+# El resultado se guarda en disco (.bam + .png) y solo se vuelve a hornear si cambian las piezas o texturas.
+# Cada arma se construye la primera vez que se entra a su nivel (WeaponRack.show).
+#
+# También incluye una caché binaria para los modelos .obj de assets/models: el .obj de texto se interpreta
+# una sola vez y se guarda como .bam, que Panda3D carga directamente en los siguientes inicios. Hoy ninguna
+# pieza usa esos modelos (solo los convierte 'python weapons.py'); una pieza que ponga uno como modelo
+# ('model': 'assets/models/xm177.obj') lo carga a través de esta caché.
+#
+# Uso: python weapons.py   (hornea las armas y convierte los .obj por adelantado)
+import hashlib
+import json
+import math
+import os
+
+from texture_cache import file_hash
+
+CACHE_FOLDER = 'assets/cache/weapons'
+MODEL_CACHE_FOLDER = 'assets/cache/models'
+ATLAS_CELL = 128 # Píxeles de cada pieza en el atlas.
+FORMAT_VERSION = 1 # Cambiarlo obliga a volver a hornear todas las armas.
+_bake_keys = {} # arma -> clave de horneado (los archivos se leen una sola vez por ejecución)
+
+# --- Piezas de cada Arma ---
+# 'position' es la posición del arma respecto a la cámara; cada pieza usa el modelo, escala, posición,
+# rotación, textura y color con los que antes se creaba su entidad.
+WEAPON_MODELS = {
+    'pistol': {'position': (0.4, -0.43, 1.2), 'parts': [
+        {'model': 'cube', 'scale': (0.11, 0.1, 0.6), 'texture': 'assets/textures/body.jpg', 'color': 'blue'}, # Cuerpo principal de la pistola.
+        {'model': 'cube', 'scale': (0.12, 0.2, 0.2), 'position': (0, -0.2, -0.2), 'texture': 'assets/textures/pistol_grip.png', 'color': 'black'}, # Empuñadura de la pistola.
+        {'model': 'cube', 'scale': (0.1, 0.13, 0.55), 'position': (0, 0.04, 0), 'texture': 'assets/textures/prueba.jpg', 'color': 'blue'}, # Corredera de la pistola.
+        {'model': 'cube', 'scale': (0.05, 0.05, 0.1), 'position': (0, 0.07, 0.3), 'texture': 'assets/textures/pistol_barrel.png', 'color': 'black'}, # Cañón asomando.
+        {'model': 'cube', 'scale': (0.04, 0.08, 0.05), 'position': (0, -0.07, -0.1), 'texture': 'assets/textures/pistol_trigger.png', 'color': 'black'}, # Gatillo de la pistola.
+        {'model': 'cube', 'scale': (0.02, 0.02, 0.05), 'position': (0, 0.11, 0.25), 'texture': 'assets/textures/pistol_sight_front.png', 'color': 'red'}, # Miras de la pistola (delantera).
+        {'model': 'cube', 'scale': (0.04, 0.02, 0.04), 'position': (0, 0.12, -0.25), 'texture': 'assets/textures/pistol_sight_rear.png', 'color': 'red'}, # Miras de la pistola (trasera).
+    ]},
+    'rifle': {'position': (0.6, -0.55, 1.8), 'parts': [
+        {'model': 'cube', 'scale': (0.1, 0.1, 1.2), 'texture': 'assets/textures/GUN_Material.003_BaseColor.jpg', 'color': 'red'}, # Cuerpo principal / Receptor del rifle.
+        {'model': 'cylinder', 'scale': (0.05, 0.05, 0.8), 'position': (0, 0, 0.6), 'rotation_x': 90, 'texture': 'assets/textures/rifle_barrel.png', 'color': 'black'}, # Cañón del rifle.
+        {'model': 'cube', 'scale': (0.1, 0.25, 0.3), 'position': (0, -0.1, -0.6), 'texture': 'assets/textures/GUN_Material.003_BaseColor.jpg', 'color': 'red'}, # Culata del rifle.
+        {'model': 'cube', 'scale': (0.08, 0.2, 0.1), 'position': (0, -0.15, -0.3), 'texture': 'assets/textures/GUN_Material.003_BaseColor.jpg', 'color': 'red'}, # Empuñadura de pistola del rifle.
+        {'model': 'cylinder', 'scale': (0.05, 0.05, 0.3), 'position': (0, 0.08, 0.2), 'rotation_x': 90, 'texture': 'assets/textures/rifle_scope.png', 'color': 'yellow'}, # Mira telescópica del rifle.
+        {'model': 'circle', 'scale': (0.06, 0.06, 0.06), 'position': (0, 0.08, 0.45), 'rotation_x': 90, 'texture': 'assets/textures/rifle_scope_lens.png', 'color': 'white'}, # Lente de la mira telescópica.
+        {'model': 'cube', 'scale': (0.02, 0.1, 0.02), 'position': (-0.05, -0.08, 0.3), 'texture': 'assets/textures/rifle_bipod_left.png', 'color': 'black'}, # Bípode del rifle (patas).
+        {'model': 'cube', 'scale': (0.02, 0.1, 0.02), 'position': (0.05, -0.08, 0.3), 'texture': 'assets/textures/rifle_bipod_right.png', 'color': 'black'}, # Cargador del rifle.
+        {'model': 'cube', 'scale': (0.06, 0.2, 0.1), 'position': (0, -0.1, -0.1), 'texture': 'assets/textures/rifle_magazine.png', 'color': 'black'}, # Riel Picatinny en la parte superior.
+        {'model': 'cube', 'scale': (0.08, 0.01, 0.8), 'position': (0, 0.06, 0), 'texture': 'assets/textures/rifle_rail.png', 'color': 'black'}, # Riel Picatinny en la parte inferior.
+    ]},
+    'shotgun': {'position': (0.5, -0.43, 1.5), 'parts': [
+        {'model': 'cube', 'scale': (0.11, 0.10, 1.0), 'texture': 'assets/textures/prueba.jpg', 'color': 'green'}, # Cuerpo principal de la escopeta.
+        {'model': 'cylinder', 'scale': (0.08, 0.08, 0.8), 'position': (0, 0, 0.5), 'rotation_x': 90, 'texture': 'assets/textures/shotgun_barrel.png', 'color': 'white'}, # Cañón de la escopeta.
+        {'model': 'cube', 'scale': (0.10, 0.1, 0.25), 'position': (0, -0.05, 0.2), 'texture': 'assets/textures/shotgun_forend.png', 'color': 'black'}, # Guardamanos/Bomba de la escopeta.
+        {'model': 'cube', 'scale': (0.12, 0.3, 0.15), 'position': (0, -0.2, -0.4), 'texture': 'assets/textures/prueba.jpg', 'color': 'green'}, # Culata y empuñadura de la escopeta.
+        {'model': 'cube', 'scale': (0.10, 0.05, 0.2), 'position': (-0.04, 0.1, -0.1), 'texture': 'assets/textures/prueba.jpg', 'color': 'green'}, # Recámara o parte superior del cuerpo de la escopeta.
+        {'model': 'cylinder', 'scale': (0.05, 0.05, 0.7), 'position': (0, -0.08, 0.3), 'rotation_x': 90, 'texture': 'assets/textures/shotgun_magtube.png', 'color': 'white'}, # Cargador tubular bajo el cañón de la escopeta.
+        {'model': 'cube', 'scale': (0.02, 0.03, 0.05), 'position': (0, 0.06, 0.45), 'texture': 'assets/textures/shotgun_sight_front.png', 'color': 'red'}, # Alza y mira delantera de la escopeta.
+        {'model': 'cube', 'scale': (0.04, 0.01, 0.05), 'position': (-0.06, 0.1, -0.4), 'texture': 'assets/textures/shotgun_sight_rear.png', 'color': 'black'}, # Alza y mira trasera de la escopeta.
+    ]},
+}
+
+
+def _bake_key(name): # Hash de las piezas y del contenido de sus texturas y modelos: si cambia algo, se vuelve a hornear.
+    if name not in _bake_keys:
+        digest = hashlib.sha256(json.dumps([FORMAT_VERSION, WEAPON_MODELS[name]], sort_keys=True).encode())
+        for part in WEAPON_MODELS[name]['parts']:
+            for path in (part['texture'], part['model']):
+                if os.path.exists(path):
+                    digest.update(file_hash(path).encode())
+        _bake_keys[name] = digest.hexdigest()[:16]
+    return _bake_keys[name]
+
+
+def cached_paths(name): # Rutas del modelo horneado y de su atlas.
+    base = f'{CACHE_FOLDER}/{name}_{_bake_key(name)}'
+    return base + '.bam', base + '.png'
+
+
+# --- Horneado ---
+def _build_atlas(textures, output):
+    # Junta las texturas en una rejilla y devuelve, por textura, el rectángulo (u, v, ancho, alto) que ocupa.
+    # Las texturas que no existen quedan como una celda blanca (la pieza solo muestra su color).
+    from PIL import Image
+
+    columns = math.ceil(math.sqrt(len(textures)))
+    rows = math.ceil(len(textures) / columns)
+    atlas = Image.new('RGBA', (columns * ATLAS_CELL, rows * ATLAS_CELL), (255, 255, 255, 255))
+    regions = {}
+    inset = 0.5 / ATLAS_CELL # Medio píxel hacia dentro para que el filtrado no tome píxeles de la celda vecina.
+    for i, path in enumerate(textures):
+        column, row = i % columns, i // columns
+        if os.path.exists(path):
+            image = Image.open(path).convert('RGBA').resize((ATLAS_CELL, ATLAS_CELL), Image.LANCZOS)
+            atlas.paste(image, (column * ATLAS_CELL, row * ATLAS_CELL))
+        # Las coordenadas UV empiezan abajo a la izquierda; las filas de la imagen, arriba.
+        regions[path] = ((column + inset) / columns, (rows - row - 1 + inset) / rows,
+                         (1 - 2 * inset) / columns, (1 - 2 * inset) / rows)
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    atlas.save(output)
+    return regions
+
+
+def part_mesh(model): # Malla de Ursina de una pieza.
+    from ursina import Cylinder, load_model, application
+
+    if model.endswith('.obj'): # Modelo propio de assets/models, desde su caché binaria.
+        return load_model_cached(model)
+    if model == 'cylinder': # Ursina no trae un modelo 'cylinder'; se usa el procedural centrado en el origen.
+        return Cylinder(start=-0.5)
+    return load_model(model, application.internal_models_compressed_folder) or load_model(model)
+
+
+def flatten_batch(root):
+    # Aplica transformaciones, colores y coordenadas de textura a los vértices y une las geometrías de 'root'.
+    # Las piezas deben compartir la misma textura (aunque sea de relleno) para que Panda3D pueda unirlas.
+    from panda3d.core import ColorAttrib, RenderState
+
+    root.flattenStrong()
+    for geom_node in root.findAllMatches('**/+GeomNode'):
+        node = geom_node.node()
+        for i in range(node.getNumGeoms()): # Solo queda el color por vértice; la textura real y la transparencia las pone la entidad.
+            node.setGeomState(i, RenderState.make(node.getGeomState(i).getAttrib(ColorAttrib)))
+    root.flattenStrong()
+    return root
+
+
+def bake_weapon(name):
+    # Une las piezas del arma en una sola malla con el atlas y la guarda en la caché. Devuelve (bam, png).
+    from panda3d.core import Filename, NodePath, Texture, TextureStage
+    from ursina import color
+
+    model_path, atlas_path = cached_paths(name)
+    parts = WEAPON_MODELS[name]['parts']
+    regions = _build_atlas(list(dict.fromkeys(part['texture'] for part in parts)), atlas_path)
+    placeholder = Texture('atlas') # Todas las piezas comparten la misma textura para que se puedan unir.
+    stage = TextureStage.getDefault()
+    root = NodePath('weapon')
+    for part in parts:
+        node = part_mesh(part['model']).copyTo(root)
+        node.setPos(*part.get('position', (0, 0, 0)))
+        node.setScale(*part['scale'])
+        node.setP(-part.get('rotation_x', 0)) # Ursina gira en sentido contrario a Panda3D.
+        node.setColor(getattr(color, part['color']))
+        node.setTexture(placeholder)
+        u, v, width, height = regions[part['texture']]
+        node.setTexOffset(stage, u, v)
+        node.setTexScale(stage, width, height)
+    flatten_batch(root)
+    os.makedirs(os.path.dirname(model_path), exist_ok=True)
+    root.writeBamFile(Filename.fromOsSpecific(model_path))
+    return model_path, atlas_path
+
+
+def ensure_baked(name): # Hornea el arma si no está en la caché de disco (sin construir su entidad). Devuelve (bam, png).
+    model_path, atlas_path = cached_paths(name)
+    if not (os.path.exists(model_path) and os.path.exists(atlas_path)):
+        bake_weapon(name)
+    return model_path, atlas_path
+
+
+def load_weapon(name, assets, parent=None):
+    # Devuelve la entidad del arma con su malla horneada, horneándola primero si no está en la caché.
+    from panda3d.core import Filename
+    from ursina import Entity, application
+
+    model_path, atlas_path = ensure_baked(name)
+    model = application.base.loader.loadModel(Filename.fromOsSpecific(os.path.abspath(model_path)), noCache=True)
+    weapon = Entity(parent=parent, model=model, texture=assets.texture(atlas_path), position=WEAPON_MODELS[name]['position'])
+    return assets.hold(weapon, 'texture', atlas_path) # El atlas queda libre para la caché al destruir el arma.
+
+
+class WeaponRack: # Las armas del jugador, construidas la primera vez que se necesitan.
+    def __init__(self, assets, parent=None, registry=None): # 'registry' (registry.EntityRegistry) es opcional.
+        self.assets = assets
+        self.parent = parent
+        self.registry = registry
+        self.weapons = {} # nombre -> entidad ya construida
+
+    def get(self, name):
+        if name not in self.weapons:
+            self.weapons[name] = load_weapon(name, self.assets, self.parent)
+            if self.registry is not None:
+                self.registry.add(self.weapons[name], 'weapons')
+        return self.weapons[name]
+
+    def show(self, name): # Deja habilitada solo el arma 'name'.
+        weapon = self.get(name)
+        self.hide_all()
+        weapon.enable()
+        return weapon
+
+    def hide_all(self):
+        for weapon in self.weapons.values():
+            weapon.disable()
+
+    def unload(self): # Destruye las armas construidas (y suelta sus atlas); get() las vuelve a cargar desde el .bam.
+        from ursina import destroy
+
+        for weapon in self.weapons.values():
+            destroy(weapon)
+        self.weapons.clear()
+
+
+# --- Caché de Modelos .obj ---
+def load_model_cached(path):
+    # Carga un .obj de assets/models desde su versión binaria (.bam); la crea la primera vez.
+    from pathlib import Path
+    from panda3d.core import Filename
+    from ursina import application
+    from ursina.mesh_importer import obj_to_ursinamesh
+
+    cached = f'{MODEL_CACHE_FOLDER}/{os.path.basename(path).rsplit(".", 1)[0]}_{file_hash(path)[:16]}.bam'
+    if not os.path.exists(cached):
+        source = Path(os.path.abspath(path))
+        mesh = obj_to_ursinamesh(path=source.parent, name=source.stem, return_mesh=True) # Interpreta el .obj de texto (lento).
+        os.makedirs(MODEL_CACHE_FOLDER, exist_ok=True)
+        mesh.writeBamFile(Filename.fromOsSpecific(cached))
+    return application.base.loader.loadModel(Filename.fromOsSpecific(os.path.abspath(cached)), noCache=True)
+
+
+if __name__ == '__main__':
+    import time
+    from ursina import Ursina
+
+    app = Ursina(window_type='offscreen')
+    for weapon_name in WEAPON_MODELS:
+        started = time.perf_counter()
+        print(weapon_name, '->', *bake_weapon(weapon_name), f'({time.perf_counter() - started:.2f} s)')
+    for name in sorted(os.listdir('assets/models')):
+        if name.endswith('.obj'):
+            started = time.perf_counter()
+            load_model_cached(f'assets/models/{name}')
+            print(name, f'-> caché binaria ({time.perf_counter() - started:.2f} s)')